@@ -2,12 +2,22 @@
 
 Announcemnts routes are used to create, retrieve, update and delete annoumcenets."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from ..services import AnnouncementService
-from ..models.announcement import Announcement
-from ..models.announcement_details import AnnouncementDetails, UpvoteBoolean
+from ..services.announcement import VIEWER_STATES_LIMIT
+from ..models.announcement import Announcement, AnnouncementSearchResult
+from ..models.announcement_details import (
+    AnnouncementDetails,
+    AnnouncementViewerState,
+    UpvoteBoolean,
+)
 from ..models.announcement_comment import Comment
+from ..models.pagination import (
+    AnnouncementPaginationParams,
+    Paginated,
+    PaginationParams,
+)
 from ..models.user import User
 from ..api.authentication import registered_user
 
@@ -85,6 +95,104 @@ def get_admin_announcements(
     return announcement_service.all_admin(subject)
 
 
+@api.get("/paginate", tags=["Announcements"])
+def list_published_announcements(
+    announcement_service: AnnouncementService = Depends(),
+    page_size: int = 10,
+    cursor: str = "",
+    order_by: str = "published_date",
+    ascending: bool = False,
+    organization_id: int | None = None,
+    author_id: int | None = None,
+) -> Paginated[Announcement]:
+    """List published announcements via keyset pagination query parameters."""
+
+    pagination_params = AnnouncementPaginationParams(
+        page_size=page_size,
+        cursor=cursor,
+        order_by=order_by,
+        ascending=ascending,
+        organization_id=organization_id,
+        author_id=author_id,
+    )
+    return announcement_service.get_paginated_announcements(pagination_params)
+
+
+@api.get("/admin/paginate", tags=["Announcements"])
+def list_admin_announcements(
+    subject: User = Depends(registered_user),
+    announcement_service: AnnouncementService = Depends(),
+    page_size: int = 10,
+    cursor: str = "",
+    order_by: str = "published_date",
+    ascending: bool = False,
+    organization_id: int | None = None,
+    author_id: int | None = None,
+    status: str = "",
+) -> Paginated[Announcement]:
+    """List announcements the admin user is authorized to view via keyset pagination query parameters."""
+
+    pagination_params = AnnouncementPaginationParams(
+        page_size=page_size,
+        cursor=cursor,
+        order_by=order_by,
+        ascending=ascending,
+        organization_id=organization_id,
+        author_id=author_id,
+        status=status,
+    )
+    return announcement_service.get_paginated_announcements(pagination_params, subject)
+
+
+@api.get("/search", tags=["Announcements"])
+def search_announcements(
+    announcement_service: AnnouncementService = Depends(),
+    query: str = "",
+    page: int = 0,
+    page_size: int = 10,
+) -> Paginated[AnnouncementSearchResult]:
+    """
+    Full-text search published announcements, best match first
+
+    Parameters:
+        query: the search terms, supporting "quoted phrases", -exclusions and or
+        page: the page of results to retrieve
+        page_size: the number of results per page
+        announcement_service: a valid AnnouncementService
+
+    Returns:
+        Paginated[AnnouncementSearchResult]: The page of matching announcements with highlighted snippets
+    """
+
+    pagination_params = PaginationParams(page=page, page_size=page_size, filter=query)
+    return announcement_service.search(pagination_params)
+
+
+@api.get(
+    "/viewerState",
+    response_model=list[AnnouncementViewerState],
+    tags=["Announcements"],
+)
+def get_viewer_states(
+    slugs: list[str] = Query([], max_length=VIEWER_STATES_LIMIT),
+    subject: User = Depends(registered_user),
+    announcement_service: AnnouncementService = Depends(),
+) -> list[AnnouncementViewerState]:
+    """
+    Checks which of a page of announcements the logged in user has upvoted and favorited
+
+    Parameters:
+        slugs: the slugs of the announcements to check, repeated as `?slugs=a&slugs=b`, at most `VIEWER_STATES_LIMIT`
+        subject: a valid User model representing the currently logged in User
+        announcement_service: a valid AnnouncementService
+
+    Returns:
+        list[AnnouncementViewerState]: The upvoted and favorited state of each announcement found
+    """
+
+    return announcement_service.get_viewer_states(subject, slugs)
+
+
 @api.get(
     "/{slug}",
     responses={404: {"model": None}},
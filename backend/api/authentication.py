@@ -56,11 +56,17 @@ In development, the proxy is not present. Instead, there are two options for aut
 Finally, the `authenticated_pid` function ensures a user is authenticated with PID and Onyen, 
 but does not require that the user be registered in the database. This is only really useful 
 for routes used in the process of registering a user.
+
+Some clients, such as a browser's EventSource or a calendar app subscribed to a feed, cannot
+send an Authorization header. Routes serving them accept a token in a query parameter instead,
+generated by `generate_scoped_token` and checked by `scoped_token_pid`. Scoped tokens are signed
+with a key derived from their scope, so they are neither valid bearer tokens nor valid for any
+other scope.
 """
 
 import jwt
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Header, HTTPException, Request, Response, Depends
 from fastapi.exceptions import HTTPException
 from fastapi.security import HTTPBearer
@@ -116,6 +122,27 @@ def authenticated_pid(
     raise HTTPException(status_code=401, detail="Unauthorized")
 
 
+def generate_scoped_token(
+    pid: int, scope: str, expires_in: timedelta | None = None
+) -> str:
+    """Returns a token for the user with the given PID that is only valid for the given scope and, if given, duration."""
+    claims: dict = {"pid": pid}
+    if expires_in is not None:
+        claims["exp"] = datetime.now(timezone.utc) + expires_in
+    return jwt.encode(claims, _scoped_secret(scope), algorithm=_JST_ALGORITHM)
+
+
+def scoped_token_pid(token: str, scope: str) -> int:
+    """Returns the PID a token was generated for or raises a 401 HTTPException if it is not a valid token for the given scope."""
+    try:
+        auth_info = jwt.decode(
+            token, _scoped_secret(scope), algorithms=[_JST_ALGORITHM]
+        )
+        return int(auth_info["pid"])
+    except (jwt.exceptions.InvalidTokenError, KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
 @api.get("/verify", include_in_schema=False)
 def auth_verify(token: str, continue_to: str = "/"):
     """Verify the legitimacy of a token for delegated authentication purposes.
@@ -272,6 +299,10 @@ def _generate_token(uid: any, pid: any):
     return token
 
 
+def _scoped_secret(scope: str) -> str:
+    return f"{_JWT_SECRET}:{scope}"
+
+
 def _github_oauth_redirect_uri():
     if HOST.startswith("localhost"):
         redirect_protocol = "http"
@@ -0,0 +1,73 @@
+"""Conditional GET helpers.
+
+Routes that clients poll validate their responses with an ETag, and optionally a Last-Modified
+time, so that a poll whose validators are unchanged is answered with an empty 304 Not Modified
+response instead of the full response."""
+
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+def validator_headers(
+    etag: str, last_modified: datetime | None = None
+) -> dict[str, str]:
+    """Returns the headers that carry a response's validators.
+
+    Args:
+        etag: The ETag of the response.
+        last_modified: The time the response was last modified, if known, with a time zone.
+
+    Returns:
+        dict[str, str]: The ETag header, and the Last-Modified header if the time is known.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(
+    etag: str,
+    if_none_match: str | None,
+    last_modified: datetime | None = None,
+    if_modified_since: str | None = None,
+) -> bool:
+    """Returns whether a conditional GET is answered by a 304 Not Modified response.
+
+    If-None-Match takes precedence over If-Modified-Since, which is only evaluated when the
+    request has no If-None-Match header. ETags are compared weakly, ignoring a W/ prefix.
+
+    Args:
+        etag: The ETag of the current response.
+        if_none_match: The If-None-Match header of the request, if any.
+        last_modified: The time the current response was last modified, if known.
+        if_modified_since: The If-Modified-Since header of the request, if any.
+
+    Returns:
+        bool: True if the client's copy of the response is current.
+    """
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(etag) in [_opaque(tag) for tag in if_none_match.split(",")]
+
+    if last_modified is None or if_modified_since is None:
+        return False
+    try:
+        modified_since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if modified_since.tzinfo is None:
+        return False
+    # HTTP dates have a resolution of seconds
+    return last_modified.replace(microsecond=0) <= modified_since
+
+
+def _opaque(etag: str) -> str:
+    """The opaque tag of an ETag, without its weakness indicator."""
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
@@ -0,0 +1,94 @@
+"""Coworking Availability API
+
+This API streams changes to the availability of seats and rooms to subscribers, so that the
+coworking UI can update as they happen rather than polling for them.
+
+Browsers' EventSource cannot send an Authorization header, so the stream is opened with a
+short-lived token in its `token` query parameter, requested beforehand with the bearer token."""
+
+from datetime import timedelta
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from ..authentication import authenticated_pid, generate_scoped_token, scoped_token_pid
+from ...models.coworking import AvailabilityDelta
+from ...services.coworking.availability_events import availability_events
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+api = APIRouter(prefix="/api/coworking/availability")
+
+STREAM_TOKEN_SCOPE = "coworking-availability-stream"
+STREAM_TOKEN_LIFETIME = timedelta(minutes=1)
+
+
+def stream_subject_pid(token: str) -> int:
+    """Returns the PID of the subject a stream token was generated for or raises a 401 HTTPException."""
+    return scoped_token_pid(token, STREAM_TOKEN_SCOPE)
+
+
+@api.post("/stream/token", tags=["Coworking"])
+def create_stream_token(subject: tuple[int, str] = Depends(authenticated_pid)) -> str:
+    """Returns a token for opening the availability stream within the next minute.
+
+    The token is only checked when the stream is opened, so a client reconnecting after it
+    expires should request another."""
+    pid, _onyen = subject
+    return generate_scoped_token(pid, STREAM_TOKEN_SCOPE, STREAM_TOKEN_LIFETIME)
+
+
+@api.get("/stream", tags=["Coworking"], response_class=StreamingResponse)
+async def stream_availability(
+    _pid: int = Depends(stream_subject_pid),
+    last_event_id: str | None = Header(None),
+):
+    """Streams availability deltas as server-sent events until the client disconnects.
+
+    Each event's name is the kind of delta, its ID is the delta's version, and its data is the
+    delta as JSON. A reconnecting client whose Last-Event-ID is not the latest version, as
+    well as a client that falls behind, receives a reset event and should fetch availability
+    again in full.
+
+    Only the subject's stream token is checked, rather than their registration, so that idle
+    subscribers do not hold on to a database session.
+    """
+    return StreamingResponse(
+        _stream(last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Pass events through the GZip middleware and proxies as soon as they are sent
+            "Content-Encoding": "identity",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+async def _stream(last_event_id: str | None) -> AsyncIterator[str]:
+    """Generates the server-sent events of availability deltas for one subscriber."""
+    async with availability_events.subscribe() as subscription:
+        yield "retry: 5000\n\n"
+        if last_event_id is not None and last_event_id != str(
+            availability_events.version
+        ):
+            yield _event(
+                AvailabilityDelta(version=availability_events.version, kind="reset")
+            )
+
+        while True:
+            delta = await subscription.get()
+            if delta is None:
+                yield ": keepalive\n\n"
+            else:
+                yield _event(delta)
+
+
+def _event(delta: AvailabilityDelta) -> str:
+    """Formats a delta as a server-sent event."""
+    return (
+        f"id: {delta.version}\nevent: {delta.kind}\ndata: {delta.model_dump_json()}\n\n"
+    )
@@ -2,7 +2,7 @@
 
 This API is used to make and manage reservations."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Sequence
 from datetime import datetime
 
@@ -15,7 +15,8 @@ from ...models.coworking import (
     ReservationRequest,
     ReservationPartial,
     ReservationState,
-    ReservationMapDetails
+    ReservationMapDetails,
+    ReservationMapGrid,
 )
 
 __authors__ = ["Kris Jordan, Yuvraj Jain"]
@@ -98,6 +99,20 @@ def get_reservations_for_rooms_by_date(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@api.get("/room-reservation/days", tags=["Coworking"])
+def get_reservations_for_rooms_by_dates(
+    start: datetime,
+    days: int = Query(7, ge=1, le=14),
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> list[ReservationMapGrid]:
+    """See available rooms for consecutive days, such as a week, in one request.
+
+    Each room's time slot states are run-length encoded as runs of a state digit followed by
+    its number of consecutive slots, separated by commas."""
+    return reservation_svc.get_map_reserved_times_by_dates(start, days, subject)
+
+
 @api.get("/user-reservations/", tags=["Coworking"])
 def get_total_hours_study_room_reservations(
     subject: User = Depends(registered_user),
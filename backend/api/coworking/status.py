@@ -2,8 +2,9 @@
 
 This API is used to retrieve and update a user's profile."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 from ..authentication import registered_user
+from ..conditional import is_not_modified, validator_headers
 from ...services.coworking import StatusService
 from ...models import User
 from ...models.coworking import Status
@@ -22,12 +23,24 @@ openapi_tags = {
 
 @api.get("", response_model=Status, tags=["Coworking"])
 def get_coworking_status(
-    subject: User = Depends(registered_user), status_svc: StatusService = Depends()
+    response: Response,
+    subject: User = Depends(registered_user),
+    status_svc: StatusService = Depends(),
+    if_none_match: str | None = Header(None),
 ):
     """Status endpoint supports the primary screen of the coworking features.
 
     It returns information about upcoming, active reservations the subject holds.
     It also fetches the current seat availability of the XL during operating hours.
     Finally, it provides a list of upcoming hours.
+
+    The response carries an ETag, and polls whose If-None-Match header has the ETag of an
+    unchanged status get an empty 304 Not Modified response instead.
     """
-    return status_svc.get_coworking_status(subject)
+    status, etag = status_svc.get_coworking_status_with_etag(subject)
+    headers = {**validator_headers(etag), "Cache-Control": "private, no-cache"}
+    if is_not_modified(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return status
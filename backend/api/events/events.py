@@ -2,21 +2,33 @@
 
 Event routes are used to create, retrieve, and update Events."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
-from typing import Sequence
+from typing import Callable, Iterator, Literal, Sequence
 from backend.models.public_user import PublicUser
 from backend.models.pagination import EventPaginationParams, Paginated, PaginationParams
 
 from backend.services.organization import OrganizationService
 
 from ...services.event import EventService
+from ...services.event_calendar import (
+    EVENTS_SCOPE,
+    EventCalendarService,
+    organization_scope,
+    user_scope,
+)
 from ...services.user import UserService
 from ...services.exceptions import ResourceNotFoundException, UserPermissionException
 from ...models.event import DraftEvent
 from ...models.event_details import EventDetails
 from ...models.coworking.time_range import TimeRange
-from ...api.authentication import registered_user
+from ...api.authentication import (
+    generate_scoped_token,
+    registered_user,
+    scoped_token_pid,
+)
+from ...api.conditional import is_not_modified, validator_headers
 from ...models.user import User
 
 __authors__ = [
@@ -35,6 +47,8 @@ openapi_tags = {
     "description": "Create, update, delete, and retrieve CS Events.",
 }
 
+REGISTRATIONS_CALENDAR_TOKEN_SCOPE = "events-registrations-calendar"
+
 
 @api.get("/paginate", tags=["Events"])
 def list_events(
@@ -145,6 +159,131 @@ def get_events_by_organization(
     return event_service.get_events_by_organization(organization, subject)
 
 
+@api.get("/calendar.ics", response_class=StreamingResponse, tags=["Events"])
+def get_events_calendar(
+    calendar_service: EventCalendarService = Depends(),
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+):
+    """
+    Get an iCalendar feed of all events, for calendar apps to subscribe to.
+
+    Polls of an unchanged feed, validated by its ETag or Last-Modified time, get an empty
+    304 Not Modified response without events being queried.
+    """
+    return _calendar_response(
+        calendar_service,
+        [EVENTS_SCOPE],
+        calendar_service.events_feed,
+        if_none_match,
+        if_modified_since,
+    )
+
+
+@api.get(
+    "/organization/{slug}/calendar.ics",
+    response_class=StreamingResponse,
+    tags=["Events"],
+)
+def get_organization_events_calendar(
+    slug: str,
+    calendar_service: EventCalendarService = Depends(),
+    organization_service: OrganizationService = Depends(),
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+):
+    """
+    Get an iCalendar feed of an organization's events, for calendar apps to subscribe to.
+
+    Polls of an unchanged feed, validated by its ETag or Last-Modified time, get an empty
+    304 Not Modified response without events being queried.
+    """
+    organization = organization_service.get_by_slug(slug)
+    return _calendar_response(
+        calendar_service,
+        [organization_scope(organization.id or 0)],
+        lambda: calendar_service.organization_feed(organization),
+        if_none_match,
+        if_modified_since,
+    )
+
+
+def registrations_calendar_subject(
+    token: str, user_service: UserService = Depends()
+) -> User:
+    """
+    Get the user a registrations calendar feed token was generated for.
+
+    Raises:
+        HTTPException: 401 if the token is invalid or its user is not registered
+    """
+    user = user_service.get(scoped_token_pid(token, REGISTRATIONS_CALENDAR_TOKEN_SCOPE))
+    if user is None:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return user
+
+
+@api.get("/registrations/calendar/token", tags=["Events"])
+def get_registered_events_calendar_token(
+    subject: User = Depends(registered_user),
+) -> str:
+    """
+    Get the token the subject subscribes to the feed of their registrations with.
+
+    Calendar apps cannot send an Authorization header, so the feed is authenticated by this
+    token in its `token` query parameter instead. The token does not expire, since
+    subscriptions poll the same URL indefinitely, and is only valid for this feed.
+    """
+    return generate_scoped_token(subject.pid, REGISTRATIONS_CALENDAR_TOKEN_SCOPE)
+
+
+@api.get(
+    "/registrations/calendar.ics", response_class=StreamingResponse, tags=["Events"]
+)
+def get_registered_events_calendar(
+    subject: User = Depends(registrations_calendar_subject),
+    calendar_service: EventCalendarService = Depends(),
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+):
+    """
+    Get an iCalendar feed of the events the subject is registered for, authenticated by the
+    token from `/api/events/registrations/calendar/token`.
+
+    Polls of an unchanged feed, validated by its ETag or Last-Modified time, get an empty
+    304 Not Modified response without events being queried.
+    """
+    return _calendar_response(
+        calendar_service,
+        [EVENTS_SCOPE, user_scope(subject.id or 0)],
+        lambda: calendar_service.registrations_feed(subject),
+        if_none_match,
+        if_modified_since,
+        private=True,
+    )
+
+
+def _calendar_response(
+    calendar_service: EventCalendarService,
+    scopes: list[str],
+    feed: Callable[[], Iterator[str]],
+    if_none_match: str | None,
+    if_modified_since: str | None,
+    private: bool = False,
+) -> Response:
+    """Responds with a streamed calendar feed, or 304 Not Modified if the client's is current."""
+    etag, last_modified = calendar_service.validators(scopes)
+    headers = {
+        **validator_headers(etag, last_modified),
+        "Cache-Control": f"{'private' if private else 'public'}, no-cache",
+    }
+    if is_not_modified(etag, if_none_match, last_modified, if_modified_since):
+        return Response(status_code=304, headers=headers)
+    return StreamingResponse(
+        feed(), media_type="text/calendar; charset=utf-8", headers=headers
+    )
+
+
 @api.get(
     "/{id}",
     responses={404: {"model": None}},
@@ -377,6 +516,44 @@ def get_event_registrations(
     )
 
 
+@api.get(
+    "/{event_id}/registrations/export",
+    response_class=StreamingResponse,
+    tags=["Events"],
+)
+def export_event_registrations(
+    event_id: int,
+    format: Literal["csv", "jsonl"] = "csv",
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+):
+    """
+    Export the registrations of an event as a CSV or JSON Lines download.
+
+    The export is streamed as registrations are read, so that it takes constant memory
+    however many users are registered.
+
+    Args:
+        event_id: the int identifier of an Event
+        format: "csv" or "jsonl"
+        subject: the logged in user making the request
+        event_service: the backing service
+
+    Returns:
+        StreamingResponse: the export as an attachment
+    """
+    event = event_service.get_by_id(event_id, subject)
+    export = event_service.export_registrations(subject, event, format)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export,
+        media_type=f"{media_type}; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="event-{event_id}-registrations.{format}"'
+        },
+    )
+
+
 @api.delete("/{event_id}/registration", tags=["Events"])
 def unregister_for_event(
     event_id: int,
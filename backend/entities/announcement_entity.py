@@ -1,6 +1,17 @@
 """Definition of SQLAlchemy object mapping entity for Announcements."""
 
-from sqlalchemy import Integer, String, Enum, DateTime, ForeignKey, Table, Column
+from sqlalchemy import (
+    Integer,
+    String,
+    Enum,
+    DateTime,
+    ForeignKey,
+    Table,
+    Column,
+    Index,
+    Computed,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .entity_base import EntityBase
 from typing import Self
@@ -15,12 +26,25 @@ from .announcement_user_table import (
 
 __authors__ = ["Nicholas Sanaie"]
 
+# Text search configuration used to build and query announcement search documents
+SEARCH_CONFIG = "english"
+
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(headline, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(syn, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(body, '')), 'C')"
+)
+
 
 class AnnouncementEntity(EntityBase):
     """Model schema used for defining the shape of the 'Announcements' table in the CSXL database."""
 
     # Name for the announcements table in the database
     __tablename__ = "announcement"
+    __table_args__ = (
+        Index("announcement__feed_idx", "status", "published_date", "id", unique=False),
+        Index("announcement__search_idx", "search_vector", postgresql_using="gin"),
+    )
 
     # Properties for announcement columns
 
@@ -52,14 +76,21 @@ class AnnouncementEntity(EntityBase):
     modified_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     # announcement published date
     archived_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    # full-text search document, weighting the headline over the synopsis over the body
+    # NOTE: Generated by the database and deferred, so it is never loaded with the entity.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
 
     # one to many relationship between authors (single) and announcements (many)
-    author_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
+    author_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
     author: Mapped["UserEntity"] = relationship(back_populates="announcements")
 
     # one to many relationship between organizations (single) and announcements (many)
     organization_id: Mapped[int] = mapped_column(
-        ForeignKey("organization.id"), nullable=True
+        ForeignKey("organization.id"), nullable=True, index=True
     )
     organization: Mapped["OrganizationEntity"] = relationship(
         back_populates="announcements"
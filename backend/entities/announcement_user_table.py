@@ -8,16 +8,18 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 # Define association table for upvotes (many-to-many relationship)
+# NOTE: The composite primary key makes each (announcement, user) pair unique so that
+#       upvotes and favorites can be toggled with `INSERT ... ON CONFLICT DO NOTHING`.
 announcement_upvote_table = Table(
     "announcement_upvotes",
     EntityBase.metadata,
-    Column("announcement_id", Integer, ForeignKey("announcement.id")),
-    Column("user_id", Integer, ForeignKey("user.id")),
+    Column("announcement_id", Integer, ForeignKey("announcement.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("user.id"), primary_key=True),
 )
 
 announcement_favorite_table = Table(
     "announcement_favorites",
     EntityBase.metadata,
-    Column("announcement_id", Integer, ForeignKey("announcement.id")),
-    Column("user_id", Integer, ForeignKey("user.id")),
+    Column("announcement_id", Integer, ForeignKey("announcement.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("user.id"), primary_key=True),
 )
@@ -1,7 +1,18 @@
 """Entity for Reservations."""
 
 from datetime import datetime
-from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Index
+from sqlalchemy import (
+    Integer,
+    String,
+    Boolean,
+    ForeignKey,
+    DateTime,
+    Index,
+    column,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
 from ..entity_base import EntityBase
 from ...models.coworking import Reservation, ReservationState
@@ -20,6 +31,24 @@ class ReservationEntity(EntityBase):
     __tablename__ = "coworking__reservation"
     __table_args__ = (
         Index("coworking__reservation_time_idx", "start", "end", "state", unique=False),
+        # Reservations pending time-based transitions, for the reservation sweeper
+        Index(
+            "coworking__reservation_pending_idx",
+            "state",
+            unique=False,
+            postgresql_where=text("state IN ('DRAFT', 'CONFIRMED', 'CHECKED_IN')"),
+        ),
+        # Active reservations of a room may not overlap. Its GiST index also serves
+        # lookups of conflicting room reservations.
+        ExcludeConstraint(
+            ("room_id", "="),
+            (func.tsrange(column("start"), column("end")), "&&"),
+            name="coworking__reservation_room_overlap_excl",
+            using="gist",
+            where=text(
+                "room_id IS NOT NULL AND state IN ('DRAFT', 'CONFIRMED', 'CHECKED_IN')"
+            ),
+        ),
     )
 
     # Reservation Model Fields
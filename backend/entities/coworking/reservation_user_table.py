@@ -1,6 +1,6 @@
 """Join table between Reservation and Seat entities."""
 
-from sqlalchemy import Table, Column, ForeignKey
+from sqlalchemy import Table, Column, ForeignKey, Index
 from ..entity_base import EntityBase
 
 __authors__ = ["Kris Jordan"]
@@ -12,4 +12,6 @@ reservation_user_table = Table(
     EntityBase.metadata,
     Column("reservation_id", ForeignKey("coworking__reservation.id"), primary_key=True),
     Column("user_id", ForeignKey("user.id"), primary_key=True),
+    # Reservations by user, such as for summing a user's weekly study room hours
+    Index("coworking__reservation_user_user_idx", "user_id", "reservation_id"),
 )
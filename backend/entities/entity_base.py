@@ -5,6 +5,7 @@ Additionally, import from the top-level entities file which indexes all entity i
 """
 
 
+from sqlalchemy import DDL, event
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -15,3 +16,16 @@ __license__ = "MIT"
 
 class EntityBase(DeclarativeBase):
     pass
+
+
+# PostgreSQL extensions that entity indexes and constraints depend upon. They are created ahead
+# of the tables whenever the schema is created from metadata, e.g. by the reset scripts and in
+# tests.
+EXTENSIONS = ["pg_trgm", "btree_gist"]
+
+for extension in EXTENSIONS:
+    event.listen(
+        EntityBase.metadata,
+        "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}"),
+    )
@@ -50,6 +50,14 @@ class EventEntity(EntityBase):
         back_populates="event", cascade="all,delete"
     )
 
+    # Organizer registrations for the event, so that listings of many events can load their
+    # organizers without loading every attendee
+    organizer_registrations: Mapped[list["EventRegistrationEntity"]] = relationship(
+        primaryjoin="and_(EventEntity.id == EventRegistrationEntity.event_id, "
+        "EventRegistrationEntity.registration_type == 'ORGANIZER')",
+        viewonly=True,
+    )
+
     @classmethod
     def from_draft_model(cls, model: DraftEvent) -> Self:
         """
@@ -162,3 +170,38 @@ class EventEntity(EntityBase):
             is_organizer=event.is_organizer,
             organizers=event.organizers,
         )
+
+    def to_listing_details_model(
+        self, registration_count: int, is_attendee: bool, is_organizer: bool
+    ) -> EventDetails:
+        """Create a EventDetails model from an EventEntity, with registration aggregates that were
+        queried alongside it rather than computed from its registrations.
+
+        Organizers are taken from `organizer_registrations`, which listings load for every event
+        of a page at once.
+
+        Parameters:
+            - registration_count (int): Number of attendees registered for the event
+            - is_attendee (bool): Whether the subject is registered as an attendee
+            - is_organizer (bool): Whether the subject is registered as an organizer
+        Returns:
+            EventDetails: An EventDetails model for API usage.
+        """
+        return EventDetails(
+            id=self.id,
+            name=self.name,
+            time=self.time,
+            location=self.location,
+            description=self.description,
+            public=self.public,
+            registration_limit=self.registration_limit,
+            registration_count=registration_count,
+            organization_id=self.organization_id,
+            organization=self.organization.to_model(),
+            is_attendee=is_attendee,
+            is_organizer=is_organizer,
+            organizers=[
+                registration.to_flat_model()
+                for registration in self.organizer_registrations
+            ],
+        )
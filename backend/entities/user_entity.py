@@ -1,7 +1,20 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Users."""
 
-from sqlalchemy import Integer, String, Boolean, Column, Table, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Integer,
+    String,
+    Boolean,
+    Column,
+    Table,
+    ForeignKey,
+    Index,
+    delete,
+    exists,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Mapped, mapped_column, relationship, object_session
 from typing import Self
 
 from backend.entities.academics.section_member_entity import SectionMemberEntity
@@ -26,6 +39,24 @@ class UserEntity(EntityBase):
 
     # Name for the user table in the PostgreSQL database
     __tablename__ = "user"
+    # Trigram indexes serve the `ilike('%q%')` substring searches of the user picker. The
+    # lowercase, "C" collation indexes serve case-insensitive prefix searches, in order,
+    # whatever the database's collation; e.g. searches that are too short for trigrams.
+    __table_args__ = (
+        *[
+            Index(
+                f"user__{column}_trgm_idx",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("first_name", "last_name", "onyen", "email")
+        ],
+        *[
+            Index(f"user__{column}_prefix_idx", text(f'lower({column}) COLLATE "C"'))
+            for column in ("first_name", "last_name", "onyen", "email")
+        ],
+    )
 
     # Unique ID for the user entry
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -175,38 +206,67 @@ class UserEntity(EntityBase):
         self.github_avatar = model.github_avatar or ""
         self.accepted_community_agreement = model.accepted_community_agreement
 
-    def upvote_announcement(self, announcement_entity: AnnouncementEntity):
+    def upvote_announcement(self, announcement_entity: AnnouncementEntity) -> bool:
         """
         Upvotes the given announcement for this user.
 
+        The upvote is inserted directly into the upvote table rather than appended to the
+        `announcement_upvotes` collection, so the user's upvotes are never loaded.
+
         Parameters:
             announcement_entity (AnnouncementEntity): The announcement entity to upvote.
+
+        Returns:
+            bool: True if the announcement was not already upvoted by this user.
         """
 
-        if announcement_entity not in self.announcement_upvotes:
-            self.announcement_upvotes.append(announcement_entity)
-            return True
-        return False
+        inserted = object_session(self).execute(
+            insert(announcement_upvote_table)
+            .values(announcement_id=announcement_entity.id, user_id=self.id)
+            .on_conflict_do_nothing()
+            .returning(announcement_upvote_table.c.announcement_id)
+        )
+        return inserted.first() is not None
 
-    def remove_upvote_announcement(self, announcement_entity: AnnouncementEntity):
+    def remove_upvote_announcement(
+        self, announcement_entity: AnnouncementEntity
+    ) -> bool:
         """
         Removes upvote for the given announcement for this user.
 
         Parameters:
             announcement_entity (AnnouncementEntity): The announcement entity to upvote.
+
+        Returns:
+            bool: True if the announcement had been upvoted by this user.
         """
 
-        if announcement_entity in self.announcement_upvotes:
-            self.announcement_upvotes.remove(announcement_entity)
-            return True
-        return False
+        deleted = object_session(self).execute(
+            delete(announcement_upvote_table)
+            .where(
+                announcement_upvote_table.c.announcement_id == announcement_entity.id,
+                announcement_upvote_table.c.user_id == self.id,
+            )
+            .returning(announcement_upvote_table.c.announcement_id)
+        )
+        return deleted.first() is not None
 
-    def check_upvote_announcement(self, announcement_entity: AnnouncementEntity):
+    def check_upvote_announcement(
+        self, announcement_entity: AnnouncementEntity
+    ) -> bool:
         """
-        Checks if the user entity contains the given announcement in its announcement slist
+        Checks if this user has upvoted the given announcement with an indexed existence query.
 
         Parameters:
             announcement_entity (AnnouncementEntity): The announcement entity to upvote.
         """
 
-        return announcement_entity in self.announcement_upvotes
+        return object_session(self).scalar(
+            select(
+                exists().where(
+                    announcement_upvote_table.c.announcement_id
+                    == announcement_entity.id,
+                    announcement_upvote_table.c.user_id == self.id,
+                )
+            )
+        )
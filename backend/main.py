@@ -1,9 +1,11 @@
 """Entrypoint of backend API exposing the FastAPI `app` to be served by an application server such as uvicorn."""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy.orm import Session
 
 from backend.services.coworking.reservation import ReservationException
 
@@ -19,10 +21,22 @@ from .api import (
     room,
     announcements,
 )
-from .api.coworking import status, reservation, ambassador, operating_hours
+from .api.coworking import (
+    status,
+    reservation,
+    ambassador,
+    operating_hours,
+    availability,
+)
 from .api.academics import term, course, section
 from .api.admin import users as admin_users
 from .api.admin import roles as admin_roles
+from .services.announcement_counter_buffer import counter_buffer
+from .services.coworking.reservation_sweeper import reservation_sweeper
+from .services.coworking.operating_hours import OperatingHoursService
+from .services.coworking.operating_hours_index import operating_hours_index
+from .services.permission import PermissionService
+from .database import engine
 from .services.exceptions import (
     EventRegistrationException,
     UserPermissionException,
@@ -37,6 +51,23 @@ description = """
 Welcome to the UNC Computer Science **Experience Labs** RESTful Application Programming Interface.
 """
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    # Answer operating hours queries during the current term from memory
+    with Session(engine) as session:
+        OperatingHoursService(
+            session, PermissionService(session), operating_hours_index
+        ).preload()
+    # Transition reservations whose state lapses with time in the background
+    reservation_sweeper.start()
+    yield
+    reservation_sweeper.close()
+    # Write buffered announcement view and share counts before the process exits
+    counter_buffer.close()
+
+
 # Metadata to improve the usefulness of OpenAPI Docs /docs API Explorer
 app = FastAPI(
     title="UNC CS Experience Labs API",
@@ -55,6 +86,7 @@ app = FastAPI(
         admin_roles.openapi_tags,
         announcements.openapi_tags,
     ],
+    lifespan=lifespan,
 )
 
 # Use GZip middleware for compressing HTML responses over the network
@@ -63,6 +95,7 @@ app.add_middleware(GZipMiddleware)
 # Plugging in each of the router APIs
 feature_apis = [
     status,
+    availability,
     reservation,
     operating_hours,
     events,
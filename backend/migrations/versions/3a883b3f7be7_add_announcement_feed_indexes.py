@@ -0,0 +1,41 @@
+"""Add announcement feed indexes
+
+Revision ID: 3a883b3f7be7
+Revises: 90c56e5464ff
+Create Date: 2024-04-20 10:12:41.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3a883b3f7be7"
+down_revision = "90c56e5464ff"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of the feed seeks on (published_date, id) within a status.
+    op.create_index(
+        "announcement__feed_idx",
+        "announcement",
+        ["status", "published_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_announcement_author_id", "announcement", ["author_id"], unique=False
+    )
+    op.create_index(
+        "ix_announcement_organization_id",
+        "announcement",
+        ["organization_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_announcement_organization_id", table_name="announcement")
+    op.drop_index("ix_announcement_author_id", table_name="announcement")
+    op.drop_index("announcement__feed_idx", table_name="announcement")
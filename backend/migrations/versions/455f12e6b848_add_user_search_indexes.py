@@ -0,0 +1,46 @@
+"""Add trigram and prefix indexes for user search
+
+Revision ID: 455f12e6b848
+Revises: ca10c10092a3
+Create Date: 2024-04-24 16:22:08.913574
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "455f12e6b848"
+down_revision = "ca10c10092a3"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_COLUMNS = ["first_name", "last_name", "onyen", "email"]
+PREFIX_COLUMNS = ["first_name", "last_name", "onyen", "email"]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"user__{column}_trgm_idx",
+            "user",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+    for column in PREFIX_COLUMNS:
+        op.create_index(
+            f"user__{column}_prefix_idx",
+            "user",
+            [sa.text(f'lower({column}) COLLATE "C"')],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    for column in PREFIX_COLUMNS:
+        op.drop_index(f"user__{column}_prefix_idx", table_name="user")
+    for column in TRIGRAM_COLUMNS:
+        op.drop_index(f"user__{column}_trgm_idx", table_name="user")
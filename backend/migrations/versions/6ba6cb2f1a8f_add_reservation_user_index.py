@@ -0,0 +1,32 @@
+"""Add index of reservations by user
+
+Revision ID: 6ba6cb2f1a8f
+Revises: 9c2016eea685
+Create Date: 2024-05-01 14:27:03.918245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "6ba6cb2f1a8f"
+down_revision = "9c2016eea685"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "coworking__reservation_user_user_idx",
+        "coworking__reservation_user",
+        ["user_id", "reservation_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "coworking__reservation_user_user_idx",
+        table_name="coworking__reservation_user",
+    )
@@ -0,0 +1,32 @@
+"""Add partial index of reservations pending time-based transitions
+
+Revision ID: 789cb1623a0d
+Revises: 455f12e6b848
+Create Date: 2024-04-26 10:41:37.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "789cb1623a0d"
+down_revision = "455f12e6b848"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "coworking__reservation_pending_idx",
+        "coworking__reservation",
+        ["state"],
+        unique=False,
+        postgresql_where=sa.text("state IN ('DRAFT', 'CONFIRMED', 'CHECKED_IN')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "coworking__reservation_pending_idx", table_name="coworking__reservation"
+    )
@@ -0,0 +1,55 @@
+"""Add exclusion constraint against overlapping active room reservations
+
+Revision ID: 9c2016eea685
+Revises: 789cb1623a0d
+Create Date: 2024-04-29 09:12:48.530617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9c2016eea685"
+down_revision = "789cb1623a0d"
+branch_labels = None
+depends_on = None
+
+ACTIVE = "state IN ('DRAFT', 'CONFIRMED', 'CHECKED_IN')"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    # Cancel room reservations double-booked before the constraint existed, keeping the
+    # one booked first
+    op.execute(
+        f"""
+        UPDATE coworking__reservation AS later
+        SET state = 'CANCELLED', updated_at = now()
+        WHERE later.room_id IS NOT NULL AND later.{ACTIVE}
+          AND EXISTS (
+            SELECT 1 FROM coworking__reservation AS earlier
+            WHERE earlier.room_id = later.room_id
+              AND earlier.{ACTIVE}
+              AND earlier.id < later.id
+              AND earlier.start < later."end"
+              AND earlier."end" > later.start
+          )
+        """
+    )
+
+    op.create_exclude_constraint(
+        "coworking__reservation_room_overlap_excl",
+        "coworking__reservation",
+        ("room_id", "="),
+        (sa.func.tsrange(sa.column("start"), sa.column("end")), "&&"),
+        using="gist",
+        where=sa.text(f"room_id IS NOT NULL AND {ACTIVE}"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "coworking__reservation_room_overlap_excl", "coworking__reservation"
+    )
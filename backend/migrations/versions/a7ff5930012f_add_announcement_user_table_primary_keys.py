@@ -0,0 +1,51 @@
+"""Add primary keys to announcement upvote and favorite tables
+
+Revision ID: a7ff5930012f
+Revises: 3a883b3f7be7
+Create Date: 2024-04-21 14:03:52.640171
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+
+# revision identifiers, used by Alembic.
+revision = "a7ff5930012f"
+down_revision = "3a883b3f7be7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("announcement_upvotes", "announcement_favorites"):
+        # Remove rows that would violate the new primary key
+        op.execute(
+            text(
+                f"DELETE FROM {table} WHERE announcement_id IS NULL OR user_id IS NULL"
+            )
+        )
+        op.execute(
+            text(
+                f"DELETE FROM {table} a USING {table} b "
+                "WHERE a.ctid < b.ctid "
+                "AND a.announcement_id = b.announcement_id AND a.user_id = b.user_id"
+            )
+        )
+        op.create_primary_key(f"{table}_pkey", table, ["announcement_id", "user_id"])
+
+    # Repair upvote counts that lost increments to concurrent read-modify-write updates
+    op.execute(
+        text(
+            "UPDATE announcement SET upvote_count = ("
+            "SELECT count(*) FROM announcement_upvotes "
+            "WHERE announcement_upvotes.announcement_id = announcement.id)"
+        )
+    )
+
+
+def downgrade() -> None:
+    for table in ("announcement_upvotes", "announcement_favorites"):
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
+        op.alter_column(table, "announcement_id", nullable=True)
+        op.alter_column(table, "user_id", nullable=True)
@@ -0,0 +1,51 @@
+"""Add announcement full-text search vector
+
+Revision ID: ca10c10092a3
+Revises: a7ff5930012f
+Create Date: 2024-04-23 09:41:17.502238
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "ca10c10092a3"
+down_revision = "a7ff5930012f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The stored generated column is computed for existing rows when it is added.
+    op.add_column(
+        "announcement",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(headline, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(syn, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(body, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "announcement__search_idx",
+        "announcement",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "announcement__search_idx",
+        table_name="announcement",
+        postgresql_using="gin",
+    )
+    op.drop_column("announcement", "search_vector")
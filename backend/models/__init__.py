@@ -1,6 +1,11 @@
 """Package for all models in the application."""
 
-from .pagination import Paginated, PaginationParams, EventPaginationParams
+from .pagination import (
+    Paginated,
+    PaginationParams,
+    EventPaginationParams,
+    AnnouncementPaginationParams,
+)
 from .permission import Permission
 from .user import User, ProfileForm
 from .user_details import UserDetails
@@ -36,3 +36,14 @@ class Announcement(BaseModel):
     view_count: int = 0
     share_count: int = 0
     upvote_count: int = 0
+
+
+class AnnouncementSearchResult(Announcement):
+    """
+    Pydantic model to represent an `Announcement` matching a full-text search.
+
+    `snippet` is an excerpt of the body with the matching terms wrapped in `<mark>` tags.
+    """
+
+    rank: float
+    snippet: str
@@ -20,3 +20,13 @@ class AnnouncementDetails(Announcement):
 
 class UpvoteBoolean(BaseModel):
     upvoted: bool
+
+
+class AnnouncementViewerState(BaseModel):
+    """
+    Pydantic model to represent whether the current user has upvoted and favorited an `Announcement`.
+    """
+
+    slug: str
+    upvoted: bool
+    favorited: bool
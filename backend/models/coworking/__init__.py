@@ -11,11 +11,17 @@ from .reservation import (
     ReservationState,
     ReservationPartial,
     ReservationMapDetails,
+    ReservationMapGrid,
     ReservationIdentity,
 )
 
 from .availability_list import AvailabilityList
-from .availability import RoomState, SeatAvailability, RoomAvailability
+from .availability import (
+    RoomState,
+    SeatAvailability,
+    RoomAvailability,
+    AvailabilityDelta,
+)
 
 from .status import Status
 
@@ -29,8 +35,10 @@ __all__ = [
     "ReservationRequest",
     "ReservationPartial",
     "ReservationIdentity",
+    "ReservationMapGrid",
     "AvailabilityList",
     "RoomAvailability",
     "SeatAvailability",
+    "AvailabilityDelta",
     "Status",
 ]
@@ -1,12 +1,15 @@
 """Models for the availability of rooms and seats over a time range."""
 
+from datetime import datetime
 from enum import Enum
+from typing import Literal
 from pydantic import BaseModel, validator
 
 from ..room import Room
 from .seat import Seat
 from .time_range import TimeRange
 from .availability_list import AvailabilityList
+from .reservation import ReservationState
 
 __authors__ = ["Kris Jordan, Yuvraj Jain"]
 __copyright__ = "Copyright 2024"
@@ -31,3 +34,20 @@ class SeatAvailability(Seat, AvailabilityList, BaseModel):
     """A seat that is available for a given time range."""
 
     ...
+
+
+class AvailabilityDelta(BaseModel):
+    """A change to the availability of seats or rooms, published to live subscribers.
+
+    Reservation deltas describe the reservation whose state changed. Operating hours deltas
+    mean the XL's schedule changed, and reset deltas mean changes were missed, so that
+    subscribers should fetch the status or room map again in full."""
+
+    version: int = 0
+    kind: Literal["reservation", "operating_hours", "reset"]
+    reservation_id: int | None = None
+    state: ReservationState | None = None
+    seat_ids: list[int] = []
+    room_id: str | None = None
+    start: datetime | None = None
+    end: datetime | None = None
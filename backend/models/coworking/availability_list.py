@@ -3,6 +3,7 @@
 Handles logic for constraining availability within a bounds, removing availability, and so on.
 """
 
+import bisect
 from datetime import timedelta
 from pydantic import BaseModel, field_validator
 from .time_range import TimeRange
@@ -12,6 +13,14 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+def _start(time_range: TimeRange):
+    return time_range.start
+
+
+def _end(time_range: TimeRange):
+    return time_range.end
+
+
 class AvailabilityList(BaseModel):
     """A list of availability for a given time range.
 
@@ -42,58 +51,42 @@ class AvailabilityList(BaseModel):
 
         Returns:
             None"""
-        front = 0
-        while (
-            front < len(self.availability)
-            and self.availability[front].end <= bounds.start
-        ):
-            front += 1
-
-        self.availability = self.availability[front:]
-        if len(self.availability) > 0:
-            if self.availability[0].start < bounds.start:
-                self.availability[0].start = bounds.start
-        else:
+        front = bisect.bisect_right(self.availability, bounds.start, key=_end)
+        back = bisect.bisect_left(self.availability, bounds.end, key=_start)
+        self.availability = self.availability[front:back]
+        if len(self.availability) == 0:
             return
 
-        back = len(self.availability) - 1
-        while back >= 0 and self.availability[back].start >= bounds.end:
-            back -= 1
-
-        self.availability = self.availability[: back + 1]
-        if len(self.availability) > 0:
-            if self.availability[-1].end > bounds.end:
-                self.availability[-1].end = bounds.end
+        if self.availability[0].start < bounds.start:
+            self.availability[0] = TimeRange.model_construct(
+                start=bounds.start, end=self.availability[0].end
+            )
+        if self.availability[-1].end > bounds.end:
+            self.availability[-1] = TimeRange.model_construct(
+                start=self.availability[-1].start, end=bounds.end
+            )
 
     def subtract(self, block: TimeRange) -> None:
         """Removes availability that overlaps a given block."""
-
-        if len(self.availability) == 0:
+        # Availability ranges from front up to end overlap the block
+        front = bisect.bisect_right(self.availability, block.start, key=_end)
+        end = bisect.bisect_left(self.availability, block.end, key=_start)
+        if front >= end:
             return
 
-        if block.start >= self.availability[-1].end:
-            return
-
-        if block.end <= self.availability[0].start:
-            return
-
-        # Find the first availability range that overalps the block.
-        front = 0
-        while front < len(self.availability) and not block.overlaps(
-            self.availability[front]
-        ):
-            front += 1
-
-        end = front + 1
-        while end < len(self.availability) and block.overlaps(self.availability[end]):
-            end += 1
-
-        availability: list[TimeRange] = self.availability[:front]
-        for i in range(front, end):
-            availability += self.availability[i].subtract(block)
-        availability += self.availability[end:]
-
-        self.availability = availability
+        # Keep the parts of the first and last overlapping ranges outside of the block
+        first, last = self.availability[front], self.availability[end - 1]
+        remainders: list[TimeRange] = []
+        if first.start < block.start:
+            remainders.append(
+                TimeRange.model_construct(start=first.start, end=block.start)
+            )
+        if last.end > block.end:
+            remainders.append(TimeRange.model_construct(start=block.end, end=last.end))
+
+        self.availability = (
+            self.availability[:front] + remainders + self.availability[end:]
+        )
 
     def filter_time_ranges_below(self, minimum: timedelta) -> None:
         """Remove all TimeRanges that are not at least the minimum timedelta.
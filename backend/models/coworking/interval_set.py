@@ -0,0 +1,168 @@
+"""Compact set of disjoint time intervals for availability arithmetic.
+
+Computing the availability of every seat subtracts each of its reservations from the XL's
+operating hours. Doing so with `TimeRange` models builds and validates new models for every
+operation, so `IntervalSet` instead keeps interval bounds in sorted arrays of 64-bit integer
+microseconds since the epoch, locates intervals by binary search, and converts back into
+`TimeRange` models only once a result is returned.
+"""
+
+import bisect
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Self
+
+from .time_range import TimeRange
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch(moment: datetime) -> int:
+    """Convert a naive datetime into microseconds since the epoch."""
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_epoch(microseconds: int) -> datetime:
+    """Convert microseconds since the epoch into a naive datetime."""
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+class IntervalSet:
+    """Disjoint, half-open intervals of epoch microseconds, sorted by start.
+
+    Intervals are kept in two parallel arrays. Since intervals do not overlap, both the
+    starts and the ends are sorted."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts: Iterable[int] = (), ends: Iterable[int] = ()):
+        """Initialize from the already sorted and disjoint bounds of intervals."""
+        self.starts = array("q", starts)
+        self.ends = array("q", ends)
+
+    @classmethod
+    def union(cls, intervals: Iterable[tuple[int, int]]) -> Self:
+        """Build the set of the union of any intervals, which may overlap or be unsorted.
+
+        Overlapping intervals are merged, while adjacent intervals are kept apart."""
+        union = cls()
+        for start, end in sorted(intervals):
+            if start >= end:
+                continue
+            if len(union.ends) > 0 and start < union.ends[-1]:
+                union.ends[-1] = max(union.ends[-1], end)
+            else:
+                union.starts.append(start)
+                union.ends.append(end)
+        return union
+
+    @classmethod
+    def from_time_ranges(cls, time_ranges: Iterable[TimeRange]) -> Self:
+        """Build the set of the union of time ranges, or of models with a start and end."""
+        return cls.union(
+            (to_epoch(time_range.start), to_epoch(time_range.end))
+            for time_range in time_ranges
+        )
+
+    def to_time_ranges(
+        self, shared: dict[tuple[int, int], TimeRange] | None = None
+    ) -> list[TimeRange]:
+        """Convert the intervals into `TimeRange` models, which are valid by construction.
+
+        Converting many sets that have intervals in common, such as those of seats sharing
+        operating hours, can pass the same `shared` dictionary to reuse the models of
+        intervals already converted rather than build them again."""
+        if shared is None:
+            shared = {}
+        time_ranges = []
+        for interval in zip(self.starts, self.ends):
+            time_range = shared.get(interval)
+            if time_range is None:
+                time_range = shared[interval] = TimeRange.model_construct(
+                    start=from_epoch(interval[0]), end=from_epoch(interval[1])
+                )
+            time_ranges.append(time_range)
+        return time_ranges
+
+    def copy(self) -> Self:
+        """Copy the set, such that changes to either leave the other unchanged."""
+        return type(self)(self.starts, self.ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def constrain(self, start: int, end: int) -> None:
+        """Remove the parts of intervals outside of the interval from `start` to `end`."""
+        first = bisect.bisect_right(self.ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        if first >= last:
+            self.starts, self.ends = array("q"), array("q")
+            return
+
+        self.starts, self.ends = self.starts[first:last], self.ends[first:last]
+        self.starts[0] = max(self.starts[0], start)
+        self.ends[-1] = min(self.ends[-1], end)
+
+    def subtract(self, start: int, end: int) -> None:
+        """Remove the interval from `start` to `end`."""
+        # The intervals from first up to last overlap the removed interval
+        first = bisect.bisect_right(self.ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        if first >= last:
+            return
+
+        starts, ends = array("q"), array("q")
+        if self.starts[first] < start:
+            starts.append(self.starts[first])
+            ends.append(start)
+        if self.ends[last - 1] > end:
+            starts.append(end)
+            ends.append(self.ends[last - 1])
+        self.starts[first:last] = starts
+        self.ends[first:last] = ends
+
+    def subtract_many(self, intervals: Iterable[tuple[int, int]]) -> None:
+        """Remove any number of intervals, which may overlap or be unsorted, in one pass."""
+        removed = IntervalSet.union(intervals)
+        if len(removed) == 0:
+            return
+
+        starts, ends = array("q"), array("q")
+        next_removed = 0
+        for start, end in zip(self.starts, self.ends):
+            # Skip removed intervals that end before this interval begins
+            while next_removed < len(removed) and removed.ends[next_removed] <= start:
+                next_removed += 1
+
+            cursor = start
+            i = next_removed
+            while i < len(removed) and removed.starts[i] < end:
+                if removed.starts[i] > cursor:
+                    starts.append(cursor)
+                    ends.append(removed.starts[i])
+                cursor = max(cursor, removed.ends[i])
+                i += 1
+            if cursor < end:
+                starts.append(cursor)
+                ends.append(end)
+
+        self.starts, self.ends = starts, ends
+
+    def filter_shorter_than(self, minimum: int) -> None:
+        """Remove all intervals shorter than `minimum` microseconds."""
+        kept = [
+            (start, end)
+            for start, end in zip(self.starts, self.ends)
+            if end - start >= minimum
+        ]
+        self.starts = array("q", (start for start, _ in kept))
+        self.ends = array("q", (end for _, end in kept))
+
+    def total_duration(self) -> int:
+        """The total length of the intervals, in microseconds."""
+        return sum(self.ends) - sum(self.starts)
@@ -46,6 +46,20 @@ class ReservationMapDetails(BaseModel):
     number_of_time_slots: int | None = None
 
 
+class ReservationMapGrid(BaseModel):
+    """The reservation map of one day, with each room's slot states run-length encoded.
+
+    Each run is a slot's state digit followed by the number of consecutive slots in that
+    state, and runs are separated by commas, e.g. `[3, 3, 0, 0, 0, 4]` is `"32,03,41"`.
+    """
+
+    date: datetime
+    room_slot_runs: dict[str, str] = {}
+    operating_hours_start: datetime | None = None
+    operating_hours_end: datetime | None = None
+    number_of_time_slots: int | None = None
+
+
 class ReservationPartial(Reservation, BaseModel):
     start: datetime | None = None
     end: datetime | None = None
@@ -58,11 +58,12 @@ class TimeRange(BaseModel):
 
         results = []
 
+        # The remainders are valid by construction, so skip validating them
         if self.start < other.start:
-            results.append(TimeRange(start=self.start, end=other.start))
+            results.append(TimeRange.model_construct(start=self.start, end=other.start))
 
         if self.end > other.end:
-            results.append(TimeRange(start=other.end, end=self.end))
+            results.append(TimeRange.model_construct(start=other.end, end=self.end))
 
         return results
 
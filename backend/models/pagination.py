@@ -29,9 +29,24 @@ class EventPaginationParams(PaginationParams):
     range_end: str = ""
 
 
+class AnnouncementPaginationParams(PaginationParams):
+    """Parameters passed from the client to paginate announcement results.
+
+    Announcements are paginated by keyset rather than by offset: `cursor` is the opaque
+    position of the last item of the previous page (empty for the first page). The
+    `params` of a returned page carry the cursor of the following page."""
+
+    order_by: str = "published_date"
+    ascending: bool = False
+    cursor: str = ""
+    organization_id: int | None = None
+    author_id: int | None = None
+    status: str = ""
+
+
 class Paginated(BaseModel, Generic[T]):
     """Generic class for returning paginating results to the client."""
 
     items: list[T]
     length: int
-    params: PaginationParams | EventPaginationParams
+    params: PaginationParams | EventPaginationParams | AnnouncementPaginationParams
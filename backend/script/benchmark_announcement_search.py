@@ -0,0 +1,141 @@
+"""Benchmark full-text search of announcements over a synthetic corpus.
+
+Inserts a synthetic corpus of published announcements (50,000 by default) and times
+`AnnouncementService.search` against an equivalent `ilike('%q%')` scan of the headline,
+synopsis and body. Everything runs in one transaction that is rolled back at the end, so
+the development database is left unchanged.
+
+Usage: python3 -m backend.script.benchmark_announcement_search [rows]
+"""
+
+import random
+import sys
+import time
+from sqlalchemy import func, insert, or_, select, text
+from sqlalchemy.orm import Session
+
+from ..database import engine
+from ..env import getenv
+from ..entities.announcement_entity import AnnouncementEntity
+from ..entities.user_entity import UserEntity
+from ..models.announcement import AnnouncementStatus
+from ..models.pagination import PaginationParams
+from ..services.announcement import AnnouncementService
+from ..services.permission import PermissionService
+
+__authors__ = ["agent"]
+
+if getenv("MODE") != "development":
+    print("This script can only be run in development mode.", file=sys.stderr)
+    print("Add MODE=development to your .env file in workspace's `backend/` directory")
+    exit(1)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+BATCH_SIZE = 5_000
+REPETITIONS = 20
+QUERIES = [
+    "hackathon",
+    "internship applications",
+    "security or mentorship",
+    "robotics -club",
+]
+
+TERMS = (
+    "apply applications club meeting interest members project team teams education "
+    "positions open spring fall semester deadline workshop career fair internship "
+    "research lab seminar talk speaker alumni mentor mentorship resume interview "
+    "coding contest prizes pizza social networking students faculty department "
+    "volunteer outreach robotics design systems security data science machine "
+    "learning web mobile game development open source hackathon registration"
+).split()
+
+
+def vocabulary(rng: random.Random, size: int) -> list[str]:
+    """Returns the announcement terms mixed into `size` pronounceable filler words."""
+    syllables = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "do"]
+    words = {
+        "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        for _ in range(size)
+    }
+    words = sorted(words - set(TERMS))
+    rng.shuffle(words)
+    # Spread the terms over the frequency ranks, so queries range from common to rare
+    for i, term in enumerate(TERMS):
+        words.insert(i * len(words) // (len(TERMS) * 4), term)
+    return words
+
+
+def sentence(rng: random.Random, words: list[str], weights: list[float], n: int) -> str:
+    return " ".join(rng.choices(words, weights, k=n)).capitalize()
+
+
+def timed(run) -> float:
+    """Returns the median wall time of `run` in milliseconds."""
+    samples = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+with Session(engine) as session:
+    rng = random.Random(423)
+    words = vocabulary(rng, 20_000)
+    weights = [1 / rank for rank in range(1, len(words) + 1)]  # Zipf's law
+
+    author = session.scalars(select(UserEntity).limit(1)).first()
+    if author is None:
+        author = UserEntity(pid=100_000_000, onyen="benchmark", email="bench@unc.edu")
+        session.add(author)
+        session.flush()
+
+    start = time.perf_counter()
+    for batch_start in range(0, ROWS, BATCH_SIZE):
+        session.execute(
+            insert(AnnouncementEntity),
+            [
+                {
+                    "headline": sentence(rng, words, weights, 6),
+                    "syn": sentence(rng, words, weights, 15),
+                    "body": sentence(rng, words, weights, 120),
+                    "slug": f"benchmark-{i}",
+                    "author_id": author.id,
+                    "status": AnnouncementStatus.PUBLISHED,
+                }
+                for i in range(batch_start, min(batch_start + BATCH_SIZE, ROWS))
+            ],
+        )
+    session.execute(text("ANALYZE announcement"))
+    print(f"Inserted {ROWS} announcements in {time.perf_counter() - start:.1f}s\n")
+
+    announcement_svc = AnnouncementService(session, PermissionService(session))
+
+    print(f"{'query':<26}{'matches':>9}{'search (ms)':>14}{'ilike (ms)':>13}")
+    for query in QUERIES:
+        params = PaginationParams(filter=query, page_size=10)
+        matches = announcement_svc.search(params).length
+        search_ms = timed(lambda: announcement_svc.search(params))
+
+        # The substring scan the search replaces, on the first term only
+        term = query.strip('"').split()[0]
+        scan = (
+            select(AnnouncementEntity.id)
+            .where(
+                or_(
+                    AnnouncementEntity.headline.ilike(f"%{term}%"),
+                    AnnouncementEntity.syn.ilike(f"%{term}%"),
+                    AnnouncementEntity.body.ilike(f"%{term}%"),
+                )
+            )
+            .order_by(AnnouncementEntity.id.desc())
+            .limit(10)
+        )
+        scan_count = select(func.count()).select_from(scan.limit(None).subquery())
+        ilike_ms = timed(
+            lambda: (session.execute(scan).all(), session.execute(scan_count).scalar())
+        )
+
+        print(f"{query:<26}{matches:>9}{search_ms:>14.2f}{ilike_ms:>13.2f}")
+
+    session.rollback()
@@ -0,0 +1,86 @@
+"""Benchmark permission checks for users with many grants.
+
+Times matching an action and resource against synthetic permission sets of increasing size,
+shaped like those of administrators who manage many organizations and events. The compiled
+`PermissionMatcher` is compared to the scan it replaces, which expanded every permission's
+action and resource into a regular expression, once per request-scoped service, and tested
+them in turn. No database is used.
+
+Usage: python3 -m backend.script.benchmark_permission_check
+"""
+
+import re
+import time
+
+from ..services.permission_matcher import PermissionMatcher, compile_permissions
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+GRANTS = [10, 100, 500, 1000]
+REPETITIONS = 20
+CHECKS = 200
+
+CASES = {
+    "first grant": ("organization.update", "organization/org-0"),
+    "last grant": ("event.update", "event/{last}"),
+    "wildcard grant": ("coworking.reservation.read", "user/1"),
+    "denied": ("user.delete", "user/1"),
+}
+
+
+def permissions(size: int) -> list[tuple[str, str]]:
+    """Returns `size` (action, resource) grants: one per organization and event managed."""
+    grants = [("coworking.reservation.*", "*"), ("checkin.create", "checkin")]
+    for i in range((size - len(grants)) // 2):
+        grants.append(("organization.*", f"organization/org-{i}"))
+        grants.append(("event.*", f"event/{i}"))
+    return grants
+
+
+def scan(grants: list[tuple[str, str]], action: str, resource: str) -> bool:
+    """The replaced check: each request compiled the patterns it tested, then scanned them."""
+    expanded: dict[str, re.Pattern] = {}
+
+    def expand(pattern: str) -> re.Pattern:
+        if pattern not in expanded:
+            expanded[pattern] = re.compile(f"^{pattern.replace('*', '.*')}$")
+        return expanded[pattern]
+
+    for grant_action, grant_resource in grants:
+        if expand(grant_action).fullmatch(action) is not None:
+            if expand(grant_resource).fullmatch(resource) is not None:
+                return True
+    return False
+
+
+def timed(run) -> float:
+    """Returns the median wall time of one call of `run` in microseconds."""
+    samples = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        for _ in range(CHECKS):
+            run()
+        samples.append((time.perf_counter() - start) * 1_000_000 / CHECKS)
+    return sorted(samples)[len(samples) // 2]
+
+
+print(
+    f"{'grants':>7}  {'check':<16}{'scan (us)':>11}{'matcher (us)':>14}"
+    f"{'compile (us)':>14}"
+)
+for size in GRANTS:
+    grants = permissions(size)
+    patterns = tuple(grants)
+    matcher = compile_permissions(patterns)
+    compile_us = timed(lambda: PermissionMatcher(patterns))
+    for case, (action, resource) in CASES.items():
+        resource = resource.format(last=(size - 2) // 2 - 1)
+        assert scan(grants, action, resource) == matcher.matches(action, resource)
+        scan_us = timed(lambda: scan(grants, action, resource))
+        matcher_us = timed(lambda: matcher.matches(action, resource))
+        print(
+            f"{size:>7}  {case:<16}{scan_us:>11.2f}{matcher_us:>14.2f}"
+            f"{compile_us:>14.2f}"
+        )
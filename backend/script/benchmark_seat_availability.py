@@ -0,0 +1,180 @@
+"""Benchmark computing the availability of many seats with many reservations.
+
+Generates synthetic seats (200 by default) and a day of reservations among them (2,000 by
+default), and times the computation of every seat's availability from the reservations, as
+`ReservationService.seat_availability` does once they are fetched. The `AvailabilityMatrix`
+the service uses is compared to subtracting each seat's reservations from its own
+`IntervalSet`, and to the `AvailabilityList` models both replace. No database is used.
+
+Usage: python3 -m backend.script.benchmark_seat_availability [seats] [reservations]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from ..models.coworking import (
+    AvailabilityList,
+    Reservation,
+    ReservationState,
+    Seat,
+    SeatAvailability,
+    TimeRange,
+)
+from ..models.coworking.interval_set import MICROSECOND, IntervalSet, to_epoch
+from ..models.user import User
+from ..services.coworking import PolicyService, ReservationService
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+SEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+RESERVATIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+REPETITIONS = 20
+THRESHOLD = timedelta(minutes=29)
+HALF_HOURS = 28  # The XL is open from 8 am to 10 pm
+
+
+def model_availability(
+    seats: list[Seat], open_hours: TimeRange, reservations: list[Reservation]
+) -> list[SeatAvailability]:
+    """The replaced computation, subtracting reservations from availability models."""
+    open_availability = AvailabilityList(availability=[open_hours])
+    availability = {
+        seat.id: SeatAvailability(
+            availability=open_availability.model_copy(deep=True).availability,
+            **seat.model_dump(),
+        )
+        for seat in seats
+    }
+    for reservation in reservations:
+        for seat in reservation.seats:
+            availability[seat.id].subtract(reservation)
+    available_seats = []
+    for seat_availability in availability.values():
+        seat_availability.filter_time_ranges_below(THRESHOLD)
+        if len(seat_availability.availability) > 0:
+            available_seats.append(seat_availability)
+    available_seats.sort(
+        key=lambda sa: (
+            sa.availability[0].start,
+            -1 * sa.availability[0].duration(),
+            sa.reservable,
+            random.random(),
+        )
+    )
+    return available_seats
+
+
+def interval_set_availability(
+    seats: list[Seat], open_intervals: IntervalSet, reservations: list[Reservation]
+) -> list[SeatAvailability]:
+    """Subtracting the reservations of each seat from its own copy of the open intervals."""
+    reserved: dict[int, list[tuple[int, int]]] = {seat.id: [] for seat in seats}
+    for reservation in reservations:
+        interval = (to_epoch(reservation.start), to_epoch(reservation.end))
+        for seat in reservation.seats:
+            reserved[seat.id].append(interval)
+    available_seats = []
+    for seat in seats:
+        availability = open_intervals.copy()
+        availability.subtract_many(reserved[seat.id])
+        availability.filter_shorter_than(THRESHOLD // MICROSECOND)
+        if len(availability) > 0:
+            available_seats.append((seat, availability))
+    available_seats.sort(
+        key=lambda seat_availability: (
+            seat_availability[1].starts[0],
+            seat_availability[1].starts[0] - seat_availability[1].ends[0],
+            seat_availability[0].reservable,
+            random.random(),
+        )
+    )
+    return [
+        SeatAvailability.model_construct(
+            availability=availability.to_time_ranges(), **dict(seat)
+        )
+        for seat, availability in available_seats
+    ]
+
+
+def timed(run) -> float:
+    """Returns the median wall time of `run` in milliseconds."""
+    samples = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+rng = random.Random(423)
+opening = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+open_hours = TimeRange(start=opening, end=opening + HALF_HOURS * timedelta(minutes=30))
+seats = [
+    Seat(
+        id=i,
+        title=f"Seat {i}",
+        shorthand=f"{i}",
+        reservable=i % 4 == 0,
+        has_monitor=True,
+        sit_stand=False,
+        x=0,
+        y=0,
+    )
+    for i in range(SEATS)
+]
+user = User(id=1, pid=100_000_000, onyen="benchmark", email="bench@unc.edu")
+
+# Reservations of a seat may not overlap, so each takes a distinct half hour of its seat's day
+reservations = []
+for i, seat in enumerate(seats):
+    count = RESERVATIONS // SEATS + (1 if i < RESERVATIONS % SEATS else 0)
+    for slot in sorted(rng.sample(range(HALF_HOURS), count)):
+        start = opening + slot * timedelta(minutes=30)
+        reservations.append(
+            Reservation(
+                id=len(reservations),
+                start=start,
+                end=start + timedelta(minutes=30),
+                state=ReservationState.CONFIRMED,
+                users=[user],
+                seats=[seat],
+                walkin=False,
+                created_at=opening,
+                updated_at=opening,
+            )
+        )
+reservations.sort(key=lambda reservation: reservation.start)
+
+reservation_svc = ReservationService(None, None, PolicyService(), None, None)  # type: ignore
+open_intervals = IntervalSet.from_time_ranges([open_hours])
+
+
+def matrix_availability() -> list[SeatAvailability]:
+    return reservation_svc._available_seats(
+        seats, open_intervals, reservations, THRESHOLD
+    )
+
+
+models = model_availability(seats, open_hours, reservations)
+intervals = interval_set_availability(seats, open_intervals, reservations)
+matrix = matrix_availability()
+for result in (intervals, matrix):
+    assert {seat.id: seat.availability for seat in models} == {
+        seat.id: seat.availability for seat in result
+    }
+
+models_ms = timed(lambda: model_availability(seats, open_hours, reservations))
+intervals_ms = timed(
+    lambda: interval_set_availability(seats, open_intervals, reservations)
+)
+matrix_ms = timed(matrix_availability)
+print(f"{len(seats)} seats, {len(reservations)} reservations")
+print(
+    f"{'AvailabilityList (ms)':>22}{'IntervalSet (ms)':>18}"
+    f"{'AvailabilityMatrix (ms)':>25}"
+)
+print(f"{models_ms:>22.2f}{intervals_ms:>18.2f}{matrix_ms:>25.2f}")
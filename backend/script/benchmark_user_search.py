@@ -0,0 +1,112 @@
+"""Benchmark the typeahead user search over a synthetic user table.
+
+Inserts synthetic users (100,000 by default) and times `UserService.search` for PID, onyen,
+name, and email queries as they are typed, keystroke by keystroke. Everything runs in one
+transaction that is rolled back at the end, so the development database is left unchanged.
+
+Usage: python3 -m backend.script.benchmark_user_search [rows]
+"""
+
+import itertools
+import random
+import sys
+import time
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from ..database import engine
+from ..env import getenv
+from ..entities.user_entity import UserEntity
+from ..services.permission import PermissionService
+from ..services.user import UserService
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+if getenv("MODE") != "development":
+    print("This script can only be run in development mode.", file=sys.stderr)
+    print("Add MODE=development to your .env file in workspace's `backend/` directory")
+    exit(1)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+BATCH_SIZE = 10_000
+REPETITIONS = 20
+SYLLABLES = "an bel cha da el fi ga ha is jo ka li ma ne o pa qui ra sa ta u vi wen xi ya zo".split()
+
+
+def names(rng: random.Random, size: int) -> tuple[list[str], list[float]]:
+    """Returns `size` distinct pronounceable names and weights for picking them, so that
+    the most common name is shared by a few percent of users, as in a real population.
+    """
+    pool = set()
+    while len(pool) < size:
+        pool.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 3))).capitalize())
+    weights = [1 / rank**0.7 for rank in range(1, size + 1)]
+    return sorted(pool), list(itertools.accumulate(weights))
+
+
+def timed(run) -> float:
+    """Returns the median wall time of `run` in milliseconds."""
+    samples = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+with Session(engine) as session:
+    rng = random.Random(423)
+    pids = rng.sample(range(700_000_000, 800_000_000), ROWS)
+    first_names, first_weights = names(rng, 2_000)
+    last_names, last_weights = names(rng, 5_000)
+    onyens = set()
+
+    start = time.perf_counter()
+    for batch_start in range(0, ROWS, BATCH_SIZE):
+        rows = []
+        for i in range(batch_start, min(batch_start + BATCH_SIZE, ROWS)):
+            first_name = rng.choices(first_names, cum_weights=first_weights)[0]
+            last_name = rng.choices(last_names, cum_weights=last_weights)[0]
+            # Onyens are up to eight characters, commonly an initial and the last name
+            base = (first_name[0] + last_name).lower()
+            onyen = base[:8]
+            while onyen in onyens:
+                suffix = str(rng.randint(1, 9999))
+                onyen = base[: 8 - len(suffix)] + suffix
+            onyens.add(onyen)
+            rows.append(
+                {
+                    "pid": pids[i],
+                    "onyen": onyen,
+                    "email": f"{onyen}@unc.edu",
+                    "first_name": first_name,
+                    "last_name": last_name,
+                }
+            )
+        session.execute(insert(UserEntity), rows)
+    session.execute(text('ANALYZE "user"'))
+    print(f"Inserted {ROWS} users in {time.perf_counter() - start:.1f}s\n")
+
+    # Statement logging would otherwise dominate the timings
+    engine.echo = False
+    user_svc = UserService(session, PermissionService(session))
+    queries = [
+        str(pids[-1]),
+        rows[-1]["onyen"],
+        f"{first_names[0]} {last_names[0]}",
+        rows[-1]["last_name"],
+        rows[-1]["email"],
+    ]
+
+    print(f"{'query':<24}{'results':>9}{'search (ms)':>14}")
+    for query in queries:
+        # Each keystroke of the query is searched, as the user picker does while typing
+        for length in range(1, len(query) + 1):
+            prefix = query[:length]
+            results = len(user_svc.search(None, prefix))  # type: ignore
+            search_ms = timed(lambda: user_svc.search(None, prefix))  # type: ignore
+            print(f"{prefix:<24}{results:>9}{search_ms:>14.2f}")
+
+    session.rollback()
@@ -0,0 +1,169 @@
+"""Load test the live availability stream with many idle local subscribers.
+
+First subscribes many subscribers (10,000 by default) to the `AvailabilityBroadcaster` on one
+event loop, publishes deltas from another thread as reservation writes do, and measures how
+long each delta takes to reach every subscriber and the memory each subscriber costs. Then
+serves the availability stream API from a local uvicorn server, connects many server-sent
+event subscribers over HTTP (500 by default), and measures the same end to end. No database
+is used.
+
+Usage: python3 -m backend.script.loadtest_availability_stream [subscribers] [http_subscribers]
+"""
+
+import asyncio
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from ..api.authentication import generate_scoped_token
+from ..api.coworking import availability
+from ..models.coworking import AvailabilityDelta, ReservationState
+from ..services.coworking.availability_events import availability_events
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+SUBSCRIBERS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+HTTP_SUBSCRIBERS = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+DELTAS = 20
+DELTA_INTERVAL = 0.05  # Seconds between deltas, as during a busy hour of reservations
+
+
+def delta(i: int) -> AvailabilityDelta:
+    return AvailabilityDelta(
+        kind="reservation",
+        reservation_id=i,
+        state=ReservationState.CONFIRMED,
+        seat_ids=[i % 200],
+    )
+
+
+def publish(published: dict[int, float]) -> None:
+    """Publishes deltas from a thread other than the subscribers', timing each."""
+    for i in range(DELTAS):
+        time.sleep(DELTA_INTERVAL)
+        published[availability_events.version + 1] = time.perf_counter()
+        availability_events.publish(delta(i))
+
+
+def report(label: str, subscribers: int, latencies: list[float]) -> None:
+    """Prints the delivery latencies of deltas, in milliseconds."""
+    latencies.sort()
+    expected = subscribers * DELTAS
+    print(
+        f"{label:<10}{subscribers:>12,}{len(latencies):>12,}/{expected:<10,}"
+        f"{latencies[len(latencies) // 2] * 1000:>10.2f}"
+        f"{latencies[int(len(latencies) * 0.99)] * 1000:>10.2f}"
+        f"{latencies[-1] * 1000:>10.2f}"
+    )
+
+
+async def broadcaster_subscribers() -> None:
+    """Times delivery of deltas to subscribers of the broadcaster on this event loop."""
+    published: dict[int, float] = {}
+    latencies: list[float] = []
+    ready = asyncio.Event()
+    subscribed = 0
+
+    async def subscriber() -> None:
+        nonlocal subscribed
+        async with availability_events.subscribe() as subscription:
+            subscribed += 1
+            if subscribed == SUBSCRIBERS:
+                ready.set()
+            for _ in range(DELTAS):
+                received = await subscription.get()
+                latencies.append(time.perf_counter() - published[received.version])
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(subscriber()) for _ in range(SUBSCRIBERS)]
+    await ready.wait()
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / SUBSCRIBERS
+    tracemalloc.stop()
+
+    publisher = threading.Thread(target=publish, args=(published,))
+    publisher.start()
+    await asyncio.gather(*tasks)
+    publisher.join()
+
+    report("local", SUBSCRIBERS, latencies)
+    print(f"memory per idle local subscriber: {per_subscriber / 1024:.1f} KiB")
+
+
+async def http_subscribers(port: int) -> None:
+    """Times delivery of deltas to server-sent event subscribers of a local server."""
+    published: dict[int, float] = {}
+    latencies: list[float] = []
+    token = generate_scoped_token(
+        100_000_000, availability.STREAM_TOKEN_SCOPE, availability.STREAM_TOKEN_LIFETIME
+    )
+    connected = asyncio.Event()
+    connections = 0
+
+    async def subscriber(client: httpx.AsyncClient) -> None:
+        nonlocal connections
+        async with client.stream(
+            "GET",
+            f"http://127.0.0.1:{port}/api/coworking/availability/stream",
+            params={"token": token},
+        ) as response:
+            received = 0
+            async for line in response.aiter_lines():
+                if line.startswith("retry:"):
+                    connections += 1
+                    if connections == HTTP_SUBSCRIBERS:
+                        connected.set()
+                elif line.startswith("id: "):
+                    latencies.append(time.perf_counter() - published[int(line[4:])])
+                    received += 1
+                    if received == DELTAS:
+                        return
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+        tasks = [
+            asyncio.create_task(subscriber(client)) for _ in range(HTTP_SUBSCRIBERS)
+        ]
+        await connected.wait()
+        publisher = threading.Thread(target=publish, args=(published,))
+        publisher.start()
+        await asyncio.gather(*tasks)
+        publisher.join()
+
+    report("http", HTTP_SUBSCRIBERS, latencies)
+
+
+def serve() -> tuple[uvicorn.Server, int]:
+    """Serves only the availability API from a local server on a free port."""
+    app = FastAPI()
+    app.include_router(availability.api)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, port
+
+
+print(f"{DELTAS} deltas, one every {DELTA_INTERVAL * 1000:.0f} ms")
+print(
+    f"{'':<10}{'subscribers':>12}{'delivered':>12}{'':<11}"
+    f"{'p50 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}"
+)
+asyncio.run(broadcaster_subscribers())
+
+server, port = serve()
+asyncio.run(http_subscribers(port))
+server.should_exit = True
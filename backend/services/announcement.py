@@ -2,27 +2,86 @@
 This Announcements Service is for use with the API to create, edit and delete announcement data in the database.
 """
 
+import base64
+import html
+import json
+
 from fastapi import Depends, HTTPException
-from sqlalchemy import desc, select
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, desc, exists, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 from ..database import db_session
-from ..models.announcement import Announcement, AnnouncementStatus
+from ..models.announcement import (
+    Announcement,
+    AnnouncementSearchResult,
+    AnnouncementStatus,
+)
 from ..models.announcement_comment import Comment
-from ..models.announcement_details import AnnouncementDetails, UpvoteBoolean
-from ..entities.announcement_entity import AnnouncementEntity
+from ..models.announcement_details import (
+    AnnouncementDetails,
+    AnnouncementViewerState,
+    UpvoteBoolean,
+)
+from ..models.pagination import (
+    AnnouncementPaginationParams,
+    Paginated,
+    PaginationParams,
+)
+from ..entities.announcement_entity import AnnouncementEntity, SEARCH_CONFIG
 from ..entities.announcements_comment_entity import AnnouncementCommentEntity
+from ..entities.announcement_user_table import (
+    announcement_upvote_table,
+    announcement_favorite_table,
+)
 from ..entities.organization_entity import OrganizationEntity
 from ..entities.user_entity import UserEntity
 from ..models import User
 from .permission import PermissionService
+from .announcement_counter_buffer import (
+    AnnouncementCounterBuffer,
+    announcement_counter_buffer,
+)
 
 from .exceptions import ResourceNotFoundException, UserPermissionException
+from .pagination import count, paginate
 
 __authors__ = ["Nicholas Sanaie", "Mark Maio", "Tyler Roth", "Tanner Macpherson"]
 
+# Loader profiles eagerly load the relationships each view converts to models, so that
+# listing N announcements costs a constant number of queries rather than 2N lazy loads.
+# Many-to-one relationships are joined in; collections are fetched with a second SELECT.
+# Lists of announcements, whether the public feed or the admin list, render the author and
+# organization of each; details also render comments.
+LOADER_PROFILES = {
+    "list": [
+        joinedload(AnnouncementEntity.author),
+        joinedload(AnnouncementEntity.organization),
+    ],
+    "details": [
+        joinedload(AnnouncementEntity.author),
+        joinedload(AnnouncementEntity.organization),
+        selectinload(AnnouncementEntity.comments).joinedload(
+            AnnouncementCommentEntity.author
+        ),
+    ],
+}
+
+# The most announcements whose viewer states are checked at once, which bounds the size of the
+# query to that of a page of the feed
+VIEWER_STATES_LIMIT = 100
+
+# Matches in search snippets are delimited with control characters rather than HTML, so
+# that the snippet can be escaped before the delimiters are replaced with <mark> tags.
+SNIPPET_START = "\x02"
+SNIPPET_STOP = "\x03"
+SNIPPET_OPTIONS = (
+    f'StartSel="{SNIPPET_START}", StopSel="{SNIPPET_STOP}", '
+    "MaxWords=35, MinWords=15, MaxFragments=2"
+)
+
 
 class AnnouncementService:
     """Service for performing CRUD actions on the 'Announcement' table in the database."""
@@ -31,9 +90,13 @@ class AnnouncementService:
         self,
         session: Session = Depends(db_session),
         permission: PermissionService = Depends(),
+        counter_buffer: AnnouncementCounterBuffer = Depends(
+            announcement_counter_buffer
+        ),
     ):
         self._session = session
         self._permission = permission
+        self._counter_buffer = counter_buffer
 
     def all_published(self) -> list[Announcement]:
         """
@@ -45,6 +108,7 @@ class AnnouncementService:
 
         entities = (
             self._session.query(AnnouncementEntity)
+            .options(*LOADER_PROFILES["list"])
             .where(AnnouncementEntity.status == AnnouncementStatus.PUBLISHED)
             .order_by(desc(AnnouncementEntity.id))
             .all()
@@ -63,6 +127,7 @@ class AnnouncementService:
 
         entities = (
             self._session.query(AnnouncementEntity)
+            .options(*LOADER_PROFILES["list"])
             .where(
                 (AnnouncementEntity.status == AnnouncementStatus.PUBLISHED)
                 | (
@@ -80,6 +145,225 @@ class AnnouncementService:
 
         return [entity.to_model() for entity in entities]
 
+    def get_paginated_announcements(
+        self,
+        pagination_params: AnnouncementPaginationParams,
+        subject: User | None = None,
+    ) -> Paginated[Announcement]:
+        """
+        Retrieves a page of announcements using keyset pagination on (published_date, id).
+
+        Without a subject only published announcements are visible. With a subject, the
+        visibility rules of `all_admin` apply and the subject must have admin permissions.
+
+        Parameters:
+            pagination_params: the keyset pagination parameters and feed filters
+            subject: a valid User model representing the currently logged in User, if any
+
+        Returns:
+            Paginated[Announcement]: the page of announcements, whose `params` hold the cursor of the next page
+
+        Raises:
+            ResourceNotFoundException if the cursor or ordering is invalid
+        """
+        if subject is None:
+            criteria = AnnouncementEntity.status == AnnouncementStatus.PUBLISHED
+        else:
+            self._permission.enforce(subject, "announcement.create", f"announcement")
+            criteria = (AnnouncementEntity.status == AnnouncementStatus.PUBLISHED) | (
+                (
+                    (AnnouncementEntity.status == AnnouncementStatus.ARCHIVED)
+                    | (AnnouncementEntity.status == AnnouncementStatus.DRAFT)
+                )
+                & (subject.id == AnnouncementEntity.author_id)
+            )
+
+        statement = (
+            select(AnnouncementEntity).options(*LOADER_PROFILES["list"]).where(criteria)
+        )
+
+        # Apply feed filters
+        filters = []
+        if pagination_params.status != "":
+            try:
+                filters.append(
+                    AnnouncementEntity.status
+                    == AnnouncementStatus(pagination_params.status)
+                )
+            except ValueError:
+                raise ResourceNotFoundException(
+                    f"Invalid announcement status: {pagination_params.status}"
+                )
+        if pagination_params.organization_id is not None:
+            filters.append(
+                AnnouncementEntity.organization_id == pagination_params.organization_id
+            )
+        if pagination_params.author_id is not None:
+            filters.append(AnnouncementEntity.author_id == pagination_params.author_id)
+        if len(filters) > 0:
+            statement = statement.where(*filters)
+
+        # The length counts every announcement of the feed, before seeking past the cursor
+        length = count(self._session, statement)
+
+        # Order and seek past the cursor. NULL published dates (drafts) sort as the largest
+        # values, matching PostgreSQL's default and the order of `announcement__feed_idx`.
+        if pagination_params.order_by not in ("published_date", "id"):
+            raise ResourceNotFoundException(
+                f"Announcements cannot be ordered by: {pagination_params.order_by}"
+            )
+        ascending = pagination_params.ascending
+        if pagination_params.order_by == "published_date":
+            order = (AnnouncementEntity.published_date, AnnouncementEntity.id)
+        else:
+            order = (AnnouncementEntity.id,)
+        statement = statement.order_by(
+            *[column if ascending else column.desc() for column in order]
+        )
+
+        if pagination_params.cursor != "":
+            published_date, id = self._decode_cursor(pagination_params.cursor)
+            statement = statement.where(
+                self._keyset_criteria(
+                    pagination_params.order_by, ascending, published_date, id
+                )
+            )
+
+        statement = statement.limit(pagination_params.page_size)
+
+        entities = self._session.execute(statement).scalars().all()
+
+        # The cursor of the next page is the position of the last item of this page
+        next_cursor = ""
+        if len(entities) == pagination_params.page_size and len(entities) > 0:
+            next_cursor = self._encode_cursor(entities[-1])
+
+        return Paginated(
+            items=[entity.to_model() for entity in entities],
+            length=length,
+            params=pagination_params.model_copy(update={"cursor": next_cursor}),
+        )
+
+    def _encode_cursor(self, entity: AnnouncementEntity) -> str:
+        """Encodes the keyset position of an announcement as an opaque cursor string."""
+        published_date = (
+            entity.published_date.isoformat() if entity.published_date else None
+        )
+        position = json.dumps({"published_date": published_date, "id": entity.id})
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> tuple[datetime | None, int]:
+        """Decodes an opaque cursor string into its (published_date, id) keyset position."""
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            published_date = (
+                datetime.fromisoformat(position["published_date"])
+                if position["published_date"]
+                else None
+            )
+            return published_date, int(position["id"])
+        except (ValueError, KeyError, TypeError):
+            raise ResourceNotFoundException(f"Invalid pagination cursor: {cursor}")
+
+    def _keyset_criteria(
+        self,
+        order_by: str,
+        ascending: bool,
+        published_date: datetime | None,
+        id: int,
+    ):
+        """Builds the criteria selecting the announcements strictly after a keyset position."""
+        if order_by == "id":
+            return (
+                AnnouncementEntity.id > id if ascending else AnnouncementEntity.id < id
+            )
+
+        position = tuple_(AnnouncementEntity.published_date, AnnouncementEntity.id)
+        if published_date is None:
+            # The cursor is within the run of NULL published dates
+            after_in_nulls = AnnouncementEntity.published_date.is_(None) & (
+                AnnouncementEntity.id > id if ascending else AnnouncementEntity.id < id
+            )
+            if ascending:
+                return after_in_nulls
+            return after_in_nulls | AnnouncementEntity.published_date.is_not(None)
+
+        if ascending:
+            return (position > tuple_(published_date, id)) | (
+                AnnouncementEntity.published_date.is_(None)
+            )
+        return position < tuple_(published_date, id)
+
+    def search(
+        self, pagination_params: PaginationParams
+    ) -> Paginated[AnnouncementSearchResult]:
+        """
+        Full-text searches the headline, synopsis and body of published announcements.
+
+        The query, given as `pagination_params.filter`, is parsed with `websearch_to_tsquery`
+        so it accepts the syntax of a web search box ("quoted phrases", -exclusions, or).
+        Matches are found through the GIN index on `search_vector` and ordered by rank,
+        with headline matches ranking above synopsis matches above body matches.
+
+        Parameters:
+            pagination_params: the page to retrieve and the search query as its `filter`
+
+        Returns:
+            Paginated[AnnouncementSearchResult]: the page of matching announcements, best match first
+        """
+        if pagination_params.filter.strip() == "":
+            return Paginated(items=[], length=0, params=pagination_params)
+
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, pagination_params.filter)
+        criteria = (AnnouncementEntity.status == AnnouncementStatus.PUBLISHED) & (
+            AnnouncementEntity.search_vector.bool_op("@@")(query)
+        )
+        rank = func.ts_rank_cd(AnnouncementEntity.search_vector, query)
+
+        # Rank and page the matches first, so that snippets are only built for one page
+        ranked = (
+            select(AnnouncementEntity.id, rank.label("rank"))
+            .where(criteria)
+            .order_by(rank.desc(), AnnouncementEntity.id.desc())
+        )
+        page, length = paginate(self._session, ranked, pagination_params)
+        if len(page) == 0:
+            return Paginated(items=[], length=length, params=pagination_params)
+
+        snippet = func.ts_headline(
+            SEARCH_CONFIG, AnnouncementEntity.body, query, SNIPPET_OPTIONS
+        )
+        statement = (
+            select(AnnouncementEntity, snippet)
+            .where(AnnouncementEntity.id.in_([id for id, _ in page]))
+            .options(*LOADER_PROFILES["list"])
+        )
+        excerpts = {
+            entity.id: (entity, excerpt)
+            for entity, excerpt in self._session.execute(statement).all()
+        }
+
+        return Paginated(
+            items=[
+                AnnouncementSearchResult(
+                    **excerpts[id][0].to_model().model_dump(),
+                    rank=score,
+                    snippet=self._highlight(excerpts[id][1]),
+                )
+                for id, score in page
+            ],
+            length=length,
+            params=pagination_params,
+        )
+
+    def _highlight(self, snippet: str) -> str:
+        """Escapes a `ts_headline` snippet as HTML, then marks its delimited matches."""
+        return (
+            html.escape(snippet)
+            .replace(SNIPPET_START, "<mark>")
+            .replace(SNIPPET_STOP, "</mark>")
+        )
+
     def get_by_slug(self, slug: str) -> AnnouncementDetails:
         """
         Get the announcement details from a slug
@@ -96,6 +380,7 @@ class AnnouncementService:
         """
         announcement = (
             self._session.query(AnnouncementEntity)
+            .options(*LOADER_PROFILES["details"])
             .filter(AnnouncementEntity.slug == slug)
             .one_or_none()
         )
@@ -128,6 +413,7 @@ class AnnouncementService:
         """
         announcement = (
             self._session.query(AnnouncementEntity)
+            .options(*LOADER_PROFILES["details"])
             .filter(AnnouncementEntity.slug == slug)
             .one_or_none()
         )
@@ -388,7 +674,9 @@ class AnnouncementService:
 
     def update_views(self, subject: User, slug: str) -> Announcement:
         """
-        Increments the view count statistic of an announcement by 1 if the user requesting the change has not already viewed the announcement.
+        Increments the view count statistic of an announcement by 1.
+
+        Views are buffered and written behind in batches by the `AnnouncementCounterBuffer`.
 
         Parameters:
             subject: a valid User model represnting the currently logged in User
@@ -398,123 +686,195 @@ class AnnouncementService:
             Announcement: updated 'Announcement' object from the entity
         """
 
-        announcement = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
-        )
+        return self._buffered_increment(slug, "view_count")
 
-        if announcement is None:
-            raise ResourceNotFoundException(
-                f"No announcement found with matching slug: {slug}"
-            )
+    def update_shares(self, subject: User, slug: str) -> Announcement:
+        """
+        Increments the share count statistic of an announcement by 1.
 
-        announcement.view_count += 1
+        Shares are buffered and written behind in batches by the `AnnouncementCounterBuffer`.
 
-        self._session.commit()
+        Parameters:
+            subject: a valid User model represnting the currently logged in User
+            slug: a unique string representing a unique announcement
 
-        return announcement.to_model()
+        Returns:
+            Announcement: updated 'Announcement' object from the entity
+        """
 
-    def update_shares(self, subject: User, slug: str) -> Announcement:
+        return self._buffered_increment(slug, "share_count")
+
+    def _buffered_increment(self, slug: str, counter: str) -> Announcement:
         """
-        Increments the view count statistic of an announcement by 1 if the user requesting the change has not already viewed the announcement.
+        Increments a counter of the announcement with the given slug through the counter buffer.
+
+        The increment is written behind by the buffer, so the returned announcement adds the
+        increments still pending in the buffer to the counter stored in the database. When the
+        buffer is in sync mode, the increment is written immediately instead.
 
         Parameters:
-            subject: a valid User model represnting the currently logged in User
             slug: a unique string representing a unique announcement
+            counter: the name of the counter column to increment
 
         Returns:
             Announcement: updated 'Announcement' object from the entity
-        """
 
-        announcement = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
-        )
+        Raises:
+            ResourceNotFoundException if no announcement is found with the corresponding slug
+        """
+        if self._counter_buffer.sync:
+            announcement = self._increment_counters(
+                AnnouncementEntity.slug == slug, **{counter: 1}
+            )
+        else:
+            announcement = self._session.scalars(
+                select(AnnouncementEntity)
+                .options(*LOADER_PROFILES["list"])
+                .where(AnnouncementEntity.slug == slug)
+            ).one_or_none()
 
         if announcement is None:
             raise ResourceNotFoundException(
                 f"No announcement found with matching slug: {slug}"
             )
 
-        announcement.share_count += 1
+        # Convert before committing, which would expire the freshly loaded entity
+        model = announcement.to_model()
 
-        self._session.commit()
+        if self._counter_buffer.sync:
+            self._session.commit()
+        else:
+            pending = self._counter_buffer.add(slug, counter)
+            setattr(model, counter, getattr(model, counter) + pending)
 
-        return announcement.to_model()
+        return model
 
-    def add_upvote(self, subject: User, slug: str) -> Announcement:
+    def _increment_counters(
+        self, criteria, **increments: int
+    ) -> AnnouncementEntity | None:
         """
-        Increments the upvote statistic of an announcement by 1 if the user requesting the change has not already upvoted the announcement.
+        Atomically increments counter columns of the announcement matching the criteria.
+
+        The `UPDATE ... SET column = column + n ... RETURNING` runs in a CTE that is joined
+        to the author and organization, so concurrent increments are never lost and the
+        updated announcement is loaded in a single round trip.
 
         Parameters:
-            subject: a valid User model represnting the currently logged in User
-            slug: a unique string representing a unique announcement
+            criteria: the SQL criteria selecting the announcement to update
+            increments: the amount to add to each named counter column
 
         Returns:
-            Announcement: updated 'Announcement' object from the entity
+            AnnouncementEntity | None: the updated entity, or None if no announcement matched
         """
-
-        announcement_entity = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
+        updated = (
+            update(AnnouncementEntity)
+            .where(criteria)
+            .values(
+                {
+                    column: getattr(AnnouncementEntity, column) + amount
+                    for column, amount in increments.items()
+                }
+            )
+            .returning(*AnnouncementEntity.__table__.columns)
+            .cte("updated")
         )
-        subject_entity = (
-            self._session.query(UserEntity)
-            .filter(UserEntity.id == subject.id)
-            .one_or_none()
+        announcement = aliased(AnnouncementEntity, updated)
+        return self._session.scalars(
+            select(announcement)
+            .options(
+                joinedload(announcement.author), joinedload(announcement.organization)
+            )
+            .execution_options(populate_existing=True)
+        ).one_or_none()
+
+    def _get_announcement_id(self, slug: str) -> int:
+        """
+        Looks up the id of the announcement with the given slug.
+
+        Raises:
+            ResourceNotFoundException if no announcement is found with the corresponding slug
+        """
+        announcement_id = self._session.scalar(
+            select(AnnouncementEntity.id).where(AnnouncementEntity.slug == slug)
         )
 
-        if announcement_entity is None:
+        if announcement_id is None:
             raise ResourceNotFoundException(
                 f"No announcement found with matching slug: {slug}"
             )
 
-        if subject_entity.upvote_announcement(announcement_entity):
-            announcement_entity.upvote_count += 1
+        return announcement_id
+
+    def add_upvote(self, subject: User, slug: str) -> UpvoteBoolean:
+        """
+        Increments the upvote statistic of an announcement by 1 if the user requesting the change has not already upvoted the announcement.
+
+        The upvote is inserted with `ON CONFLICT DO NOTHING` and the count is only incremented
+        when a row was inserted, in the same statement, so concurrent requests cannot double count.
+
+        Parameters:
+            subject: a valid User model represnting the currently logged in User
+            slug: a unique string representing a unique announcement
+
+        Returns:
+            UpvoteBoolean: a model that contains the boolean for the current status of the statistic
+        """
+
+        announcement_id = self._get_announcement_id(slug)
+
+        inserted = (
+            insert(announcement_upvote_table)
+            .values(announcement_id=announcement_id, user_id=subject.id)
+            .on_conflict_do_nothing()
+            .returning(announcement_upvote_table.c.announcement_id)
+            .cte("inserted")
+        )
+        self._session.execute(
+            update(AnnouncementEntity)
+            .where(AnnouncementEntity.id.in_(select(inserted.c.announcement_id)))
+            .values(upvote_count=AnnouncementEntity.upvote_count + 1)
+        )
 
         self._session.commit()
 
         return UpvoteBoolean(upvoted=True)
 
-    def remove_upvote(self, subject: User, slug: str) -> Announcement:
+    def remove_upvote(self, subject: User, slug: str) -> UpvoteBoolean:
         """
         Decrements the upvote statistic of an announcement by 1 if the user requesting the change has upvoted the announcement.
 
+        The count is only decremented when an upvote row was deleted, in the same statement.
+
         Parameters:
             subject: a valid User model represnting the currently logged in User
             slug: a unique string representing a unique announcement
 
         Returns:
-            Announcement: updated 'Announcement' object from the entity
+            UpvoteBoolean: a model that contains the boolean for the current status of the statistic
         """
 
-        announcement_entity = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
-        )
-        subject_entity = (
-            self._session.query(UserEntity)
-            .filter(UserEntity.id == subject.id)
-            .one_or_none()
-        )
+        announcement_id = self._get_announcement_id(slug)
 
-        if announcement_entity is None:
-            raise ResourceNotFoundException(
-                f"No announcement found with matching slug: {slug}"
+        deleted = (
+            delete(announcement_upvote_table)
+            .where(
+                announcement_upvote_table.c.announcement_id == announcement_id,
+                announcement_upvote_table.c.user_id == subject.id,
             )
-
-        if subject_entity.remove_upvote_announcement(announcement_entity):
-            announcement_entity.upvote_count -= 1
+            .returning(announcement_upvote_table.c.announcement_id)
+            .cte("deleted")
+        )
+        self._session.execute(
+            update(AnnouncementEntity)
+            .where(AnnouncementEntity.id.in_(select(deleted.c.announcement_id)))
+            .values(upvote_count=AnnouncementEntity.upvote_count - 1)
+        )
 
         self._session.commit()
 
         return UpvoteBoolean(upvoted=False)
 
-    def check_upvote(self, subject: User, slug: str) -> Announcement:
+    def check_upvote(self, subject: User, slug: str) -> UpvoteBoolean:
         """
         Checks if the subject has upvoted the announcement with the given slug.
 
@@ -523,28 +883,10 @@ class AnnouncementService:
             slug: a unique string representing a unique announcement
 
         Returns:
-            upvoted: a boolean that is True if user has upvoted and false if not
+            UpvoteBoolean: a model that contains the boolean for the current status of the statistic
         """
 
-        announcement_entity = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
-        )
-        subject_entity = (
-            self._session.query(UserEntity)
-            .filter(UserEntity.id == subject.id)
-            .one_or_none()
-        )
-
-        if announcement_entity is None:
-            raise ResourceNotFoundException(
-                f"No announcement found with matching slug: {slug}"
-            )
-
-        return UpvoteBoolean(
-            upvoted=subject_entity.check_upvote_announcement(announcement_entity)
-        )
+        return UpvoteBoolean(upvoted=self._get_viewer_state(subject, slug).upvoted)
 
     def add_favorite(self, subject: User, slug: str) -> UpvoteBoolean:
         """
@@ -560,24 +902,13 @@ class AnnouncementService:
             UpvoteBoolean: a model that contains the boolean for the current status of the statistic
         """
 
-        announcement_entity = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
-        )
-        subject_entity = (
-            self._session.query(UserEntity)
-            .filter(UserEntity.id == subject.id)
-            .one_or_none()
-        )
+        announcement_id = self._get_announcement_id(slug)
 
-        if announcement_entity is None:
-            raise ResourceNotFoundException(
-                f"No announcement found with matching slug: {slug}"
-            )
-
-        if announcement_entity not in subject_entity.announcement_favorites:
-            subject_entity.announcement_favorites.append(announcement_entity)
+        self._session.execute(
+            insert(announcement_favorite_table)
+            .values(announcement_id=announcement_id, user_id=subject.id)
+            .on_conflict_do_nothing()
+        )
 
         self._session.commit()
 
@@ -597,24 +928,14 @@ class AnnouncementService:
             UpvoteBoolean: a model that contains the boolean for the current status of the statistic
         """
 
-        announcement_entity = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
-        )
-        subject_entity = (
-            self._session.query(UserEntity)
-            .filter(UserEntity.id == subject.id)
-            .one_or_none()
-        )
+        announcement_id = self._get_announcement_id(slug)
 
-        if announcement_entity is None:
-            raise ResourceNotFoundException(
-                f"No announcement found with matching slug: {slug}"
+        self._session.execute(
+            delete(announcement_favorite_table).where(
+                announcement_favorite_table.c.announcement_id == announcement_id,
+                announcement_favorite_table.c.user_id == subject.id,
             )
-
-        if announcement_entity in subject_entity.announcement_favorites:
-            subject_entity.announcement_favorites.remove(announcement_entity)
+        )
 
         self._session.commit()
 
@@ -634,22 +955,70 @@ class AnnouncementService:
             UpvoteBoolean: a model that contains the boolean for the current status of the statistic
         """
 
-        announcement_entity = (
-            self._session.query(AnnouncementEntity)
-            .filter(AnnouncementEntity.slug == slug)
-            .one_or_none()
+        return UpvoteBoolean(upvoted=self._get_viewer_state(subject, slug).favorited)
+
+    def get_viewer_states(
+        self, subject: User, slugs: list[str]
+    ) -> list[AnnouncementViewerState]:
+        """
+        Retrieves whether the subject has upvoted and favorited each of the given announcements.
+
+        The flags for a whole page of announcements are computed with indexed existence checks
+        against the upvote and favorite tables in a single query.
+
+        Parameters:
+            subject: a valid User model represnting the currently logged in User
+            slugs: the unique strings representing the announcements to check
+
+        Returns:
+            list[AnnouncementViewerState]: the viewer state of each existing announcement, in the order of `slugs`
+
+        Raises:
+            ValueError if more than `VIEWER_STATES_LIMIT` slugs are given
+        """
+        if len(slugs) == 0:
+            return []
+        if len(slugs) > VIEWER_STATES_LIMIT:
+            raise ValueError(
+                f"At most {VIEWER_STATES_LIMIT} announcements can be checked at once"
+            )
+
+        upvoted = exists().where(
+            announcement_upvote_table.c.announcement_id == AnnouncementEntity.id,
+            announcement_upvote_table.c.user_id == subject.id,
         )
-        subject_entity = (
-            self._session.query(UserEntity)
-            .filter(UserEntity.id == subject.id)
-            .one_or_none()
+        favorited = exists().where(
+            announcement_favorite_table.c.announcement_id == AnnouncementEntity.id,
+            announcement_favorite_table.c.user_id == subject.id,
         )
+        rows = self._session.execute(
+            select(
+                AnnouncementEntity.slug,
+                upvoted.label("upvoted"),
+                favorited.label("favorited"),
+            ).where(AnnouncementEntity.slug.in_(slugs))
+        ).all()
+
+        viewer_states = {
+            row.slug: AnnouncementViewerState(
+                slug=row.slug, upvoted=row.upvoted, favorited=row.favorited
+            )
+            for row in rows
+        }
+        return [viewer_states[slug] for slug in slugs if slug in viewer_states]
 
-        if announcement_entity is None:
+    def _get_viewer_state(self, subject: User, slug: str) -> AnnouncementViewerState:
+        """
+        Retrieves whether the subject has upvoted and favorited the announcement with the given slug.
+
+        Raises:
+            ResourceNotFoundException if no announcement is found with the corresponding slug
+        """
+        viewer_states = self.get_viewer_states(subject, [slug])
+
+        if len(viewer_states) == 0:
             raise ResourceNotFoundException(
                 f"No announcement found with matching slug: {slug}"
             )
 
-        return UpvoteBoolean(
-            upvoted=announcement_entity in subject_entity.announcement_favorites
-        )
+        return viewer_states[0]
@@ -0,0 +1,177 @@
+"""
+The Announcement Counter Buffer coalesces view and share count increments in memory and
+writes them behind to the database in batches.
+
+Every announcement page view increments a counter. Committing each increment as it happens
+makes the view count endpoint the hottest write path of the application, so increments are
+instead summed per slug and flushed with one batched UPDATE on an interval, or sooner once
+enough increments are pending.
+"""
+
+import logging
+import threading
+
+from sqlalchemy import Engine, Integer, String, column, update, values
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..database import engine
+from ..entities.announcement_entity import AnnouncementEntity
+
+__authors__ = ["agent"]
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = ("view_count", "share_count")
+"""The announcement counter columns that may be buffered."""
+
+
+class AnnouncementCounterBuffer:
+    """Write-behind buffer of announcement counter increments, keyed by slug."""
+
+    def __init__(
+        self,
+        flush_interval: float = 5.0,
+        flush_threshold: int = 500,
+        sync: bool = False,
+        engine: Engine = engine,
+    ):
+        """
+        Initializes the buffer. The background flusher thread starts on the first increment.
+
+        Parameters:
+            flush_interval: the maximum number of seconds increments stay buffered
+            flush_threshold: the number of pending increments that triggers an early flush
+            sync: when True, the buffer is bypassed and increments are written immediately
+            engine: the engine used by the flusher to open its own sessions
+        """
+        self.sync = sync
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict[str, int]] = {}
+        self._pending_total = 0
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def add(self, slug: str, counter: str, amount: int = 1) -> int:
+        """
+        Buffers an increment of a counter of the announcement with the given slug.
+
+        Once the buffer is closed there is no flusher left to write increments behind, so
+        they are written through to the database immediately instead.
+
+        Parameters:
+            slug: a unique string representing a unique announcement
+            counter: the name of the counter column, one of `COUNTER_COLUMNS`
+            amount: the amount to add to the counter
+
+        Returns:
+            int: the amount of this counter for the slug that was pending, including this
+            increment, when it was added
+        """
+        if counter not in COUNTER_COLUMNS:
+            raise ValueError(f"Announcement counter cannot be buffered: {counter}")
+
+        with self._lock:
+            counters = self._pending.setdefault(slug, {})
+            counters[counter] = counters.get(counter, 0) + amount
+            self._pending_total += amount
+            pending = counters[counter]
+            should_flush = self._pending_total >= self._flush_threshold
+            closed = self._closed
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="announcement-counter-buffer", daemon=True
+                )
+                self._thread.start()
+
+        if closed:
+            self.flush()
+        elif should_flush:
+            self._wakeup.set()
+
+        return pending
+
+    def pending(self, slug: str, counter: str) -> int:
+        """Returns the amount of a counter of the given slug that is not yet flushed."""
+        with self._lock:
+            return self._pending.get(slug, {}).get(counter, 0)
+
+    def flush(self) -> None:
+        """
+        Writes all pending increments to the database in a single batched UPDATE.
+
+        If the write fails, the increments are put back into the buffer to be retried.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_total = 0
+
+        if len(pending) == 0:
+            return
+
+        increments = values(
+            column("slug", String),
+            *[column(counter, Integer) for counter in COUNTER_COLUMNS],
+            name="increments",
+        ).data(
+            [
+                (slug, *[counters.get(counter, 0) for counter in COUNTER_COLUMNS])
+                for slug, counters in pending.items()
+            ]
+        )
+        statement = (
+            update(AnnouncementEntity)
+            .where(AnnouncementEntity.slug == increments.c.slug)
+            .values(
+                {
+                    counter: getattr(AnnouncementEntity, counter)
+                    + increments.c[counter]
+                    for counter in COUNTER_COLUMNS
+                }
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            with Session(self._engine) as session:
+                session.execute(statement)
+                session.commit()
+        except SQLAlchemyError:
+            logger.exception("Failed to flush announcement counters, will retry")
+            with self._lock:
+                for slug, counters in pending.items():
+                    buffered = self._pending.setdefault(slug, {})
+                    for counter, amount in counters.items():
+                        buffered[counter] = buffered.get(counter, 0) + amount
+                        self._pending_total += amount
+
+    def close(self) -> None:
+        """Stops the background flusher and flushes any pending increments."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        """Flushes pending increments every interval, or sooner when woken up."""
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            if not self._closed:
+                self.flush()
+
+
+counter_buffer = AnnouncementCounterBuffer()
+"""Application-level announcement counter buffer."""
+
+
+def announcement_counter_buffer() -> AnnouncementCounterBuffer:
+    """Function offering dependency injection of the application-level counter buffer."""
+    return counter_buffer
@@ -2,4 +2,5 @@ from .policy import PolicyService
 from .status import StatusService
 from .operating_hours import OperatingHoursService
 from .seat import SeatService
+from .room_quota import RoomQuotaService
 from .reservation import ReservationService
@@ -0,0 +1,174 @@
+"""
+The Availability Broadcaster publishes changes to seat and room availability to live
+subscribers, such as the server-sent event stream of the coworking UI.
+
+Rather than every browser polling the coworking status and room reservation map to find
+changes, writes to reservations and operating hours publish an `AvailabilityDelta` as they
+commit. Writes happen in the worker threads of synchronous routes, while subscribers wait on
+an asyncio event loop, so each delta is handed to each event loop once. There, deltas are
+appended to a log that all of the loop's subscribers read from at their own pace, and one
+shared future wakes all waiting subscribers at once. An idle subscriber costs only its place
+in the log, and a single timer per event loop wakes idle subscribers to keep their
+connections alive.
+
+A subscriber that falls so far behind that its unread deltas leave the log is sent a reset
+delta, after which it should fetch the availability it shows again in full. Deltas are
+published within the process, so each application server process serves its own subscribers.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from ...models.coworking import AvailabilityDelta
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+class _LoopChannel:
+    """The log of recent deltas shared by the subscribers on one event loop.
+
+    Must only be changed on its event loop, except for its count of subscribers."""
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, log_size: int, keepalive: float
+    ):
+        self.loop = loop
+        self.subscribers = 0
+        self.deltas: deque[AvailabilityDelta] = deque(maxlen=log_size)
+        self.changed: asyncio.Future[None] = loop.create_future()
+        self._keepalive = keepalive
+        self._timer = loop.call_later(keepalive, self._tick)
+
+    def append(self, delta: AvailabilityDelta) -> None:
+        """Appends a delta to the log and wakes all waiting subscribers."""
+        self.deltas.append(delta)
+        self._wake()
+
+    def close(self) -> None:
+        """Stops waking idle subscribers."""
+        self._timer.cancel()
+
+    def _tick(self) -> None:
+        """Wakes idle subscribers, then schedules the next wake up."""
+        self._wake()
+        self._timer = self.loop.call_later(self._keepalive, self._tick)
+
+    def _wake(self) -> None:
+        changed, self.changed = self.changed, self.loop.create_future()
+        changed.set_result(None)
+
+
+class AvailabilitySubscription:
+    """A subscriber's position in the log of deltas of its event loop."""
+
+    def __init__(self, channel: _LoopChannel, version: int):
+        self._channel = channel
+        self._version = version
+
+    async def get(self) -> AvailabilityDelta | None:
+        """Waits for the next delta, or for the keepalive interval to elapse.
+
+        Returns:
+            AvailabilityDelta | None: the next delta, a reset delta when deltas were missed, or None after an idle keepalive interval
+        """
+        delta = self._next()
+        if delta is None:
+            # Shield the future shared with other subscribers from this one's cancellation
+            await asyncio.shield(self._channel.changed)
+            delta = self._next()
+        return delta
+
+    def _next(self) -> AvailabilityDelta | None:
+        """Reads the next delta in the log, if any."""
+        deltas = self._channel.deltas
+        if len(deltas) == 0 or deltas[-1].version <= self._version:
+            return None
+
+        oldest = deltas[0].version
+        if self._version + 1 < oldest:
+            # Deltas not yet read have left the log
+            self._version = deltas[-1].version
+            return AvailabilityDelta(version=self._version, kind="reset")
+
+        delta = deltas[self._version + 1 - oldest]
+        self._version = delta.version
+        return delta
+
+
+class AvailabilityBroadcaster:
+    """Publishes availability deltas from any thread to subscribers on event loops."""
+
+    def __init__(self, log_size: int = 64, keepalive: float = 15.0):
+        """
+        Initializes a broadcaster without subscribers.
+
+        Parameters:
+            log_size: the number of unread deltas after which a subscriber is reset
+            keepalive: the number of seconds after which idle subscribers are woken
+        """
+        self._log_size = log_size
+        self._keepalive = keepalive
+        self._lock = threading.Lock()
+        self._version = 0
+        self._channels: dict[asyncio.AbstractEventLoop, _LoopChannel] = {}
+
+    @property
+    def version(self) -> int:
+        """The version of the latest delta published."""
+        return self._version
+
+    def subscriber_count(self) -> int:
+        """The number of subscribers on all event loops."""
+        with self._lock:
+            return sum(channel.subscribers for channel in self._channels.values())
+
+    def publish(self, delta: AvailabilityDelta) -> AvailabilityDelta:
+        """
+        Publishes a delta to all subscribers. Safe to call from any thread.
+
+        Parameters:
+            delta: the change in availability
+
+        Returns:
+            AvailabilityDelta: the delta published, with its version
+        """
+        with self._lock:
+            self._version += 1
+            delta = delta.model_copy(update={"version": self._version})
+            # Handed over while locked, so that each log receives deltas in version order
+            for channel in self._channels.values():
+                try:
+                    channel.loop.call_soon_threadsafe(channel.append, delta)
+                except RuntimeError:
+                    ...  # The event loop has closed, along with its subscribers
+        return delta
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[AvailabilitySubscription]:
+        """Subscribes to deltas published from now on the running event loop, until the
+        context exits."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            channel = self._channels.get(loop)
+            if channel is None:
+                channel = _LoopChannel(loop, self._log_size, self._keepalive)
+                self._channels[loop] = channel
+            channel.subscribers += 1
+            subscription = AvailabilitySubscription(channel, self._version)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                channel.subscribers -= 1
+                if channel.subscribers == 0:
+                    del self._channels[loop]
+                    channel.close()
+
+
+availability_events = AvailabilityBroadcaster()
+"""Application-level availability broadcaster."""
@@ -0,0 +1,133 @@
+"""Availability of many seats at once, for the coworking status and walk-in assignment.
+
+The availability window is cut into columns at every operating hours and reservation
+boundary within it, so each column is a stretch of time throughout which every seat is either
+free or not. Each seat's row is then a bitmap in which bit `i` is set when the seat is free
+during column `i`: reserving a seat clears a range of its bits in one operation, and a seat's
+free runs and their lengths are read off its bitmap with a few bitwise operations rather
+than by passes over its reservations. Back-to-back operating hours, such as 10-2 and 2-6,
+stay separate intervals of availability, as they are in an `IntervalSet`, so a free run also
+ends wherever operating hours begin.
+
+Most seats share the same row, such as every seat that is not reserved within the window, so
+the availability of each distinct row is derived once and shared by all of its seats.
+"""
+
+import bisect
+from array import array
+from typing import Iterable
+
+from ...models.coworking.interval_set import IntervalSet
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+class AvailabilityMatrix:
+    """Bitmaps of the columns of time during which each seat is free."""
+
+    def __init__(
+        self,
+        open_intervals: IntervalSet,
+        reservations: Iterable[tuple[int, int, int]],
+    ):
+        """Initialize the matrix of seats' availability while open, less their reservations.
+
+        Args:
+            open_intervals (IntervalSet): The intervals during which seats may be available.
+            reservations (Iterable[tuple[int, int, int]]): The seat ID, start, and end in epoch microseconds of each reservation of a seat.
+        """
+        self._availability: dict[tuple[int, int], tuple[IntervalSet, int, int]] = {}
+        reservations = list(reservations)
+        if len(open_intervals) == 0:
+            self.bounds = array("q")
+            self.open = 0
+            self.edges = 0
+            self.reserved: dict[int, int] = {}
+            return
+
+        first, last = open_intervals.starts[0], open_intervals.ends[-1]
+        bounds = {*open_intervals.starts, *open_intervals.ends}
+        for _, start, end in reservations:
+            if start < last and end > first:
+                bounds.add(max(start, first))
+                bounds.add(min(end, last))
+        self.bounds = array("q", sorted(bounds))
+
+        self.open = 0
+        self.edges = 0
+        for start, end in zip(open_intervals.starts, open_intervals.ends):
+            self.open |= self.mask(start, end)
+            self.edges |= 1 << self.column(start)
+
+        self.reserved = {}
+        for seat_id, start, end in reservations:
+            self.reserved[seat_id] = self.reserved.get(seat_id, 0) | self.mask(
+                start, end
+            )
+
+    def column(self, moment: int) -> int:
+        """The index of the first column boundary at or after `moment`."""
+        return bisect.bisect_left(self.bounds, moment)
+
+    def mask(self, start: int, end: int) -> int:
+        """The bitmap of the columns from `start` to `end`, leaving out those outside the matrix."""
+        low = self.column(start)
+        high = min(self.column(end), len(self.bounds) - 1)
+        if low >= high:
+            return 0
+        return (1 << high) - (1 << low)
+
+    def row(self, seat_id: int) -> int:
+        """The bitmap of the columns during which a seat is free."""
+        return self.open & ~self.reserved.get(seat_id, 0)
+
+    def availability(
+        self, seat_id: int, threshold: int
+    ) -> tuple[IntervalSet, int, int]:
+        """The availability of a seat, less its runs of availability shorter than `threshold`.
+
+        Seats with the same row share the same `IntervalSet`, which must not be changed.
+
+        Args:
+            seat_id (int): The ID of the seat.
+            threshold (int): The minimum duration of availability in microseconds.
+
+        Returns:
+            tuple[IntervalSet, int, int]: The intervals the seat is available, the start of the first, and its duration. The start and duration are 0 when the seat is not available.
+        """
+        row = self.row(seat_id)
+        availability = self._availability.get((row, threshold))
+        if availability is not None:
+            return availability
+
+        intervals = IntervalSet()
+        remaining = row
+        while remaining:
+            # The lowest set bit starts a run of set bits, which ends at the lowest unset bit
+            low = (remaining & -remaining).bit_length() - 1
+            run = remaining >> low
+            high = low + (~run & (run + 1)).bit_length() - 1
+            # The run also ends at the start of the next operating hours within it
+            later_edges = self.edges >> (low + 1)
+            if later_edges:
+                edge = low + (later_edges & -later_edges).bit_length()
+                high = min(high, edge)
+            remaining &= ~((1 << high) - 1)
+            start, end = self.bounds[low], self.bounds[high]
+            if end - start >= threshold:
+                intervals.starts.append(start)
+                intervals.ends.append(end)
+
+        if len(intervals) > 0:
+            first_start = intervals.starts[0]
+            first_duration = intervals.ends[0] - first_start
+        else:
+            first_start, first_duration = 0, 0
+        availability = self._availability[(row, threshold)] = (
+            intervals,
+            first_start,
+            first_duration,
+        )
+        return availability
@@ -0,0 +1,126 @@
+"""Occupancy of rooms over a day's half-hour time slots, for the room reservation map.
+
+Each room's day is a set of bitmaps, one per layer of the map, in which bit `i` stands for the
+`i`-th half-hour slot from the start of operating hours. Reservations and office hours are
+added to the layers as bit ranges, and the layers are then combined into each slot's
+`RoomState` with a handful of bitwise operations per room, rather than by nested passes
+over every slot of every room.
+
+For maps of many days at once, each room's slot states are run-length encoded, since rooms
+are mostly available or unavailable for long stretches of a day.
+"""
+
+from datetime import datetime, time
+from itertools import groupby
+from typing import Iterable, Sequence
+
+from ...models.coworking import RoomState
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+class OccupancyMap:
+    """Bitmaps of the reserved, subject-reserved, and unavailable slots of each room."""
+
+    def __init__(self, start: datetime, slots: int, room_ids: Iterable[str]):
+        """Initialize a map of rooms that are available in every slot.
+
+        Args:
+            start (datetime): The start of the first slot.
+            slots (int): The number of half-hour slots in the map.
+            room_ids (Iterable[str]): The IDs of the rooms in the map."""
+        self.start = start
+        self.slots = max(slots, 0)
+        self.reserved = dict.fromkeys(room_ids, 0)
+        self.subject_reserved = dict.fromkeys(self.reserved, 0)
+        self.unavailable = dict.fromkeys(self.reserved, 0)
+
+    def index(self, moment: datetime | time) -> int:
+        """The index of the slot containing a time of day, which may be outside of the map."""
+        return 2 * (moment.hour - self.start.hour) + (
+            (moment.minute - self.start.minute) // 30
+        )
+
+    def mask(self, start: datetime | time, end: datetime | time) -> int:
+        """The bitmap of the slots from the one containing `start` up to the one containing `end`.
+
+        Slots outside of the map are left out."""
+        low = max(self.index(start), 0)
+        high = min(self.index(end), self.slots)
+        if low >= high:
+            return 0
+        return (1 << high) - (1 << low)
+
+    def add_reservation(
+        self, room_id: str, start: datetime, end: datetime, is_subject: bool
+    ) -> None:
+        """Mark a room's slots from `start` to `end` as reserved, by the subject or otherwise."""
+        if room_id not in self.reserved:
+            return
+        if is_subject:
+            self.subject_reserved[room_id] |= self.mask(start, end)
+        else:
+            self.reserved[room_id] |= self.mask(start, end)
+
+    def add_unavailable(
+        self, room_id: str, start: datetime | time, end: datetime | time
+    ) -> None:
+        """Mark a room's slots from `start` to `end` as unavailable, such as for office hours."""
+        if room_id in self.unavailable:
+            self.unavailable[room_id] |= self.mask(start, end)
+
+    def states(self) -> dict[str, list[int]]:
+        """The `RoomState` value of each slot of each room.
+
+        Unavailable slots take precedence over the subject's reservations, which take
+        precedence over others' reservations. Available slots at the same time as any of the
+        subject's reservations, in any room, are unavailable to the subject.
+
+        Returns:
+            dict[str, list[int]]: The state values of each room's slots, by room ID."""
+        subject_busy = 0
+        for subject_reserved in self.subject_reserved.values():
+            subject_busy |= subject_reserved
+
+        states: dict[str, list[int]] = {}
+        for room_id, unavailable in self.unavailable.items():
+            subject_reserved = self.subject_reserved[room_id] & ~unavailable
+            reserved = self.reserved[room_id] & ~unavailable & ~subject_reserved
+            unavailable |= subject_busy & ~subject_reserved & ~reserved
+            # The layers are now disjoint, and an available slot is in none of them
+            states[room_id] = [
+                RoomState.UNAVAILABLE.value * (unavailable >> slot & 1)
+                + RoomState.SUBJECT_RESERVED.value * (subject_reserved >> slot & 1)
+                + RoomState.RESERVED.value * (reserved >> slot & 1)
+                for slot in range(self.slots)
+            ]
+        return states
+
+
+def encode_runs(states: Sequence[int]) -> str:
+    """Run-length encode the `RoomState` values of a room's slots.
+
+    Each run is the state's digit followed by the number of consecutive slots in the state,
+    and runs are separated by commas, e.g. `[3, 3, 0, 0, 0, 4]` is encoded as `"32,03,41"`.
+
+    Args:
+        states (Sequence[int]): The state value of each slot, from the first.
+
+    Returns:
+        str: The encoded runs of states, which is empty when there are no slots."""
+    return ",".join(f"{state}{len(list(run))}" for state, run in groupby(states))
+
+
+def decode_runs(runs: str) -> list[int]:
+    """Decode the `RoomState` values of a room's slots from their run-length encoding.
+
+    Args:
+        runs (str): The encoded runs of states, as by `encode_runs`.
+
+    Returns:
+        list[int]: The state value of each slot, from the first."""
+    if runs == "":
+        return []
+    return [int(run[0]) for run in runs.split(",") for _ in range(int(run[1:]))]
@@ -1,19 +1,33 @@
 """Service that manages operating hours of the XL."""
 
+import logging
+from datetime import datetime
 from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from .exceptions import OperatingHoursCannotOverlapException
+from .availability_events import availability_events
+from .operating_hours_index import (
+    LOAD_HORIZON,
+    OperatingHoursIndex,
+    coworking_operating_hours_index,
+)
+from .status_snapshot import status_snapshots
 from ..exceptions import ResourceNotFoundException
 from ..permission import PermissionService
 from ...models import User
 from ...database import db_session
-from ...models.coworking import OperatingHours, TimeRange
+from ...models.coworking import AvailabilityDelta, OperatingHours, TimeRange
 from ...entities.coworking import OperatingHoursEntity
+from ...entities.academics import TermEntity
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+logger = logging.getLogger(__name__)
+
 
 class OperatingHoursService:
     """OperatingHoursService is the access layer to the operating hours data model."""
@@ -22,15 +36,18 @@ class OperatingHoursService:
         self,
         session: Session = Depends(db_session),
         permission_svc: PermissionService = Depends(),
+        index: OperatingHoursIndex = Depends(coworking_operating_hours_index),
     ):
         """Initializes a new OperatingHoursService.
 
         Args:
             session (Session, optional): The database session to use, typically injected by FastAPI.
             permission_svc (PermissionService, optional): The backend permission service, injected by FastAPI.
+            index (OperatingHoursIndex, optional): The process-wide index of operating hours, injected by FastAPI.
         """
         self._session = session
         self._permission_svc = permission_svc
+        self._index = index
 
     def get_by_id(self, id: int) -> OperatingHours:
         """Lookup an Operating Hours object by its id.
@@ -57,6 +74,38 @@ class OperatingHoursService:
         Returns:
             list[OperatingHours]: All operating hours the XL within the given time_range, including overlaps.
         """
+        return self._index.schedule(time_range, self._load)
+
+    def hours_on_date(self, date: datetime) -> list[OperatingHours]:
+        """Returns the operating hours of the XL during the day of a given date.
+
+        Args:
+            date (datetime): Any time during the day to find operating hours on.
+
+        Returns:
+            list[OperatingHours]: All operating hours the XL is open during the day, ordered by start.
+        """
+        return self._index.hours_on_date(date, self._load)
+
+    def preload(self) -> None:
+        """Loads the operating hours from now through the end of the current or upcoming term
+        into the process-wide index, so that queries during the term are answered from memory.
+        """
+        now = datetime.now()
+        try:
+            term_end = self._session.scalars(
+                select(TermEntity.end)
+                .where(now < TermEntity.end)
+                .order_by(TermEntity.start)
+            ).first()
+            end = max(term_end or now, now + LOAD_HORIZON)
+            self._index.preload(TimeRange(start=now, end=end), self._load, now)
+        except SQLAlchemyError:
+            # Operating hours are loaded on first use instead
+            logger.exception("Failed to preload operating hours")
+
+    def _load(self, time_range: TimeRange) -> list[OperatingHours]:
+        """Loads all operating hours within a time range from the database, ordered by start."""
         entities = (
             self._session.query(OperatingHoursEntity)
             .filter(
@@ -82,7 +131,9 @@ class OperatingHoursService:
             subject, "coworking.operating_hours.create", "coworking/operating_hours"
         )
 
-        conflicts = self.schedule(time_range)
+        # Conflicts are checked against the database, rather than the index, to find hours
+        # created by other processes
+        conflicts = self._load(time_range)
         if len(conflicts) > 0:
             raise OperatingHoursCannotOverlapException(
                 f"Conflicts in the range of {str(time_range)}"
@@ -91,6 +142,7 @@ class OperatingHoursService:
         entity = OperatingHoursEntity(start=time_range.start, end=time_range.end)
         self._session.add(entity)
         self._session.commit()
+        self._publish_change(time_range)
         return entity.to_model()
 
     def delete(self, subject: User, operating_hours: OperatingHours) -> None:
@@ -114,3 +166,15 @@ class OperatingHoursService:
         )
         self._session.delete(operating_hours_entity)
         self._session.commit()
+        self._publish_change(operating_hours)
+
+    def _publish_change(self, time_range: TimeRange) -> None:
+        """Invalidates the operating hours index and shared status snapshots, and publishes
+        a change to the operating hours during a time range to live subscribers."""
+        self._index.invalidate()
+        status_snapshots.invalidate()
+        availability_events.publish(
+            AvailabilityDelta(
+                kind="operating_hours", start=time_range.start, end=time_range.end
+            )
+        )
@@ -0,0 +1,191 @@
+"""
+The Operating Hours Index answers queries of the XL's operating hours from memory.
+
+Every reservation draft, status poll, and room reservation map looks up operating hours, yet
+they change only when staff edit them. The index loads the operating hours of a window of
+time, such as the current term, sorted by start, and answers which hours overlap a time range
+or fall on a date by bisecting them. Queries outside of the loaded window extend it with a
+load from the database. Creating or deleting operating hours in this process invalidates the
+index, so that changes show up on the next query. Changes made by other processes show up
+once the interval elapses.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Sequence
+
+from ...models.coworking import OperatingHours, TimeRange
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+INDEX_INTERVAL = timedelta(minutes=5)
+"""The longest loaded operating hours are used before they are loaded again."""
+
+LOAD_HORIZON = timedelta(weeks=4)
+"""How far past now a load of operating hours reaches, at least."""
+
+
+class OperatingHoursIndex:
+    """Process-wide index of operating hours within a loaded window of time."""
+
+    def __init__(self, interval: timedelta = INDEX_INTERVAL):
+        """
+        Initializes an empty index, loaded on first use.
+
+        Parameters:
+            interval: the longest loaded operating hours are used before they are loaded again
+        """
+        self._interval = interval
+        self._load_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._version = 0
+        self._loaded_version = -1
+        self._loaded_at = datetime.min
+        self._window: TimeRange | None = None
+        self._hours: Sequence[OperatingHours] = ()
+        self._starts: list[datetime] = []
+        # The latest end of the hours up to each position, which never decreases, even if
+        # hours overlap, so that the first hours that may overlap a time can be bisected
+        self._latest_ends: list[datetime] = []
+
+    def invalidate(self) -> None:
+        """Marks the loaded operating hours as stale, to be loaded when next queried."""
+        with self._version_lock:
+            self._version += 1
+
+    def preload(
+        self,
+        window: TimeRange,
+        load: Callable[[TimeRange], Sequence[OperatingHours]],
+        now: datetime | None = None,
+    ) -> None:
+        """
+        Loads the operating hours of a window, replacing those loaded.
+
+        Parameters:
+            window: the time range to load the operating hours of
+            load: loads all operating hours overlapping a time range, ordered by start
+            now: the current time, by default
+        """
+        with self._load_lock:
+            self._load(window, load, now if now is not None else datetime.now())
+
+    def schedule(
+        self,
+        time_range: TimeRange,
+        load: Callable[[TimeRange], Sequence[OperatingHours]],
+        now: datetime | None = None,
+    ) -> list[OperatingHours]:
+        """
+        Returns all operating hours overlapping a time range, ordered by start.
+
+        Parameters:
+            time_range: the time range to find operating hours within
+            load: loads all operating hours overlapping a time range, ordered by start,
+                when the time range is outside of the loaded window
+            now: the current time, by default
+
+        Returns:
+            list[OperatingHours]: all operating hours within the time range, including overlaps
+        """
+        with self._load_lock:
+            if now is None:
+                now = datetime.now()
+            window = self._window
+            if not self._is_fresh(now):
+                window = None
+            if (
+                window is None
+                or time_range.start < window.start
+                or time_range.end > window.end
+            ):
+                self._load(self._extend(window, time_range, now), load, now)
+
+            # Hours before `first` end before the time range, and hours from `last` on
+            # start after it
+            first = bisect_left(self._latest_ends, time_range.start)
+            last = bisect_right(self._starts, time_range.end)
+            return [
+                hours
+                for hours in self._hours[first:last]
+                if hours.end >= time_range.start
+            ]
+
+    def hours_on_date(
+        self,
+        date: datetime,
+        load: Callable[[TimeRange], Sequence[OperatingHours]],
+        now: datetime | None = None,
+    ) -> list[OperatingHours]:
+        """
+        Returns all operating hours during the day of a date, ordered by start.
+
+        Parameters:
+            date: any time during the day to find operating hours on
+            load: loads all operating hours overlapping a time range, ordered by start,
+                when the day is outside of the loaded window
+            now: the current time, by default
+
+        Returns:
+            list[OperatingHours]: all operating hours open during the day
+        """
+        midnight = date.replace(hour=0, minute=0, second=0, microsecond=0)
+        day = TimeRange(start=midnight, end=midnight + timedelta(days=1))
+        return [
+            hours
+            for hours in self.schedule(day, load, now)
+            if hours.start < day.end and hours.end > day.start
+        ]
+
+    def _is_fresh(self, now: datetime) -> bool:
+        """Whether the loaded operating hours may still be used."""
+        return (
+            self._loaded_version == self._version
+            and now - self._loaded_at < self._interval
+        )
+
+    def _extend(
+        self, window: TimeRange | None, time_range: TimeRange, now: datetime
+    ) -> TimeRange:
+        """The window to load so that it covers a time range as well as the current one,
+        or the near future when there is no current one."""
+        if window is None:
+            window = TimeRange(start=now, end=now + LOAD_HORIZON)
+        return TimeRange(
+            start=min(window.start, time_range.start),
+            end=max(window.end, time_range.end),
+        )
+
+    def _load(
+        self,
+        window: TimeRange,
+        load: Callable[[TimeRange], Sequence[OperatingHours]],
+        now: datetime,
+    ) -> None:
+        """Loads the operating hours of a window. Must be called while locked."""
+        # An invalidation while loading leaves the index stale, to be loaded again
+        version = self._version
+        hours = sorted(load(window), key=lambda hours: hours.start)
+        latest_ends: list[datetime] = []
+        for each in hours:
+            latest_ends.append(
+                each.end if len(latest_ends) == 0 else max(latest_ends[-1], each.end)
+            )
+        self._hours = hours
+        self._starts = [each.start for each in hours]
+        self._latest_ends = latest_ends
+        self._window = window
+        self._loaded_at = now
+        self._loaded_version = version
+
+
+operating_hours_index = OperatingHoursIndex()
+"""Application-level operating hours index."""
+
+
+def coworking_operating_hours_index() -> OperatingHoursIndex:
+    """Function offering dependency injection of the application-level operating hours index."""
+    return operating_hours_index
@@ -4,8 +4,10 @@ from fastapi import Depends
 from datetime import datetime, timedelta
 from random import random
 from typing import Sequence
-from sqlalchemy import or_, and_
-from sqlalchemy.orm import Session, joinedload
+from psycopg2.errors import ExclusionViolation
+from sqlalchemy import Row, or_, and_, case, select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
 from backend.entities.room_entity import RoomEntity
 
 from backend.models.room_details import RoomDetails
@@ -16,20 +18,33 @@ from ...models.coworking import (
     Seat,
     Reservation,
     ReservationMapDetails,
+    ReservationMapGrid,
+    OperatingHours,
     ReservationRequest,
     ReservationPartial,
     TimeRange,
     SeatAvailability,
     ReservationState,
     RoomState,
-    AvailabilityList,
-    OperatingHours,
+    AvailabilityDelta,
+)
+from ...models.coworking.interval_set import (
+    IntervalSet,
+    MICROSECOND,
+    from_epoch,
+    to_epoch,
 )
 from ...entities import UserEntity
 from ...entities.coworking import ReservationEntity, SeatEntity
+from ...entities.coworking.reservation_user_table import reservation_user_table
+from .availability_matrix import AvailabilityMatrix
+from .occupancy import OccupancyMap, encode_runs
 from .seat import SeatService
 from .policy import PolicyService
 from .operating_hours import OperatingHoursService
+from .room_quota import RoomQuotaService
+from .availability_events import availability_events
+from .status_snapshot import status_snapshots
 from ..permission import PermissionService
 
 __authors__ = ["Kris Jordan", "Matt Vu", "Yuvraj Jain"]
@@ -52,6 +67,7 @@ class ReservationService:
         policy_svc: PolicyService = Depends(),
         operating_hours_svc: OperatingHoursService = Depends(),
         seats_svc: SeatService = Depends(),
+        room_quota_svc: RoomQuotaService = Depends(),
     ):
         """Initializes a new ReservationService.
 
@@ -63,6 +79,7 @@ class ReservationService:
         self._policy_svc = policy_svc
         self._operating_hours_svc = operating_hours_svc
         self._seat_svc = seats_svc
+        self._room_quota_svc = room_quota_svc
 
     def get_reservation(self, subject: User, id: int) -> Reservation:
         """Lookup a reservation by ID.
@@ -155,7 +172,7 @@ class ReservationService:
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
+        reservations = self._exclude_lapsed_reservation_entities(
             datetime.now(), reservations
         )
 
@@ -183,7 +200,7 @@ class ReservationService:
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
+        reservations = self._exclude_lapsed_reservation_entities(
             datetime.now(), reservations
         )
 
@@ -192,43 +209,27 @@ class ReservationService:
     def _check_user_reservation_duration(
         self, user: UserIdentity, bounds: TimeRange
     ) -> bool:
-        """Helper method to check if the total reservation duration for a user exceeds 6 hours.
+        """Helper method to check if reserving a room keeps a user within the weekly limit of study room hours.
 
         Args:
             user (User): The user for whom to check reservation duration.
             bounds (TimeRange): The time range to check for reservation duration.
 
         Returns:
-            True if a user has >= 6 total hours reserved
-            False if a user has exceeded the limit
+            True if the user remains within the weekly limit
+            False if a user would exceed the limit
         """
-        reservations = self.get_current_reservations_for_user(user, user)
-        total_duration = timedelta()
-        total_duration += bounds.end - bounds.start
-
-        for reservation in reservations:
-            if reservation.room:
-                total_duration += reservation.end - reservation.start
-        if total_duration > self._policy_svc.room_reservation_weekly_limit():
-            return False
-        return True
+        return self._room_quota_svc.allows(user, bounds)
 
     def _get_total_time_user_reservations(self, user: UserIdentity) -> str:
-        """Calculate the total duration (in hours) of study room reservations for the given user.
+        """Calculate the remaining hours of study room reservations for the given user this week.
         Args:
-            user (UserIdentity): The user for whom to calculate the total reservation time.
+            user (UserIdentity): The user for whom to calculate the remaining reservation time.
         Returns:
-            str: The total reservation time in hours.
+            str: The remaining reservation time in hours, rounded to the half hour.
         """
-        reservations = self.get_current_reservations_for_user(user, user)
-        duration = timedelta()
-        for reservation in reservations:
-            if reservation.room:
-                duration += reservation.end - reservation.start
-        str_duration = str(6 - (round((duration.total_seconds() / 3600) * 2) / 2))
-        if str_duration[2] == "0":
-            return str_duration.rstrip("0").rstrip(".")
-        return str_duration
+        remaining = self._room_quota_svc.remaining(user)
+        return f"{round(remaining.total_seconds() / 3600 * 2) / 2:g}"
 
     def get_map_reserved_times_by_date(
         self, date: datetime, subject: User
@@ -270,20 +271,98 @@ class ReservationService:
             Future reservations are shown up to the current time, with past slots marked as unavailable
             for today's date.
         """
-        reserved_date_map: dict[str, list[int]] = {}
-
         # Query DB to get reservable rooms.
         rooms = self._get_reservable_rooms()
 
-        # Generate a 1 day time range to get operating hours on date.
-        date_midnight = date.replace(hour=0, minute=0, second=0)
-        tomorrow_midnight = date_midnight + timedelta(days=1)
-        day_range = TimeRange(start=date_midnight, end=tomorrow_midnight)
-
         # Check if operating hours exist on date
-        try:
-            operating_hours_on_date = self._operating_hours_svc.schedule(day_range)[0]
-        except:
+        hours_on_date = self._operating_hours_svc.hours_on_date(date)
+        if len(hours_on_date) == 0:
+            return self._reservation_map(date, rooms, hours_on_date, [])
+
+        reservations = self._query_map_reservations_by_date(date, subject)
+        return self._reservation_map(date, rooms, hours_on_date, reservations)
+
+    def get_map_reserved_times_by_dates(
+        self, start: datetime, days: int, subject: User
+    ) -> list[ReservationMapGrid]:
+        """
+        Retrieves the room reservation maps of consecutive days, such as a week, for a given user.
+
+        Each day's map is that of `get_map_reserved_times_by_date`, with each room's time slot
+        statuses run-length encoded as by `encode_runs`. Reservable rooms, operating hours, and
+        reservations are each queried once for all of the days.
+
+        Args:
+            start (datetime): Any time on the first day of the maps.
+            days (int): The number of consecutive days to map.
+            subject (User): The user for whom the reservation statuses are being determined, to highlight
+                            their own reservations.
+
+        Returns:
+            list[ReservationMapGrid]: The map of each day, in order.
+        """
+        first_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        window = TimeRange(start=first_day, end=first_day + timedelta(days=days))
+
+        rooms = self._get_reservable_rooms()
+        operating_hours = self._operating_hours_svc.schedule(window)
+        reservations = self._query_map_reservations(window, subject)
+
+        grids: list[ReservationMapGrid] = []
+        for day in range(days):
+            date = first_day + timedelta(days=day)
+            next_date = date + timedelta(days=1)
+            details = self._reservation_map(
+                date,
+                rooms,
+                [
+                    hours
+                    for hours in operating_hours
+                    if hours.start < next_date and hours.end > date
+                ],
+                [
+                    reservation
+                    for reservation in reservations
+                    if reservation.start < next_date and reservation.end > date
+                ],
+            )
+            grids.append(
+                ReservationMapGrid(
+                    date=date,
+                    room_slot_runs={
+                        room_id: encode_runs(states)
+                        for room_id, states in details.reserved_date_map.items()
+                    },
+                    operating_hours_start=details.operating_hours_start,
+                    operating_hours_end=details.operating_hours_end,
+                    number_of_time_slots=details.number_of_time_slots,
+                )
+            )
+        return grids
+
+    def _reservation_map(
+        self,
+        date: datetime,
+        rooms: Sequence[RoomDetails],
+        hours_on_date: Sequence[OperatingHours],
+        reservations: Sequence[Row[tuple[str | None, datetime, datetime, bool]]],
+    ) -> ReservationMapDetails:
+        """
+        Builds the room reservation map of a date from the rooms, operating hours, and reservations
+        queried for it, as described by `get_map_reserved_times_by_date`.
+
+        Args:
+            date (datetime): The date of the map.
+            rooms (Sequence[RoomDetails]): The reservable rooms.
+            hours_on_date (Sequence[OperatingHours]): The operating hours during the date.
+            reservations (Sequence[Row]): The reservations shown on the map, as queried by
+                `_query_map_reservations` for the subject viewing it.
+
+        Returns:
+            ReservationMapDetails: The map of the date.
+        """
+        reserved_date_map: dict[str, list[int]] = {}
+        if len(hours_on_date) == 0:
             # TODO: Possibly consider thowing exception and handling on the frontend?
             # If operating hours don't exist, then return an all grayed out table
             # from 10 am to 6 pm which is the standard office hours.
@@ -292,10 +371,15 @@ class ReservationService:
                     reserved_date_map[room.id] = [RoomState.UNAVAILABLE.value] * 16
             return ReservationMapDetails(
                 reserved_date_map=reserved_date_map,
-                operating_hours_start=datetime.now().replace(hour=10, minute=0),
-                operating_hours_end=datetime.now().replace(hour=18, minute=0),
+                operating_hours_start=date.replace(
+                    hour=10, minute=0, second=0, microsecond=0
+                ),
+                operating_hours_end=date.replace(
+                    hour=18, minute=0, second=0, microsecond=0
+                ),
                 number_of_time_slots=16,
             )
+        operating_hours_on_date = hours_on_date[0]
 
         # Extract the start time and end time for operating hours rounded to the closest half hour
         operating_hours_start = max(
@@ -314,55 +398,30 @@ class ReservationService:
             2 * operating_hours_time_delta.total_seconds() / 3600
         )
 
-        # Need current time to gray out slots in the past on that day.
-        current_time = datetime.now()
-        current_time_idx = self._idx_calculation(current_time, operating_hours_start)
+        occupancy = OccupancyMap(
+            operating_hours_start,
+            operating_hours_duration,
+            [room.id for room in rooms if room.id],
+        )
+
+        # # Making slots up till current time gray
+        # This code no longer required, but may be required in the future.
+        # Please keep this here for now.
+        # if date.date() == datetime.now().date():
+        #     for room in rooms:
+        #         occupancy.add_unavailable(room.id, operating_hours_start, datetime.now())
 
-        for room in rooms:
-            time_slots_for_room = [0] * operating_hours_duration
+        for room_id, start, end, is_subject in reservations:
+            # Reservations without a room are the subject's own reservations in the XL
+            occupancy.add_reservation(room_id or "SN156", start, end, is_subject)
 
-            # # Making slots up till current time gray
-            # This code no longer required, but may be required in the future.
-            # Please keep this here for now.
-            # if date.date() == current_time.date():
-            #     for i in range(0, current_time_idx):
-            #         time_slots_for_room[i] = RoomState.UNAVAILABLE.value
+        for room_id, hours in self._policy_svc.office_hours(date=date).items():
+            for start, end in hours:
+                occupancy.add_unavailable(room_id, start, end)
 
-            if room.id == "SN156":
-                reservations = self._query_xl_reservations_by_date_for_user(
-                    date, subject
-                )
-            else:
-                reservations = self._query_confirmed_reservations_by_date_and_room(
-                    date, room.id
-                )
-            for reservation in reservations:
-                start_idx = self._idx_calculation(
-                    reservation.start, operating_hours_start
-                )
-                end_idx = self._idx_calculation(reservation.end, operating_hours_start)
-
-                if date.date() == current_time.date():
-                    if end_idx < current_time_idx:
-                        continue
-                    start_idx = max(current_time_idx, start_idx)
-
-                for idx in range(start_idx, end_idx):
-                    # Currently only assuming single user.
-                    # TODO: If making group reservations, need to change this.
-                    if reservation.users[0].id == subject.id:
-                        time_slots_for_room[idx] = RoomState.SUBJECT_RESERVED.value
-                    else:
-                        if time_slots_for_room[idx] != RoomState.SUBJECT_RESERVED.value:
-                            time_slots_for_room[idx] = RoomState.RESERVED.value
-            reserved_date_map[room.id] = time_slots_for_room
-
-        self._transform_date_map_for_unavailable(reserved_date_map)
+        reserved_date_map = occupancy.states()
         if "SN156" in reserved_date_map:
             del reserved_date_map["SN156"]
-        self._transform_date_map_for_officehours(
-            date, reserved_date_map, operating_hours_start, operating_hours_duration
-        )
 
         return ReservationMapDetails(
             reserved_date_map=reserved_date_map,
@@ -405,136 +464,65 @@ class ReservationService:
 
         return rounded_dt
 
-    def _idx_calculation(self, time: datetime, operating_hours_start: datetime) -> int:
+    def _query_map_reservations_by_date(
+        self, date: datetime, subject: User
+    ) -> Sequence[Row[tuple[str | None, datetime, datetime, bool]]]:
         """
-        Calculates the index of a time slot based on a given time.
+        Queries the reservations shown on the reservation map for a given date, in one query.
 
-        This function converts a datetime object into an index representing a specific
-        time slot in the reservation system. Each hour is divided into two slots.
+        This function fetches the confirmed and checked-in reservations of every room, along with the
+        subject's own reservations in the XL, that overlap the 24-hour period starting from the beginning
+        of the given date.
 
         Args:
-            time (datetime): The time to convert into an index.
-            operating_hours_start (int): The hour when the XL opens as an int.
+            date (datetime): The date for which to query reservations.
+            subject (User): The user viewing the map, whose reservations are flagged.
 
         Returns:
-            int: The index of the time slot corresponding to the given time.
+            Sequence[Row]: The room ID (None for the XL), start, end, and whether the subject is a user
+            of each reservation.
         """
-        return int(2 * (time.hour - operating_hours_start.hour)) + (
-            (time.minute - operating_hours_start.minute) // 30
+        start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+        return self._query_map_reservations(
+            TimeRange(start=start, end=start + timedelta(hours=24)), subject
         )
 
-    def _transform_date_map_for_unavailable(
-        self, reserved_date_map: dict[str, list[int]]
-    ) -> None:
-        """
-        Modifies the reserved date map to mark certain slots as unavailable.
-
-        This function updates the reserved date map so that if a slot is reserved by the subject
-        (indicated by a 4), then any available slots (indicated by 0) in the same column across
-        all rooms are marked as unavailable (changed to 3).
-
-        Args:
-            reserved_date_map (dict[str, list[int]]): The map of room reservations to be transformed.
-
-        Returns:
-            None: This function modifies the reserved_date_map in place.
-        """
-        # Identify the columns where 4 appears
-        columns_with_4 = set()
-        for key, values in reserved_date_map.items():
-            for i, value in enumerate(values):
-                if value == RoomState.SUBJECT_RESERVED.value:
-                    columns_with_4.add(i)
-
-        # Transform the dictionary as per the rules
-        for key, values in reserved_date_map.items():
-            for i in columns_with_4:
-                if values[i] == RoomState.AVAILABLE.value:
-                    values[i] = RoomState.UNAVAILABLE.value
-
-    def _transform_date_map_for_officehours(
-        self,
-        date: datetime,
-        reserved_date_map: dict[str, list[int]],
-        operating_hours_start: datetime,
-        operating_hours_duration: int,
-    ) -> None:
-        """
-        Transforms date map in place.
-        """
-        office_hours = self._policy_svc.office_hours(date=date)
-        for room_id, hours in office_hours.items():
-            if room_id not in reserved_date_map:
-                continue
-            for start, end in hours:
-                start_idx = max(self._idx_calculation(start, operating_hours_start), 0)
-                end_idx = min(
-                    self._idx_calculation(end, operating_hours_start),
-                    operating_hours_duration,
-                )
-                if start_idx < end_idx:
-                    for idx in range(start_idx, end_idx):
-                        reserved_date_map[room_id][idx] = RoomState.UNAVAILABLE.value
-
-    def _query_confirmed_reservations_by_date_and_room(
-        self, date: datetime, room_id: str
-    ) -> Sequence[Reservation]:
+    def _query_map_reservations(
+        self, time_range: TimeRange, subject: User
+    ) -> Sequence[Row[tuple[str | None, datetime, datetime, bool]]]:
         """
-        Queries and returns confirmed and checked-in reservations for a given date and room.
-
-        This function fetches all confirmed and checked-in reservations from the database for a specified date and room.
-        It includes reservations that have any overlap with the 24-hour period starting from the
-        beginning of the given date, and are associated with a specific room ID.
+        Queries the reservations shown on the reservation maps of a time range, in one query.
 
         Args:
-            date (datetime): The date for which to query confirmed reservations.
-            room_id (str): The ID of the room for which to query confirmed reservations.
+            time_range (TimeRange): The time range of the maps, such as one or more whole days.
+            subject (User): The user viewing the maps, whose reservations are flagged.
 
         Returns:
-            Sequence[Reservation]: A sequence of Reservation model objects representing the confirmed reservations for the specified date and room.
+            Sequence[Row]: The room ID (None for the XL), start, end, and whether the subject is a user
+            of each reservation.
         """
-        start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        reservations = (
-            self._session.query(ReservationEntity)
-            .join(ReservationEntity.room)
-            .filter(
-                ReservationEntity.start < start + timedelta(hours=24),
-                ReservationEntity.end > start,
-                ReservationEntity.state.not_in(
-                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
-                ),
-                RoomEntity.id == room_id,
+        is_subject = (
+            select(reservation_user_table.c.reservation_id)
+            .where(
+                reservation_user_table.c.reservation_id == ReservationEntity.id,
+                reservation_user_table.c.user_id == subject.id,
             )
-            .options(
-                joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
-            )
-            .order_by(ReservationEntity.start)
-            .all()
+            .exists()
         )
-
-        return [reservation.to_model() for reservation in reservations]
-
-    def _query_xl_reservations_by_date_for_user(
-        self, date: datetime, subject: User
-    ) -> Sequence[Reservation]:
-        start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        reservations = (
-            self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
-            .filter(
-                ReservationEntity.start < start + timedelta(hours=24),
-                ReservationEntity.end > start,
-                ReservationEntity.state.not_in(
-                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
-                ),
-                ReservationEntity.room == None,
-                UserEntity.id == subject.id,
-            )
-            .order_by(ReservationEntity.start)
-            .all()
+        query = select(
+            ReservationEntity.room_id,
+            ReservationEntity.start,
+            ReservationEntity.end,
+            is_subject.label("is_subject"),
+        ).where(
+            ReservationEntity.start < time_range.end,
+            ReservationEntity.end > time_range.start,
+            ReservationEntity.state.not_in(
+                [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
+            ),
+            or_(ReservationEntity.room_id.is_not(None), is_subject),
         )
-
-        return [reservation.to_model() for reservation in reservations]
+        return self._session.execute(query).all()
 
     def _get_reservable_rooms(self) -> Sequence[RoomDetails]:
         """
@@ -551,6 +539,7 @@ class ReservationService:
         rooms = (
             self._session.query(RoomEntity)
             .where(or_(RoomEntity.reservable == True, RoomEntity.id == "SN156"))
+            .options(selectinload(RoomEntity.seats))
             .order_by(RoomEntity.id)
             .all()
         )
@@ -586,17 +575,18 @@ class ReservationService:
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
+        reservations = self._exclude_lapsed_reservation_entities(
             datetime.now(), reservations
         )
 
         return [reservation.to_model() for reservation in reservations]
 
-    def _state_transition_reservation_entities_by_time(
+    def _exclude_lapsed_reservation_entities(
         self, cutoff: datetime, reservations: Sequence[ReservationEntity]
     ) -> Sequence[ReservationEntity]:
-        """Private, internal helper method for transitioning reservation entities
-        based on time. Three transitions are time-based:
+        """Private, internal helper method for excluding reservation entities whose state
+        has lapsed with time, but which the ReservationSweeper has not yet transitioned.
+        Three transitions are time-based:
 
         1. Draft -> Cancelled following PolicyService#reservation_draft_timeout() after
            the reservation's created at.
@@ -604,45 +594,54 @@ class ReservationService:
             the reservation's start.
         3. Checked In -> Checked Out following the reservation's end.
 
+        Reservations are left unchanged, so that reads have no side effects.
+
         Args:
-            moment (datetime): The time in which checks of expiration are made against. In
+            cutoff (datetime): The time in which checks of expiration are made against. In
                 production, this is the current time.
-            reservations (Sequence[ReservationEntity]): The list of entities to state transition.
+            reservations (Sequence[ReservationEntity]): The list of entities to filter.
 
         Returns:
-            Sequence[ReservationEntity] - All ReservationEntities that were not state transitioned.
+            Sequence[ReservationEntity] - All ReservationEntities that have not lapsed.
         """
-        valid: list[ReservationEntity] = []
-        dirty = False
-        for reservation in reservations:
-            if (
-                reservation.state == ReservationState.DRAFT
-                and reservation.created_at
-                + self._policy_svc.reservation_draft_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CONFIRMED
-                and reservation.start + self._policy_svc.reservation_checkin_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CHECKED_IN
-                and reservation.end <= cutoff
-            ):
-                reservation.state = ReservationState.CHECKED_OUT
-                dirty = True
-            else:
-                valid.append(reservation)
+        return [
+            reservation
+            for reservation in reservations
+            if self._lapsed_state(cutoff, reservation) is None
+        ]
+
+    def _lapsed_state(
+        self, cutoff: datetime, reservation: ReservationEntity
+    ) -> ReservationState | None:
+        """Private, internal helper method for finding the state a reservation entity's
+        state has lapsed to with time, as the ReservationSweeper transitions it.
 
-        if dirty:
-            self._session.commit()
+        Args:
+            cutoff (datetime): The time in which checks of expiration are made against. In
+                production, this is the current time.
+            reservation (ReservationEntity): The entity to check.
 
-        return valid
+        Returns:
+            ReservationState | None - The state the reservation has lapsed to, or None if it has not lapsed.
+        """
+        if (
+            reservation.state == ReservationState.DRAFT
+            and reservation.created_at
+            < cutoff - self._policy_svc.reservation_draft_timeout()
+        ):
+            return ReservationState.CANCELLED
+        if (
+            reservation.state == ReservationState.CONFIRMED
+            and reservation.start
+            < cutoff - self._policy_svc.reservation_checkin_timeout()
+        ):
+            return ReservationState.CANCELLED
+        if (
+            reservation.state == ReservationState.CHECKED_IN
+            and reservation.end <= cutoff
+        ):
+            return ReservationState.CHECKED_OUT
+        return None
 
     def seat_availability(
         self, seats: Sequence[Seat], bounds: TimeRange
@@ -679,56 +678,91 @@ class ReservationService:
         if len(open_hours) == 0:
             return []
 
-        # Convert the operating hours during the bounds into an availability list
-        # and constrain the availability list within the bounds.
-        open_availability_list = self._operating_hours_to_bounded_availability_list(
-            open_hours, bounds
-        )
-        if len(open_availability_list.availability) == 0:
+        # Convert the operating hours during the bounds into an interval set
+        # and constrain the interval set within the bounds.
+        open_intervals = IntervalSet.from_time_ranges(open_hours)
+        open_intervals.constrain(to_epoch(bounds.start), to_epoch(bounds.end))
+        if len(open_intervals) == 0:
             return []
 
-        # Start from a position where all seats begin with same availability as
-        # open_availability_list. From there, reservations will subtract availability
-        # from the given seat.
-        seat_availability_dict = self._initialize_seat_availability_dict(
-            seats, open_availability_list
-        )
-
         # Get all active reservations during the availability bounds for the seats.
         reservation_range = TimeRange(
-            start=open_availability_list.availability[0].start,
-            end=open_availability_list.availability[-1].end,
+            start=from_epoch(open_intervals.starts[0]),
+            end=from_epoch(open_intervals.ends[-1]),
         )
         reservations = self.get_seat_reservations(seats, reservation_range)
 
-        # Subtract all seat reservations from their availability
-        self._remove_reservations_from_availability(
-            seat_availability_dict, reservations
+        return self._available_seats(
+            seats,
+            open_intervals,
+            reservations,
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON,
+        )
+
+    def _available_seats(
+        self,
+        seats: Sequence[Seat],
+        open_intervals: IntervalSet,
+        reservations: Sequence[Reservation],
+        threshold: timedelta,
+    ) -> list[SeatAvailability]:
+        """Subtracts reservations from the open intervals of each seat.
+
+        Args:
+            seats (Sequence[Seat]): The seats to find the availability of.
+            open_intervals (IntervalSet): The intervals the XL is open within the bounds of interest.
+            reservations (Sequence[Reservation]): The active reservations of the seats.
+            threshold (timedelta): The minimum duration of availability worth returning.
+
+        Returns:
+            list[SeatAvailability]: The availability of seats with any, nearest and longest available first.
+        """
+        # Lay out the availability of every seat, less its reservations, in one matrix
+        matrix = AvailabilityMatrix(
+            open_intervals,
+            (
+                (seat.id, to_epoch(reservation.start), to_epoch(reservation.end))
+                for reservation in reservations
+                for seat in reservation.seats
+                if seat.id is not None
+            ),
         )
 
         # Remove seats with availability below threshold
-        available_seats: list[SeatAvailability] = list(
-            self._prune_seats_below_availability_threshold(
-                list(seat_availability_dict.values()),
-                self._policy_svc.minimum_reservation_duration()
-                - MINUMUM_RESERVATION_EPSILON,
+        seats_by_id = {seat.id: seat for seat in seats if seat.id is not None}
+        available_seats: list[tuple[Seat, IntervalSet, int, int]] = []
+        for seat_id, seat in seats_by_id.items():
+            availability, first_start, first_duration = matrix.availability(
+                seat_id, threshold // MICROSECOND
             )
-        )
+            if len(availability) > 0:
+                available_seats.append(
+                    (seat, availability, first_start, first_duration)
+                )
 
         # Sort by nearest available ASC, duration DESC, reservable (False before True), with entropy
         # The rationale for entropy is when XL is wide open for walkins, within the given seat search
         # we'd like to mix up the order in which seats are assigned rather than always giving away
         # the same sequence of seats (and causing more consisten wear and tear to it).
         available_seats.sort(
-            key=lambda sa: (
-                sa.availability[0].start,
-                -1 * sa.availability[0].duration(),
-                sa.reservable,
+            key=lambda seat_availability: (
+                seat_availability[2],
+                -seat_availability[3],
+                seat_availability[0].reservable,
                 random(),
             )
         )
 
-        return available_seats
+        # Seats and the time ranges of intervals are valid already, so skip revalidating them,
+        # and seats with intervals in common share their time ranges
+        time_ranges: dict[tuple[int, int], TimeRange] = {}
+        return [
+            SeatAvailability.model_construct(
+                availability=availability.to_time_ranges(time_ranges), **seat.__dict__
+            )
+            for seat, availability, _, _ in available_seats
+        ]
 
     def draft_reservation(
         self, subject: User, request: ReservationRequest
@@ -837,6 +871,7 @@ class ReservationService:
 
         # Look at the seats - match bounds of assigned seat's availability
         seat_entities = []
+        lapsed_conflicts: list[ReservationEntity] = []
         if request.room is None:
             seats: list[Seat] = SeatEntity.get_models_from_identities(
                 self._session, request.seats
@@ -848,22 +883,33 @@ class ReservationService:
                     seat for seat in seat_availability if seat.reservable
                 ]
 
-            if len(seat_availability) == 0:
+            # Claim the best available seat, which concurrent drafts then pass over
+            claimed = self._claim_seat(seat_availability)
+            if claimed is None:
                 raise ReservationException(
                     "The requested seat(s) are no longer available."
                 )
+            seat_entity, claimed_availability = claimed
 
             # TODO (limit to # of users on request if multiple users)
             # Here we constrain the reservation start/end to that of the best available seat requested.
             # This matters as walk-in availability becomes scarce (may start in the near future even though request
             # start is for right now), alternatively may end early due to reserved seat on backend.
-            seat_entities = [self._session.get(SeatEntity, seat_availability[0].id)]
-            bounds = seat_availability[0].availability[0]
+            seat_entities = [seat_entity]
+            bounds = claimed_availability.availability[0]
         else:
-            # Prevent double booking a room
+            # Prevent double booking a room. Conflicts that have lapsed, but which the
+            # ReservationSweeper has not yet transitioned, are transitioned along with the
+            # draft, so that they do not violate the room's exclusion constraint.
             conflicts = self._fetch_conflicting_room_reservations(request)
-            if len(conflicts) > 0:
-                raise ReservationException("The requested room is no longer available.")
+            for conflict in conflicts:
+                lapsed_state = self._lapsed_state(now, conflict)
+                if lapsed_state is None:
+                    raise ReservationException(
+                        "The requested room is no longer available."
+                    )
+                conflict.state = lapsed_state
+                lapsed_conflicts.append(conflict)
 
         draft = ReservationEntity(
             state=ReservationState.DRAFT,
@@ -876,8 +922,19 @@ class ReservationService:
         )
 
         self._session.add(draft)
-        self._session.commit()
-        return draft.to_model()
+        try:
+            self._session.commit()
+        except IntegrityError as e:
+            self._session.rollback()
+            if isinstance(e.orig, ExclusionViolation):
+                # A concurrent request booked the room since conflicts were checked
+                raise ReservationException("The requested room is no longer available.")
+            raise
+        for conflict in lapsed_conflicts:
+            self._publish_change(conflict.to_model())
+        reservation = draft.to_model()
+        self._publish_change(reservation)
+        return reservation
 
     def change_reservation(
         self, subject: User, delta: ReservationPartial
@@ -939,9 +996,32 @@ class ReservationService:
 
         if dirty:  # and valid():
             self._session.commit()
+            reservation = entity.to_model()
+            self._publish_change(reservation)
+            return reservation
 
         return entity.to_model()
 
+    def _publish_change(self, reservation: Reservation) -> None:
+        """Invalidates shared status snapshots and publishes the change of a reservation's
+        availability to live subscribers.
+
+        Args:
+            reservation (Reservation): The reservation as of the change, after it was committed.
+        """
+        status_snapshots.invalidate()
+        availability_events.publish(
+            AvailabilityDelta(
+                kind="reservation",
+                reservation_id=reservation.id,
+                state=reservation.state,
+                seat_ids=[seat.id for seat in reservation.seats if seat.id is not None],
+                room_id=reservation.room.id if reservation.room else None,
+                start=reservation.start,
+                end=reservation.end,
+            )
+        )
+
     def _change_state(self, entity: ReservationEntity, delta: ReservationState) -> bool:
         RS = ReservationState
 
@@ -1089,6 +1169,7 @@ class ReservationService:
         if entity.state == ReservationState.CONFIRMED:
             entity.state = ReservationState.CHECKED_IN
             self._session.commit()
+            self._publish_change(entity.to_model())
         elif entity.state in (
             ReservationState.CANCELLED,
             ReservationState.CHECKED_OUT,
@@ -1104,61 +1185,60 @@ class ReservationService:
 
     # Private helper methods
 
-    def _operating_hours_to_bounded_availability_list(
-        self, operating_hours: Sequence[OperatingHours], bounds: TimeRange
-    ) -> AvailabilityList:
-        availability = AvailabilityList(
-            availability=[
-                TimeRange(start=operating_hour.start, end=operating_hour.end)
-                for operating_hour in operating_hours
-            ]
+    def _claim_seat(
+        self, seat_availability: Sequence[SeatAvailability]
+    ) -> tuple[SeatEntity, SeatAvailability] | None:
+        """Claims the most preferred available seat for a draft reservation.
+
+        Seats are locked in order of preference with SELECT ... FOR UPDATE SKIP LOCKED, one at a
+        time, so that concurrent drafts each claim a different seat rather than all targeting
+        the best one. The lock is held until the draft is committed. Since availability was
+        found before the seat was locked, a claimed seat is checked again for reservations
+        committed in the meantime, and passed over if it has any.
+
+        Args:
+            seat_availability (Sequence[SeatAvailability]): The available seats, most preferred first.
+
+        Returns:
+            tuple[SeatEntity, SeatAvailability] | None: The locked seat and its availability, or None
+            if every available seat is claimed by other drafts or has since been reserved.
+        """
+        candidates = {seat.id: seat for seat in seat_availability}
+        preference = case(
+            {seat.id: rank for rank, seat in enumerate(seat_availability)},
+            value=SeatEntity.id,
         )
-        availability.constrain(bounds)
-        return availability
-
-    def _initialize_seat_availability_dict(
-        self, seats: Sequence[Seat], availability: AvailabilityList
-    ) -> dict[int, SeatAvailability]:
-        return {
-            seat.id: SeatAvailability(
-                availability=availability.model_copy(deep=True).availability,
-                **seat.model_dump(),
+        while len(candidates) > 0:
+            seat_entity = self._session.scalars(
+                select(SeatEntity)
+                .where(SeatEntity.id.in_(candidates.keys()))
+                .order_by(preference)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).first()
+            if seat_entity is None:
+                return None
+
+            candidate = candidates.pop(seat_entity.id)
+            reservations = self.get_seat_reservations(
+                [candidate], candidate.availability[0]
             )
-            for seat in seats
-            if seat.id is not None
-        }
-
-    def _remove_reservations_from_availability(
-        self,
-        seat_availability_dict: dict[int, SeatAvailability],
-        reservations: Sequence[Reservation],
-    ):
-        for reservation in reservations:
-            if len(reservation.seats) > 0:
-                for seat in reservation.seats:
-                    if seat.id in seat_availability_dict:
-                        seat_availability_dict[seat.id].subtract(reservation)
-
-    def _prune_seats_below_availability_threshold(
-        self, seats: Sequence[SeatAvailability], threshold: timedelta
-    ) -> Sequence[SeatAvailability]:
-        available_seats: list[SeatAvailability] = []
-        for seat in seats:
-            seat.filter_time_ranges_below(threshold)
-            if len(seat.availability) > 0:
-                available_seats.append(seat)
-        return available_seats
+            if len(reservations) == 0:
+                return seat_entity, candidate
+        return None
 
     def _fetch_conflicting_room_reservations(
         self, request: ReservationRequest
     ) -> list[ReservationEntity]:
-        """Given a ReservationRequest, return a list of conflicting reservation entities, if any."""
+        """Given a ReservationRequest, return a list of conflicting reservation entities, if any.
+
+        The overlap of time ranges is expressed as the room exclusion constraint's is, so that
+        its GiST index serves the lookup."""
         return (
             self._session.query(ReservationEntity)
             .filter(
-                and_(
-                    ReservationEntity.start < request.end,
-                    ReservationEntity.end > request.start,
+                func.tsrange(ReservationEntity.start, ReservationEntity.end).op("&&")(
+                    func.tsrange(request.start, request.end)
                 ),
                 ReservationEntity.state.in_(
                     (
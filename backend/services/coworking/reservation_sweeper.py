@@ -0,0 +1,215 @@
+"""
+The Reservation Sweeper transitions reservations whose state has lapsed with time.
+
+Three transitions are time-based:
+
+1. Draft -> Cancelled following PolicyService#reservation_draft_timeout() after
+   the reservation's created at.
+2. Confirmed -> Cancelled following PolicyService#reservation_checkin_timeout() after
+   the reservation's start.
+3. Checked In -> Checked Out following the reservation's end.
+
+Rather than reads transitioning the reservations they happen to load, and committing from
+within read requests, the sweeper runs each transition as a set-based UPDATE on an interval.
+Updates are made in batches of rows locked with SKIP LOCKED, so that no statement holds many
+row locks for long and concurrent sweeps, such as one per worker process, skip each other's
+rows rather than wait on them. Between sweeps, reads exclude reservations that have lapsed.
+Each transition swept is published to live subscribers of availability.
+"""
+
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, Engine, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from ...database import engine
+from ...entities.coworking import ReservationEntity
+from ...entities.coworking.reservation_seat_table import reservation_seat_table
+from ...models.coworking import AvailabilityDelta, ReservationState
+from .availability_events import availability_events
+from .policy import PolicyService
+from .status_snapshot import status_snapshots
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationSweeper:
+    """Background sweeper of reservations pending time-based state transitions."""
+
+    def __init__(
+        self,
+        sweep_interval: float = 60.0,
+        batch_size: int = 500,
+        policy_svc: PolicyService | None = None,
+        engine: Engine = engine,
+    ):
+        """
+        Initializes the sweeper. The background sweeper thread starts once `start` is called.
+
+        Parameters:
+            sweep_interval: the number of seconds between sweeps
+            batch_size: the maximum number of reservations transitioned per UPDATE
+            policy_svc: the policies of the time-based transitions
+            engine: the engine used by the sweeper to open its own sessions
+        """
+        self._sweep_interval = sweep_interval
+        self._batch_size = batch_size
+        self._policy_svc = policy_svc if policy_svc is not None else PolicyService()
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def transitions(
+        self, now: datetime
+    ) -> list[tuple[ColumnElement[bool], ReservationState]]:
+        """
+        The time-based transitions as of a moment.
+
+        Parameters:
+            now: the time lapsed reservations are found as of
+
+        Returns:
+            list[tuple[ColumnElement[bool], ReservationState]]: the condition of reservations that have lapsed, and the state they transition to, of each transition
+        """
+        # Timeouts are subtracted from now, rather than added to each row, to compare
+        # columns directly
+        return [
+            (
+                (ReservationEntity.state == ReservationState.DRAFT)
+                & (
+                    ReservationEntity.created_at
+                    < now - self._policy_svc.reservation_draft_timeout()
+                ),
+                ReservationState.CANCELLED,
+            ),
+            (
+                (ReservationEntity.state == ReservationState.CONFIRMED)
+                & (
+                    ReservationEntity.start
+                    < now - self._policy_svc.reservation_checkin_timeout()
+                ),
+                ReservationState.CANCELLED,
+            ),
+            (
+                (ReservationEntity.state == ReservationState.CHECKED_IN)
+                & (ReservationEntity.end <= now),
+                ReservationState.CHECKED_OUT,
+            ),
+        ]
+
+    def sweep(self, now: datetime | None = None) -> int:
+        """
+        Transitions all reservations that have lapsed, in batches.
+
+        Parameters:
+            now: the time lapsed reservations are found as of, the current time by default
+
+        Returns:
+            int: the number of reservations transitioned
+        """
+        if now is None:
+            now = datetime.now()
+
+        swept = 0
+        for condition, state in self.transitions(now):
+            while True:
+                batch = (
+                    select(ReservationEntity.id)
+                    .where(condition)
+                    .limit(self._batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                statement = (
+                    update(ReservationEntity)
+                    .where(ReservationEntity.id.in_(batch.scalar_subquery()))
+                    .values(state=state, updated_at=now)
+                    .returning(
+                        ReservationEntity.id,
+                        ReservationEntity.room_id,
+                        ReservationEntity.start,
+                        ReservationEntity.end,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                with Session(self._engine) as session:
+                    transitioned = session.execute(statement).all()
+                    seat_ids = self._seat_ids(session, [row.id for row in transitioned])
+                    session.commit()
+
+                if len(transitioned) > 0:
+                    status_snapshots.invalidate()
+                for row in transitioned:
+                    availability_events.publish(
+                        AvailabilityDelta(
+                            kind="reservation",
+                            reservation_id=row.id,
+                            state=state,
+                            seat_ids=seat_ids.get(row.id, []),
+                            room_id=row.room_id,
+                            start=row.start,
+                            end=row.end,
+                        )
+                    )
+
+                swept += len(transitioned)
+                if len(transitioned) < self._batch_size:
+                    break
+        return swept
+
+    def _seat_ids(
+        self, session: Session, reservation_ids: list[int]
+    ) -> dict[int, list[int]]:
+        """Returns the IDs of the seats of each reservation, by reservation ID."""
+        seat_ids: dict[int, list[int]] = {}
+        if len(reservation_ids) == 0:
+            return seat_ids
+        rows = session.execute(
+            select(
+                reservation_seat_table.c.reservation_id,
+                reservation_seat_table.c.seat_id,
+            ).where(reservation_seat_table.c.reservation_id.in_(reservation_ids))
+        )
+        for reservation_id, seat_id in rows:
+            seat_ids.setdefault(reservation_id, []).append(seat_id)
+        return seat_ids
+
+    def start(self) -> None:
+        """Starts the background sweeper thread, if it is not already running."""
+        with self._lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="reservation-sweeper", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stops the background sweeper thread."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        """Sweeps every interval until closed."""
+        while not self._closed:
+            try:
+                self.sweep()
+            except SQLAlchemyError:
+                logger.exception("Failed to sweep reservations, will retry")
+            self._wakeup.wait(self._sweep_interval)
+
+
+reservation_sweeper = ReservationSweeper()
+"""Application-level reservation sweeper."""
@@ -0,0 +1,152 @@
+"""Service that accounts for the hours users reserve study rooms each week."""
+
+from datetime import datetime, timedelta
+from fastapi import Depends
+from sqlalchemy import and_, func, not_, select
+from sqlalchemy.orm import Session
+from ...database import db_session
+from ...models.user import UserIdentity
+from ...models.coworking import ReservationState, TimeRange
+from ...entities.coworking import ReservationEntity
+from ...entities.coworking.reservation_user_table import reservation_user_table
+from .policy import PolicyService
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+class RoomQuotaService:
+    """RoomQuotaService enforces PolicyService#room_reservation_weekly_limit() on the hours of
+    study rooms each user reserves per calendar week, from Monday at midnight to the next.
+
+    The hours of a week are summed by a single SQL aggregate over the user's room reservations.
+    A reservation spanning midnight between Sunday and Monday counts toward each week for the
+    hours within it. Cancelled reservations, and drafts and confirmed reservations that have
+    lapsed, do not count. Checked out reservations count for the time they were held.
+    """
+
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        policy_svc: PolicyService = Depends(),
+    ):
+        """Initializes a new RoomQuotaService.
+
+        Args:
+            session (Session): The database session to use, typically injected by FastAPI.
+            policy_svc (PolicyService): The coworking policies, typically injected by FastAPI.
+        """
+        self._session = session
+        self._policy_svc = policy_svc
+
+    def week_of(self, moment: datetime) -> TimeRange:
+        """Returns the calendar week containing a moment.
+
+        Args:
+            moment (datetime): Any time during the week.
+
+        Returns:
+            TimeRange: The week, from Monday at midnight until the following Monday at midnight.
+        """
+        midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = midnight - timedelta(days=midnight.weekday())
+        return TimeRange(start=start, end=start + timedelta(weeks=1))
+
+    def reserved(
+        self, user: UserIdentity, week: TimeRange, now: datetime | None = None
+    ) -> timedelta:
+        """Returns the time a user has study rooms reserved during a week.
+
+        Args:
+            user (UserIdentity): The user whose room reservations are summed.
+            week (TimeRange): The week to sum reserved time within.
+            now (datetime, optional): The time lapsed reservations are found as of, now by default.
+
+        Returns:
+            timedelta: The total time of the user's room reservations within the week.
+        """
+        if now is None:
+            now = datetime.now()
+        draft_cutoff = now - self._policy_svc.reservation_draft_timeout()
+        checkin_cutoff = now - self._policy_svc.reservation_checkin_timeout()
+
+        # Only the part of each reservation within the week counts toward it
+        within_week = func.least(ReservationEntity.end, week.end) - func.greatest(
+            ReservationEntity.start, week.start
+        )
+        query = (
+            select(func.sum(within_week))
+            .select_from(reservation_user_table)
+            .join(
+                ReservationEntity,
+                ReservationEntity.id == reservation_user_table.c.reservation_id,
+            )
+            .where(
+                reservation_user_table.c.user_id == user.id,
+                ReservationEntity.room_id.is_not(None),
+                ReservationEntity.start < week.end,
+                ReservationEntity.end > week.start,
+                ReservationEntity.state.in_(
+                    (
+                        ReservationState.DRAFT,
+                        ReservationState.CONFIRMED,
+                        ReservationState.CHECKED_IN,
+                        ReservationState.CHECKED_OUT,
+                    )
+                ),
+                not_(
+                    and_(
+                        ReservationEntity.state == ReservationState.DRAFT,
+                        ReservationEntity.created_at < draft_cutoff,
+                    )
+                ),
+                not_(
+                    and_(
+                        ReservationEntity.state == ReservationState.CONFIRMED,
+                        ReservationEntity.start < checkin_cutoff,
+                    )
+                ),
+            )
+        )
+        return self._session.scalar(query) or timedelta()
+
+    def remaining(self, user: UserIdentity, now: datetime | None = None) -> timedelta:
+        """Returns the time a user may still reserve study rooms for during the current week.
+
+        Args:
+            user (UserIdentity): The user whose remaining time is found.
+            now (datetime, optional): The current time, by default.
+
+        Returns:
+            timedelta: The weekly limit less the time reserved this week, and never negative.
+        """
+        if now is None:
+            now = datetime.now()
+        reserved = self.reserved(user, self.week_of(now), now)
+        return max(
+            self._policy_svc.room_reservation_weekly_limit() - reserved, timedelta()
+        )
+
+    def allows(
+        self, user: UserIdentity, bounds: TimeRange, now: datetime | None = None
+    ) -> bool:
+        """Returns whether reserving a study room for a time range keeps a user within the weekly
+        limit of every week the time range falls in.
+
+        Args:
+            user (UserIdentity): The user requesting the room reservation.
+            bounds (TimeRange): The time range of the requested room reservation.
+            now (datetime, optional): The current time, by default.
+
+        Returns:
+            bool: True if the reservation is within the weekly limit, False if it would exceed it.
+        """
+        limit = self._policy_svc.room_reservation_weekly_limit()
+        week = self.week_of(bounds.start)
+        while week.start < bounds.end:
+            requested = min(bounds.end, week.end) - max(bounds.start, week.start)
+            if self.reserved(user, week, now) + requested > limit:
+                return False
+            week = TimeRange(start=week.end, end=week.end + timedelta(weeks=1))
+        return True
@@ -1,13 +1,27 @@
 """Reservation Service manages room and desk reservations for the XL."""
 
+import hashlib
 from fastapi import Depends
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Sequence
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from ...database import db_session
 from .reservation import ReservationService
 from .operating_hours import OperatingHoursService
 from .seat import SeatService
-from ...models.coworking import Status, TimeRange
+from .status_snapshot import (
+    StatusSnapshotCache,
+    coworking_status_snapshots,
+)
+from ...models.coworking import (
+    OperatingHours,
+    Reservation,
+    SeatAvailability,
+    SeatDetails,
+    Status,
+    TimeRange,
+)
 from ...models import User
 from .policy import PolicyService
 
@@ -15,6 +29,8 @@ __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+_reservations_adapter = TypeAdapter(Sequence[Reservation])
+
 
 class StatusService:
     """RoleService is the access layer to the role data model, its members, and permissions."""
@@ -25,41 +41,79 @@ class StatusService:
         operating_hours_svc: OperatingHoursService = Depends(),
         seat_svc: SeatService = Depends(),
         reservation_svc: ReservationService = Depends(),
+        snapshots: StatusSnapshotCache = Depends(coworking_status_snapshots),
     ):
         self._policies_svc = policies_svc
         self._reservation_svc = reservation_svc
         self._operating_hours_svc = operating_hours_svc
         self._seat_svc = seat_svc
+        self._snapshots = snapshots
 
     def get_coworking_status(self, subject: User) -> Status:
         """All-in-one endpoint for a user to simultaneously get their own upcoming reservations and current status of the XL."""
+        status, _ = self.get_coworking_status_with_etag(subject)
+        return status
+
+    def get_coworking_status_with_etag(self, subject: User) -> tuple[Status, str]:
+        """Gets the coworking status of a user along with an ETag of its content.
+
+        The seat availability and operating hours come from a snapshot shared by all users,
+        so only the subject's own reservations are queried for each request.
+
+        Args:
+            subject (User): The user whose status is requested.
+
+        Returns:
+            tuple[Status, str]: The status, and a weak ETag that changes when its content does.
+        """
         my_reservations = self._reservation_svc.get_current_reservations_for_user(
             subject, subject
         )
 
+        walkin_window = self._policies_svc.walkin_window(subject)
+        walkin_initial_duration = self._policies_svc.walkin_initial_duration(subject)
+        reservation_window = self._policies_svc.reservation_window(subject)
+        snapshot = self._snapshots.get(
+            (walkin_window, walkin_initial_duration, reservation_window),
+            lambda: self._build_snapshot(
+                walkin_window, walkin_initial_duration, reservation_window
+            ),
+        )
+
+        etag = hashlib.sha256(snapshot.digest.encode())
+        etag.update(_reservations_adapter.dump_json(my_reservations))
+
+        status = Status(
+            my_reservations=my_reservations,
+            seat_availability=snapshot.seat_availability,
+            operating_hours=snapshot.operating_hours,
+        )
+        return status, f'W/"{etag.hexdigest()[:32]}"'
+
+    def _build_snapshot(
+        self,
+        walkin_window: timedelta,
+        walkin_initial_duration: timedelta,
+        reservation_window: timedelta,
+    ) -> tuple[
+        Sequence[SeatDetails], Sequence[SeatAvailability], Sequence[OperatingHours]
+    ]:
+        """Builds the user-independent parts of the coworking status as of now."""
         now = datetime.now()
-        walkin_window = TimeRange(
+        walkin_bounds = TimeRange(
             start=now,
-            end=now
-            + self._policies_svc.walkin_window(subject)
-            + 3 * self._policies_svc.walkin_initial_duration(subject),
+            end=now + walkin_window + 3 * walkin_initial_duration,
             # We triple walkin duration for end bounds to find seats not pre-reserved later. If XL stays
             # relatively open, the walkin could then more likely be extended while it is not busy.
             # This also prioritizes _not_ placing walkins in reservable seats.
         )
         seats = self._seat_svc.list()  # All Seats are fair game for walkin purposes
         seat_availability = self._reservation_svc.seat_availability(
-            seats, walkin_window
+            seats, walkin_bounds
         )
 
         operating_hours = self._operating_hours_svc.schedule(
-            TimeRange(
-                start=now, end=now + self._policies_svc.reservation_window(subject)
-            )
+            TimeRange(start=now, end=now + reservation_window)
         )
 
-        return Status(
-            my_reservations=my_reservations,
-            seat_availability=seat_availability,
-            operating_hours=operating_hours,
-        )
+        return seats, seat_availability, operating_hours
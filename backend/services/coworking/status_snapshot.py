@@ -0,0 +1,163 @@
+"""
+The Status Snapshot Cache shares the user-independent parts of the coworking status between
+requests.
+
+Every student's browser polls the coworking status, yet only their own reservations differ
+between users. The seat catalog, seat availability, and operating hours are the same for
+everyone, so they are built into a versioned snapshot at most once per interval and shared by
+all polls in the meantime. Writes to reservations and operating hours invalidate snapshots,
+so that changes made by this process show up on the next poll. Changes made by other
+processes show up once the interval elapses.
+
+Status ETags are derived from a digest of a snapshot's content rather than from the snapshot
+itself. Seat availability begins at the moment it was built, and seats that are equally
+available are shuffled, so the digest compares seats in order of ID, with times to the
+minute, so that rebuilding unchanged data keeps the same ETag.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Hashable, Sequence
+
+from pydantic import TypeAdapter
+
+from ...models.coworking import OperatingHours, SeatAvailability, SeatDetails
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+SNAPSHOT_INTERVAL = timedelta(seconds=15)
+"""The longest a snapshot is shared before it is rebuilt."""
+
+DIGEST_RESOLUTION = timedelta(minutes=1)
+"""The resolution of the times of seat availability in snapshot digests, which is the
+resolution the status shows times at."""
+
+_operating_hours_adapter = TypeAdapter(Sequence[OperatingHours])
+
+
+class StatusSnapshot:
+    """The user-independent parts of the coworking status, as of when it was built."""
+
+    def __init__(
+        self,
+        version: int,
+        built_at: datetime,
+        seats: Sequence[SeatDetails],
+        seat_availability: Sequence[SeatAvailability],
+        operating_hours: Sequence[OperatingHours],
+    ):
+        self.version = version
+        self.built_at = built_at
+        self.seats = seats
+        self.seat_availability = seat_availability
+        self.operating_hours = operating_hours
+        # Digest of the snapshot's content, from which status ETags are derived
+        content = hashlib.sha256()
+        content.update(_seat_availability_digest(seat_availability))
+        content.update(_operating_hours_adapter.dump_json(operating_hours))
+        self.digest = content.hexdigest()
+
+
+class StatusSnapshotCache:
+    """Process-wide cache of status snapshots, keyed by the policies they were built with."""
+
+    def __init__(self, interval: timedelta = SNAPSHOT_INTERVAL):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+            interval: the longest a snapshot is shared before it is rebuilt
+        """
+        self._interval = interval
+        self._snapshots: dict[Hashable, StatusSnapshot] = {}
+        self._build_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """The current version, which increases every time snapshots are invalidated."""
+        return self._version
+
+    def invalidate(self) -> None:
+        """Marks all snapshots as stale, to be rebuilt when next requested."""
+        with self._version_lock:
+            self._version += 1
+
+    def get(
+        self,
+        key: Hashable,
+        build: Callable[
+            [],
+            tuple[
+                Sequence[SeatDetails],
+                Sequence[SeatAvailability],
+                Sequence[OperatingHours],
+            ],
+        ],
+        now: datetime | None = None,
+    ) -> StatusSnapshot:
+        """
+        Returns the snapshot for a key, building it if it is missing, stale, or too old.
+
+        Concurrent requests for a snapshot that needs rebuilding wait for one of them to
+        build it, rather than all building it at once.
+
+        Parameters:
+            key: the policies that the parts of the snapshot depend on
+            build: builds the seat catalog, seat availability, and operating hours
+            now: the current time, by default
+
+        Returns:
+            StatusSnapshot: a fresh snapshot for the key
+        """
+        with self._build_lock:
+            if now is None:
+                now = datetime.now()
+            snapshot = self._snapshots.get(key)
+            if (
+                snapshot is not None
+                and snapshot.version == self._version
+                and now - snapshot.built_at < self._interval
+            ):
+                return snapshot
+
+            # An invalidation while building leaves the snapshot stale, to be rebuilt again
+            version = self._version
+            snapshot = StatusSnapshot(version, now, *build())
+            self._snapshots[key] = snapshot
+            return snapshot
+
+
+status_snapshots = StatusSnapshotCache()
+"""Application-level status snapshot cache."""
+
+
+def coworking_status_snapshots() -> StatusSnapshotCache:
+    """Function offering dependency injection of the application-level snapshot cache."""
+    return status_snapshots
+
+
+def _seat_availability_digest(seat_availability: Sequence[SeatAvailability]) -> bytes:
+    """The content of seat availability that is independent of when and in which order it was
+    built: seats in order of ID, with times truncated to `DIGEST_RESOLUTION`."""
+    seats = [
+        {
+            **seat.model_dump(mode="json", exclude={"availability"}),
+            "availability": [
+                [_truncate(time_range.start), _truncate(time_range.end)]
+                for time_range in seat.availability
+            ],
+        }
+        for seat in sorted(seat_availability, key=lambda seat: seat.id or 0)
+    ]
+    return json.dumps(seats, sort_keys=True).encode()
+
+
+def _truncate(moment: datetime) -> str:
+    """Truncates a time to `DIGEST_RESOLUTION`."""
+    return (moment - (moment - datetime.min) % DIGEST_RESOLUTION).isoformat()
@@ -2,11 +2,14 @@
 The Event Service allows the API to manipulate event data in the database.
 """
 
-from typing import Sequence
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Literal, Sequence
 
 from fastapi import Depends
-from sqlalchemy import func, select, and_, func, or_, exists, or_
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import Select, func, select, and_, func, or_, exists, or_, false
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from backend.entities.user_entity import UserEntity
 from backend.models.event_registration import EventRegistration
 from ..models.public_user import PublicUser
@@ -25,6 +28,13 @@ from ..entities import (
 )
 from ..entities import EventEntity, OrganizationEntity
 from .permission import PermissionService
+from .pagination import order_by_column, paginate
+from .event_calendar import (
+    EVENTS_SCOPE,
+    calendar_versions,
+    organization_scope,
+    user_scope,
+)
 from .exceptions import (
     ResourceNotFoundException,
     EventRegistrationException,
@@ -42,6 +52,40 @@ __authors__ = [
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+EXPORT_BATCH_SIZE = 500
+"""The number of registrations fetched from the database at a time while streaming an export."""
+
+# The columns of registration exports, which are those of `PublicUser` and the registration type
+EXPORT_COLUMNS = [
+    "id",
+    "first_name",
+    "last_name",
+    "pronouns",
+    "email",
+    "github_avatar",
+    "registration_type",
+]
+
+# Spreadsheets evaluate cells beginning with these characters as formulas
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# The columns paginated lists of events may be ordered by
+ORDERABLE_EVENTS = {
+    "id": EventEntity.id,
+    "name": EventEntity.name,
+    "time": EventEntity.time,
+    "location": EventEntity.location,
+}
+
+# The columns paginated lists of registered users may be ordered by
+ORDERABLE_USERS = {
+    "id": UserEntity.id,
+    "onyen": UserEntity.onyen,
+    "email": UserEntity.email,
+    "first_name": UserEntity.first_name,
+    "last_name": UserEntity.last_name,
+}
+
 
 class EventService:
     """Service that performs all of the actions on the `Event` table"""
@@ -71,8 +115,7 @@ class EventService:
             Paginated[Event]: The paginated list of events.
         """
 
-        statement = select(EventEntity)
-        length_statement = select(func.count()).select_from(EventEntity)
+        statement = self._listing_statement(subject)
         if pagination_params.range_start != "":
             range_start = pagination_params.range_start
             range_end = pagination_params.range_end
@@ -82,7 +125,6 @@ class EventService:
                 EventEntity.time <= datetime.strptime(range_end, "%d/%m/%Y, %H:%M:%S"),
             )
             statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
 
         if pagination_params.filter != "":
             query = pagination_params.filter
@@ -100,25 +142,20 @@ class EventService:
                 ),
             )
             statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
-
-        offset = pagination_params.page * pagination_params.page_size
-        limit = pagination_params.page_size
 
-        if pagination_params.order_by != "":
+        order_by = order_by_column(ORDERABLE_EVENTS, pagination_params.order_by)
+        if order_by is not None:
             statement = statement.order_by(
-                    getattr(EventEntity, pagination_params.order_by)
-                ) if pagination_params.ascending else statement.order_by(
-                    getattr(EventEntity, pagination_params.order_by).desc()
-                )
+                order_by if pagination_params.ascending != "false" else order_by.desc()
+            )
 
-        statement = statement.offset(offset).limit(limit)
+        # Order by ID last so that pages do not overlap when ordered values tie
+        statement = statement.order_by(EventEntity.id)
 
-        length = self._session.execute(length_statement).scalar()
-        entities = self._session.execute(statement).scalars()
+        rows, length = paginate(self._session, statement, pagination_params)
 
         return Paginated(
-            items=[entity.to_details_model(subject) for entity in entities],
+            items=self._listing_details_models(rows),
             length=length,
             params=pagination_params,
         )
@@ -136,13 +173,9 @@ class EventService:
         Returns:
             list[EventDetails]: List of all `EventDetails`
         """
-        # Select all entries in `Event` table
-        event_entities = (self._session.query(EventEntity)).all()
-
-        # Convert entities to details models and return
-        return [
-            event_entity.to_details_model(subject) for event_entity in event_entities
-        ]
+        # Select all entries in `Event` table and convert them to details models
+        statement = self._listing_statement(subject).order_by(EventEntity.id)
+        return self._listing_details_models(self._session.execute(statement))
 
     def get_events_in_time_range(
         self, time_range: TimeRange, subject: User | None = None
@@ -157,13 +190,14 @@ class EventService:
         Returns:
             list[EventDetails]: list of valid EventDetails models representing the events
         """
-        event_entities = (
-            self._session.query(EventEntity)
+        statement = (
+            self._listing_statement(subject)
             .where(EventEntity.time >= time_range.start)
             .where(EventEntity.time < time_range.end)
+            .order_by(EventEntity.id)
         )
 
-        return [entity.to_details_model(subject) for entity in event_entities]
+        return self._listing_details_models(self._session.execute(statement))
 
     def create(self, subject: User, event: DraftEvent) -> EventDetails:
         """
@@ -191,6 +225,7 @@ class EventService:
         # Add new object to table and commit changes
         self._session.add(event_entity)
         self._session.commit()
+        calendar_versions.bump(EVENTS_SCOPE, organization_scope(event.organization_id))
 
         # Retrieve the detail model of the event created
         event_details = event_entity.to_details_model()
@@ -223,15 +258,16 @@ class EventService:
             ResourceNotFoundException when event ID cannot be looked up
         """
 
-        # Query the event with matching id
-        entity = self._session.get(EventEntity, id)
+        # Query the event with matching id, along with its registration aggregates
+        statement = self._listing_statement(subject).where(EventEntity.id == id)
+        events = self._listing_details_models(self._session.execute(statement))
 
         # Check if result is null
-        if entity is None:
+        if len(events) == 0:
             raise ResourceNotFoundException(f"No event found with matching ID: {id}")
 
-        # Convert entry to a model and return
-        return entity.to_details_model(subject)
+        # Return the model
+        return events[0]
 
     def get_events_by_organization(
         self, organization: OrganizationDetails, subject: User | None = None
@@ -247,14 +283,14 @@ class EventService:
             list[EventDetail]: a list of valid EventDetails models
         """
         # Query the event with matching organization slug
-        events = (
-            self._session.query(EventEntity)
-            .filter(EventEntity.organization_id == organization.id)
-            .all()
+        statement = (
+            self._listing_statement(subject)
+            .where(EventEntity.organization_id == organization.id)
+            .order_by(EventEntity.id)
         )
 
         # Convert entities to models and return
-        return [event.to_details_model(subject) for event in events]
+        return self._listing_details_models(self._session.execute(statement))
 
     def update(self, subject: User, event: Event) -> EventDetails:
         """
@@ -293,6 +329,12 @@ class EventService:
         event_entity.public = event.public
         event_entity.registration_limit = event.registration_limit
 
+        # Feeds of the event change, as do those of any organizers added or removed
+        changed_scopes = [
+            EVENTS_SCOPE,
+            organization_scope(event_entity.organization_id),
+        ]
+
         # If attempting to edit organizers, enforce registration management permissions
         if event.organizers != event_details.organizers:
             self._permission.enforce(
@@ -307,6 +349,7 @@ class EventService:
                         EventRegistrationEntity, (event.id, organizer.id)
                     )
                     self._session.delete(event_registration_entity)
+                    changed_scopes.append(user_scope(organizer.id or 0))
 
             # Add organizers not in current organizers
             for organizer in event.organizers:
@@ -325,9 +368,11 @@ class EventService:
                     event_registration_entity.registration_type = (
                         RegistrationType.ORGANIZER
                     )
+                    changed_scopes.append(user_scope(organizer.id or 0))
 
         # Save changes
         self._session.commit()
+        calendar_versions.bump(*changed_scopes)
 
         # Return updated object
         return event_entity.to_details_model(subject)
@@ -356,10 +401,12 @@ class EventService:
         )
 
         # Delete object and commit
+        organization_id = event.organization_id
         self._session.delete(event)
 
         # Save changes
         self._session.commit()
+        calendar_versions.bump(EVENTS_SCOPE, organization_scope(organization_id))
 
     """Event Registration Service Methods"""
 
@@ -437,6 +484,105 @@ class EventService:
 
         return [entity.to_flat_model() for entity in event_registration_entities]
 
+    def export_registrations(
+        self,
+        subject: User,
+        event: EventDetails,
+        format: Literal["csv", "jsonl"] = "csv",
+    ) -> Iterator[str]:
+        """
+        Export the registrations of an event as CSV or JSON Lines.
+
+        The registrations are streamed from a server-side cursor a batch at a time, so that
+        exporting an event with many registrants takes constant memory. As with
+        `get_registrations_of_event`, the subject must be an organizer of the event or have
+        administrative permission to manage its registrations. Permission is checked when
+        this method is called, before the export is streamed.
+
+        Args:
+            subject: The authenticated user making the request.
+            event: The event whose registrations are being exported.
+            format: "csv" for a CSV with a header row, or "jsonl" for a JSON object per line.
+
+        Returns:
+            Iterator[str]: the export, a batch of registrations at a time
+
+        Raises:
+            UserPermissionException if user is not an event organizer or admin.
+        """
+        if not event.is_organizer:
+            self._permission.enforce(
+                subject,
+                "organization.events.manage_registrations",
+                f"organization/{event.organization.id}",
+            )
+
+        statement = (
+            select(
+                UserEntity.id,
+                UserEntity.first_name,
+                UserEntity.last_name,
+                UserEntity.pronouns,
+                UserEntity.email,
+                UserEntity.github_avatar,
+                EventRegistrationEntity.registration_type,
+            )
+            .join(
+                EventRegistrationEntity,
+                EventRegistrationEntity.user_id == UserEntity.id,
+            )
+            .where(EventRegistrationEntity.event_id == event.id)
+            .order_by(UserEntity.last_name, UserEntity.first_name, UserEntity.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        if format == "csv":
+            return self._stream_csv(statement)
+        return self._stream_jsonl(statement)
+
+    def _stream_csv(self, statement: Select) -> Iterator[str]:
+        """Streams the rows of a registration export as CSV, a batch at a time.
+
+        Users choose their own names and pronouns, so text that a spreadsheet would evaluate
+        as a formula is prefixed with an apostrophe to be shown as text instead."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for batch in self._stream_batches(statement):
+            writer.writerows(
+                [self._csv_cell(value) for value in row[:-1]] + [row[-1].name]
+                for row in batch
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def _csv_cell(self, value: object) -> object:
+        """Neutralizes text that a spreadsheet would evaluate as a formula."""
+        if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+            return f"'{value}"
+        return value
+
+    def _stream_jsonl(self, statement: Select) -> Iterator[str]:
+        """Streams the rows of a registration export as JSON Lines, a batch at a time."""
+        for batch in self._stream_batches(statement):
+            yield "".join(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row[:-1] + (row[-1].name,)))) + "\n"
+                for row in batch
+            )
+
+    def _stream_batches(self, statement: Select) -> Iterator[Sequence[tuple]]:
+        """Streams the rows of a query a batch of its `yield_per` at a time.
+
+        FastAPI closes an injected session before a streamed response is sent, so the stream
+        queries on the session anew, and closes it once every batch has been streamed.
+        """
+        try:
+            for batch in self._session.execute(statement).partitions():
+                yield [tuple(row) for row in batch]
+        finally:
+            self._session.close()
+
     def set_event_organizer(
         self, subject: User, user_id: int, event: EventDetails
     ) -> PublicUser:
@@ -467,6 +613,7 @@ class EventService:
         )
         self._session.add(event_registration_entity)
         self._session.commit()
+        calendar_versions.bump(user_scope(user_id))
 
         # Return registration
         return event_registration_entity.to_flat_model()
@@ -496,23 +643,43 @@ class EventService:
                 f"organization/{event.organization.id}",
             )
 
-        # Get the registration status.
-        # NOTE: It is preferred to use the service function rather than the list of
-        # registrations passed in from `event` in the case that registrations are added
-        # between when `event` was fetched and this function runs.
-
-        # Raise exception if event is full.
-        if event.registration_count >= event.registration_limit:
-            raise EventRegistrationException(event.id)
+        # Lock the event until this registration is committed, so that concurrent
+        # registrations for it are counted and added one at a time.
+        # NOTE: The registration count and limit are read from the database, rather than
+        # from `event`, in the case that registrations are added between when `event` was
+        # fetched and this function runs.
+        registration_limit = self._session.execute(
+            select(EventEntity.registration_limit)
+            .where(EventEntity.id == event.id)
+            .with_for_update()
+        ).scalar_one_or_none()
+        if registration_limit is None:
+            raise ResourceNotFoundException(
+                f"No event found with matching ID: {event.id}"
+            )
 
         # Enable idemopotency in returning existing registration, if one exists.
         # Permission to manage / read registration is enforced in EventService#get_registration
         existing_registration = self.get_registration(subject, attendee, event)
         if existing_registration:
+            self._session.rollback()
             return EventRegistrationEntity.from_model(
                 existing_registration
             ).to_flat_model()
 
+        # Raise exception if event is full.
+        registration_count = self._session.execute(
+            select(func.count())
+            .select_from(EventRegistrationEntity)
+            .where(
+                EventRegistrationEntity.event_id == event.id,
+                EventRegistrationEntity.registration_type == RegistrationType.ATTENDEE,
+            )
+        ).scalar_one()
+        if registration_count >= registration_limit:
+            self._session.rollback()
+            raise EventRegistrationException(event.id)
+
         # Add new object to table and commit changes
         event_registration_entity = EventRegistrationEntity(
             user_id=attendee.id,
@@ -521,6 +688,7 @@ class EventService:
         )
         self._session.add(event_registration_entity)
         self._session.commit()
+        calendar_versions.bump(user_scope(attendee.id or 0))
 
         # Return registration
         return event_registration_entity.to_flat_model()
@@ -560,6 +728,7 @@ class EventService:
             )
         )
         self._session.commit()
+        calendar_versions.bump(user_scope(attendee.id or 0))
 
     def get_registrations_of_user(
         self, subject: User, user: User, time_range: TimeRange
@@ -645,19 +814,6 @@ class EventService:
             )
         )
 
-        # Statement to determine number of rows in query result
-        length_statement = (
-            select(func.count())
-            .select_from(UserEntity)
-            .join(
-                EventRegistrationAlias, EventRegistrationAlias.user_id == UserEntity.id
-            )
-            .where(
-                EventRegistrationAlias.event_id == event_id,
-                EventRegistrationAlias.registration_type == RegistrationType.ATTENDEE,
-            )
-        )
-
         # Filter results by query
         if pagination_params.filter != "":
             query = pagination_params.filter
@@ -668,28 +824,90 @@ class EventService:
             )
 
             statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
-
-        # Calculate where to begin retrieving rows and how many to retrieve
-        offset = pagination_params.page * pagination_params.page_size
-        limit = pagination_params.page_size
 
         # Order results by order by attribute
-        if pagination_params.order_by != "":
-            statement = statement.order_by(
-                getattr(UserEntity, pagination_params.order_by)
-            )
-
-        # Retrieve limited items
-        statement = statement.offset(offset).limit(limit)
+        order_by = order_by_column(ORDERABLE_USERS, pagination_params.order_by)
+        if order_by is not None:
+            statement = statement.order_by(order_by)
 
-        # Execute statement and retrieve entities
-        length = self._session.execute(length_statement).scalar()
-        entities = self._session.execute(statement).scalars()
+        # Retrieve the page of entities along with the number of rows in the query result
+        rows, length = paginate(self._session, statement, pagination_params)
 
         # Convert `UserEntity`s to model and return page
         return Paginated(
-            items=[entity.to_model() for entity in entities],
+            items=[entity.to_model() for entity, in rows],
             length=length,
             params=pagination_params,
         )
+
+    def _listing_statement(self, subject: User | None = None) -> Select:
+        """
+        Builds the query of a listing of events along with their registration aggregates.
+
+        The number of attendees of each event, and whether the subject is an attendee or an
+        organizer of it, are subqueries correlated to each event listed. PostgreSQL evaluates
+        them after ordering and paging, so they only look up the registrations of the events
+        on the page. The organization and organizers of the listed events are each loaded by
+        a single batched query, so that a listing costs a fixed number of queries however many
+        users are registered for its events.
+
+        Args:
+            subject: The User making the request.
+
+        Returns:
+            Select: a query of events and their aggregates, to be filtered, ordered, and paged
+        """
+        registration_count = (
+            select(func.count())
+            .where(
+                EventRegistrationEntity.event_id == EventEntity.id,
+                EventRegistrationEntity.registration_type == RegistrationType.ATTENDEE,
+            )
+            .scalar_subquery()
+        )
+
+        return select(
+            EventEntity,
+            registration_count.label("registration_count"),
+            self._is_registered(subject, RegistrationType.ATTENDEE).label(
+                "is_attendee"
+            ),
+            self._is_registered(subject, RegistrationType.ORGANIZER).label(
+                "is_organizer"
+            ),
+        ).options(
+            selectinload(EventEntity.organization),
+            selectinload(EventEntity.organizer_registrations).joinedload(
+                EventRegistrationEntity.user
+            ),
+        )
+
+    def _is_registered(self, subject: User | None, registration_type: RegistrationType):
+        """Whether the subject is registered for each event listed with a registration type,
+        looked up by the primary key of the registration."""
+        if subject is None:
+            return false()
+        return exists().where(
+            EventRegistrationEntity.event_id == EventEntity.id,
+            EventRegistrationEntity.user_id == subject.id,
+            EventRegistrationEntity.registration_type == registration_type,
+        )
+
+    def _listing_details_models(
+        self, rows: Iterable[tuple[EventEntity, int | None, bool | None, bool | None]]
+    ) -> list[EventDetails]:
+        """
+        Converts the rows of a query built by `_listing_statement` to details models.
+
+        Args:
+            rows: events and their aggregates from a query built by `_listing_statement`
+
+        Returns:
+            list[EventDetails]: the events listed, in the order queried
+        """
+        return [
+            entity.to_listing_details_model(
+                registration_count or 0, bool(is_attendee), bool(is_organizer)
+            )
+            for entity, registration_count, is_attendee, is_organizer in rows
+        ]
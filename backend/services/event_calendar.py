@@ -0,0 +1,329 @@
+"""
+The Event Calendar Service serves events as iCalendar feeds that calendar apps subscribe to.
+
+Calendar apps poll their subscriptions often, and most polls find nothing new. Each feed covers
+a scope of events: all events, an organization's events, or the events a user is registered
+for. Every change to an event or registration bumps the version of the scopes it affects, and
+feeds are validated by an ETag and Last-Modified derived from their scopes' versions. A poll of
+an unchanged feed is answered from the versions alone, without querying events. Feeds that
+changed are streamed a batch of events at a time rather than built in memory.
+"""
+
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Sequence
+from zoneinfo import ZoneInfo
+
+from fastapi import Depends
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from ..database import db_session
+from ..entities import EventEntity, EventRegistrationEntity
+from ..models import User
+from ..models.coworking.time_range import TimeRange
+from ..models.organization import Organization
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+CALENDAR_PAST = timedelta(days=30)
+"""How long before today the events of a feed start."""
+
+CALENDAR_FUTURE = timedelta(days=365)
+"""How long after today the events of a feed end."""
+
+EVENT_DURATION = timedelta(hours=1)
+"""How long events are shown to last, since events have a start time and no end time."""
+
+FEED_BATCH_SIZE = 100
+"""The number of events fetched from the database at a time while streaming a feed."""
+
+TIMEZONE = ZoneInfo("America/New_York")
+"""The time zone event times are stored in."""
+
+UID_DOMAIN = "csxl.unc.edu"
+"""The domain that qualifies the unique IDs of events in feeds."""
+
+EVENTS_SCOPE = "events"
+"""The scope of the feed of all events, bumped by every change to an event."""
+
+
+def organization_scope(organization_id: int) -> str:
+    """The scope of the feed of an organization's events."""
+    return f"organization/{organization_id}"
+
+
+def user_scope(user_id: int) -> str:
+    """The scope of the registrations of a user, bumped when they register or unregister."""
+    return f"user/{user_id}"
+
+
+class CalendarVersions:
+    """Process-wide versions of the scopes of calendar feeds."""
+
+    def __init__(self):
+        """Initializes every scope at version zero, as of when the process started."""
+        self._lock = threading.Lock()
+        self._started_at = datetime.now(timezone.utc).replace(microsecond=0)
+        self._versions: dict[str, tuple[int, datetime]] = {}
+
+    def bump(self, *scopes: str) -> None:
+        """
+        Marks scopes as changed, so that the feeds of them are served again in full.
+
+        Parameters:
+            scopes: the scopes whose events or registrations changed
+        """
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        with self._lock:
+            for scope in scopes:
+                version, _ = self._versions.get(scope, (0, self._started_at))
+                self._versions[scope] = (version + 1, now)
+
+    def validators(
+        self, scopes: Sequence[str], window: TimeRange
+    ) -> tuple[str, datetime]:
+        """
+        Returns the validators of a feed of scopes over a window of time.
+
+        Versions start over with the process, so the time the process started is part of
+        the ETag. A feed also changes as its window moves over time, so the start of the
+        window is part of the ETag and Last-Modified is never before the window moved.
+
+        Parameters:
+            scopes: the scopes whose changes change the feed
+            window: the time range the feed's events are within
+
+        Returns:
+            tuple[str, datetime]: a weak ETag, and the time of the feed's last modification
+        """
+        with self._lock:
+            versions = [
+                (scope, *self._versions.get(scope, (0, self._started_at)))
+                for scope in scopes
+            ]
+        moved_at = (window.start + CALENDAR_PAST).replace(tzinfo=TIMEZONE)
+        last_modified = max(
+            [modified for _, _, modified in versions]
+            + [moved_at.astimezone(timezone.utc), self._started_at]
+        )
+        key = ";".join(
+            [self._started_at.isoformat(), window.start.isoformat()]
+            + [f"{scope}={version}" for scope, version, _ in versions]
+        )
+        etag = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return f'W/"{etag}"', last_modified
+
+
+calendar_versions = CalendarVersions()
+"""Application-level calendar feed versions."""
+
+
+def event_calendar_versions() -> CalendarVersions:
+    """Function offering dependency injection of the application-level calendar versions."""
+    return calendar_versions
+
+
+class EventCalendarService:
+    """Service that streams events as iCalendar feeds and validates them."""
+
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        versions: CalendarVersions = Depends(event_calendar_versions),
+    ):
+        """Initializes the `EventCalendarService` session and calendar versions"""
+        self._session = session
+        self._versions = versions
+
+    def window(self, now: datetime | None = None) -> TimeRange:
+        """
+        Returns the time range of the events in feeds, which moves forward daily.
+
+        Args:
+            now: The current time, by default.
+
+        Returns:
+            TimeRange: the time range from CALENDAR_PAST before today until CALENDAR_FUTURE after
+        """
+        if now is None:
+            now = datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return TimeRange(start=midnight - CALENDAR_PAST, end=midnight + CALENDAR_FUTURE)
+
+    def validators(
+        self, scopes: Sequence[str], now: datetime | None = None
+    ) -> tuple[str, datetime]:
+        """
+        Returns the validators of the feed of scopes, without querying the database.
+
+        Args:
+            scopes: The scopes of the feed, such as `EVENTS_SCOPE`.
+            now: The current time, by default.
+
+        Returns:
+            tuple[str, datetime]: a weak ETag, and the time of the feed's last modification
+        """
+        return self._versions.validators(scopes, self.window(now))
+
+    def events_feed(self, now: datetime | None = None) -> Iterator[str]:
+        """
+        Streams the feed of all events within the window, whose scope is `EVENTS_SCOPE`.
+
+        Args:
+            now: The current time, by default.
+
+        Returns:
+            Iterator[str]: the lines of the feed, a batch of events at a time
+        """
+        return self._feed("CSXL Events", [EVENTS_SCOPE], self._statement(now), now)
+
+    def organization_feed(
+        self, organization: Organization, now: datetime | None = None
+    ) -> Iterator[str]:
+        """
+        Streams the feed of an organization's events within the window, whose scope is
+        `organization_scope(organization.id)`.
+
+        Args:
+            organization: The organization hosting the events.
+            now: The current time, by default.
+
+        Returns:
+            Iterator[str]: the lines of the feed, a batch of events at a time
+        """
+        statement = self._statement(now).where(
+            EventEntity.organization_id == organization.id
+        )
+        return self._feed(
+            f"{organization.name} Events",
+            [organization_scope(organization.id or 0)],
+            statement,
+            now,
+        )
+
+    def registrations_feed(
+        self, subject: User, now: datetime | None = None
+    ) -> Iterator[str]:
+        """
+        Streams the feed of the events within the window that the subject is registered for as
+        an attendee or organizer, whose scopes are `EVENTS_SCOPE` and `user_scope(subject.id)`.
+
+        Args:
+            subject: The User whose registrations are streamed.
+            now: The current time, by default.
+
+        Returns:
+            Iterator[str]: the lines of the feed, a batch of events at a time
+        """
+        statement = self._statement(now).join(
+            EventRegistrationEntity,
+            (EventRegistrationEntity.event_id == EventEntity.id)
+            & (EventRegistrationEntity.user_id == subject.id),
+        )
+        return self._feed(
+            "My CSXL Events",
+            [EVENTS_SCOPE, user_scope(subject.id or 0)],
+            statement,
+            now,
+        )
+
+    def _statement(self, now: datetime | None) -> Select:
+        """The query of the columns of the events within the window that feeds show."""
+        window = self.window(now)
+        return (
+            select(
+                EventEntity.id,
+                EventEntity.name,
+                EventEntity.time,
+                EventEntity.location,
+                EventEntity.description,
+            )
+            .where(EventEntity.time >= window.start, EventEntity.time < window.end)
+            .order_by(EventEntity.time, EventEntity.id)
+        )
+
+    def _feed(
+        self,
+        name: str,
+        scopes: Sequence[str],
+        statement: Select,
+        now: datetime | None,
+    ) -> Iterator[str]:
+        """Streams a feed of the events of a query, with the feed's last modification as the
+        time stamp of its events.
+
+        FastAPI closes an injected session before a streamed response is sent, so the stream
+        queries on the session anew, and closes it once the feed has been streamed."""
+        _, stamp = self.validators(scopes, now)
+        try:
+            yield _lines(
+                "BEGIN:VCALENDAR",
+                "VERSION:2.0",
+                "PRODID:-//CSXL//Events//EN",
+                "CALSCALE:GREGORIAN",
+                f"X-WR-CALNAME:{_text(name)}",
+            )
+            rows = self._session.execute(
+                statement.execution_options(yield_per=FEED_BATCH_SIZE)
+            )
+            for id, title, time, location, description in rows:
+                start = time.replace(tzinfo=TIMEZONE)
+                yield _lines(
+                    "BEGIN:VEVENT",
+                    f"UID:event-{id}@{UID_DOMAIN}",
+                    f"DTSTAMP:{_utc(stamp)}",
+                    f"DTSTART:{_utc(start)}",
+                    f"DTEND:{_utc(start + EVENT_DURATION)}",
+                    f"SUMMARY:{_text(title)}",
+                    f"LOCATION:{_text(location)}",
+                    f"DESCRIPTION:{_text(description)}",
+                    "END:VEVENT",
+                )
+            yield _lines("END:VCALENDAR")
+        finally:
+            self._session.close()
+
+
+def _utc(time: datetime) -> str:
+    """Formats an aware time as an iCalendar UTC date-time."""
+    return time.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _text(value: str | None) -> str:
+    """Escapes a value as iCalendar text."""
+    return (
+        (value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+        .replace("\r", "\\n")
+    )
+
+
+def _lines(*lines: str) -> str:
+    """Joins content lines, each folded to at most 75 octets and ended by CRLF."""
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def _fold(line: str) -> str:
+    """Folds a content line into lines of at most 75 octets, continued by a leading space,
+    without splitting multi-octet characters."""
+    folded: list[str] = []
+    current = ""
+    octets = 0
+    for character in line:
+        size = len(character.encode())
+        if octets + size > 75:
+            folded.append(current)
+            current = " "
+            octets = 1
+        current += character
+        octets += size
+    folded.append(current)
+    return "\r\n".join(folded)
@@ -0,0 +1,122 @@
+"""Shared execution of the queries behind `Paginated` results.
+
+A page and the total number of results it is a page of are found by a single statement, with
+the total counted by the window function `count(*) OVER ()` alongside each row. Services build
+the statement of their results, filters included, once, and leave paging and counting to
+`paginate`, rather than repeating their criteria in a separate count statement.
+
+Unfiltered listings of tables too large to count quickly may use the planner's estimate of the
+number of rows in the table instead of an exact count."""
+
+from typing import Any, Mapping
+
+from sqlalchemy import ColumnElement, Select, Table, func, select, text
+from sqlalchemy.orm import Session
+
+from ..models.pagination import PaginationParams
+from .exceptions import ResourceNotFoundException
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+ESTIMATE_THRESHOLD = 100_000
+"""The fewest rows a table must be estimated to have before an estimate is used as its count."""
+
+
+def order_by_column(
+    orderable: Mapping[str, ColumnElement[Any]], order_by: str
+) -> ColumnElement[Any] | None:
+    """Looks up the column results are ordered by from an allow-list of orderable columns.
+
+    Args:
+        orderable: The columns results may be ordered by, by the name clients order by.
+        order_by: The name of the column to order by, or an empty string for no order.
+
+    Returns:
+        ColumnElement | None: The column to order by, or None when no order is requested.
+
+    Raises:
+        ResourceNotFoundException: If the results cannot be ordered by the name.
+    """
+    if order_by == "":
+        return None
+    if order_by not in orderable:
+        raise ResourceNotFoundException(f"Results cannot be ordered by: {order_by}")
+    return orderable[order_by]
+
+
+def paginate(
+    session: Session,
+    statement: Select,
+    pagination_params: PaginationParams,
+    estimate: bool = False,
+) -> tuple[list[tuple[Any, ...]], int]:
+    """Executes one page of a statement, along with the total number of its results.
+
+    Args:
+        session: The database session to execute the statement with.
+        statement: The filtered and ordered statement of all results.
+        pagination_params: The page of results to execute.
+        estimate: Whether the total may be estimated. It is only estimated for an unfiltered
+            statement of a single table estimated to have at least `ESTIMATE_THRESHOLD` rows.
+
+    Returns:
+        tuple[list[tuple], int]: The rows of the page, each a tuple of the statement's columns,
+        and the total number of results.
+    """
+    offset = pagination_params.page * pagination_params.page_size
+    limit = pagination_params.page_size
+
+    if estimate:
+        estimated = _estimated_count(session, statement)
+        if estimated is not None:
+            rows = session.execute(statement.offset(offset).limit(limit)).all()
+            return [tuple(row) for row in rows], estimated
+
+    total = func.count().over().label("total")
+    rows = session.execute(
+        statement.add_columns(total).offset(offset).limit(limit)
+    ).all()
+    if len(rows) > 0:
+        return [tuple(row)[:-1] for row in rows], rows[0].total
+    if offset == 0:
+        return [], 0
+
+    # A page past the end has no rows to count alongside, so the results are counted alone
+    return [], count(session, statement)
+
+
+def count(session: Session, statement: Select) -> int:
+    """Counts the results of a statement exactly.
+
+    Args:
+        session: The database session to execute the count with.
+        statement: The statement whose results are counted.
+
+    Returns:
+        int: The number of results of the statement.
+    """
+    results = statement.order_by(None).subquery()
+    return session.execute(select(func.count()).select_from(results)).scalar_one()
+
+
+def _estimated_count(session: Session, statement: Select) -> int | None:
+    """The planner's estimate of the rows of an unfiltered statement of a single table, when
+    the table is large enough for an estimate to be worthwhile."""
+    froms = statement.get_final_froms()
+    if (
+        statement.whereclause is not None
+        or len(froms) != 1
+        or not isinstance(froms[0], Table)
+    ):
+        return None
+
+    # reltuples is negative for a table that has never been vacuumed or analyzed
+    reltuples = session.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": froms[0].fullname},
+    ).scalar()
+    if reltuples is None or reltuples < ESTIMATE_THRESHOLD:
+        return None
+    return int(reltuples)
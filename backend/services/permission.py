@@ -3,17 +3,20 @@ Permission Service grants, revokes, tests, and enforces permissions for users an
 
 This Service is more of an internal service that other services take dependency on. It is not directly
 exposed via the API.
+
+An instance is scoped to a request, as FastAPI shares one instance among all of the services a request
+depends on. Each subject's permissions are loaded once per instance, and the outcome of each check is
+memoized, so services can enforce as many permissions as they need without repeating queries.
 """
 
-import re
 from fastapi import Depends
-from functools import lru_cache
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 from ..database import db_session
 from ..models import User, Permission, Role, RoleDetails
-from ..entities import UserEntity, PermissionEntity, RoleEntity
+from ..entities import UserEntity, PermissionEntity, RoleEntity, user_role_table
 from ..services.exceptions import UserPermissionException
+from .permission_matcher import PermissionMatcher, compile_permissions
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -24,6 +27,9 @@ class PermissionService:
     """PermissionService grants, revokes, tests, and enforces permissions for users and roles in the system."""
 
     _session: Session
+    _permissions: dict[int, list[Permission]]
+    _matchers: dict[int, PermissionMatcher]
+    _checks: dict[tuple[int, str, str], bool]
 
     def __init__(self, session: Session = Depends(db_session)):
         """Initialize a new PermissionService instance.
@@ -31,6 +37,9 @@ class PermissionService:
         Args:
             session (Session): The SQLAlchemy session to use for database operations."""
         self._session = session
+        self._permissions = {}
+        self._matchers = {}
+        self._checks = {}
 
     def get_permissions(self, subject: User) -> list[Permission]:
         """Get the permissions for a user.
@@ -40,10 +49,7 @@ class PermissionService:
 
         Returns:
             list[Permission]: The permissions for the user."""
-        user_permissions = self._get_user_permissions(subject)
-        roles_permissions = self._get_user_roles_permissions(subject)
-        permissions = user_permissions + roles_permissions
-        return [permission.to_model() for permission in permissions]
+        return list(self._get_all_permissions(subject))
 
     def grant(
         self, grantor: User, grantee: User | Role | RoleDetails, permission: Permission
@@ -83,6 +89,7 @@ class PermissionService:
 
         self._session.add(permission_entity)
         self._session.commit()
+        self.invalidate()
         return True
 
     def revoke(self, revoker: User, permission: Permission) -> bool:
@@ -110,8 +117,18 @@ class PermissionService:
 
         self._session.delete(permission_entity)
         self._session.commit()
+        self.invalidate()
         return True
 
+    def invalidate(self) -> None:
+        """Forget the permissions loaded and the checks memoized so far.
+
+        Must be called after any change to the permissions of users or roles, or to the members
+        of roles, so that later checks through this instance see the change."""
+        self._permissions.clear()
+        self._matchers.clear()
+        self._checks.clear()
+
     def enforce(self, subject: User, action: str, resource: str) -> None:
         """Enforce a permission for a user.
 
@@ -134,100 +151,97 @@ class PermissionService:
 
         Args:
             subject (User): The user to check permissions for.
+            action (str): The action in question.
+            resource (str): The resource in question.
 
         Returns:
             bool: True if the user has permission to carry out the action on the resource, False otherwise.
         """
-        # Check user permissions
-        user_perms = self._get_user_permissions(subject)
-        if self._has_permission(user_perms, action, resource):
-            return True
+        if subject.id is None:
+            return False
 
-        # Check role permissions
-        role_permissions = self._get_user_roles_permissions(subject)
-        return self._has_permission(role_permissions, action, resource)
+        key = (subject.id, action, resource)
+        if key not in self._checks:
+            matcher = self._get_matcher(subject)
+            self._checks[key] = matcher.matches(action, resource)
+        return self._checks[key]
 
-    def _get_user_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user.
+    def _get_matcher(self, subject: User) -> PermissionMatcher:
+        """Get the compiled matcher of the permissions of a user and of the user's roles.
 
         Args:
-            subject (User): The user to get permissions for.
+            subject (User): The user to get the matcher for.
 
         Returns:
-            list[PermissionEntity]: The permissions for the user."""
-        user_query = select(PermissionEntity).where(
-            PermissionEntity.user_id == subject.id
-        )
-        user_perms = [p for p in self._session.execute(user_query).scalars()]
-        return user_perms
+            PermissionMatcher: The matcher of the user's permissions."""
+        if subject.id not in self._matchers:
+            permissions = self._get_all_permissions(subject)
+            patterns = tuple((p.action, p.resource) for p in permissions)
+            self._matchers[subject.id] = compile_permissions(patterns)
+        return self._matchers[subject.id]
 
-    def _get_user_roles_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user's roles.
+    def _get_all_permissions(self, subject: User) -> list[Permission]:
+        """Get the permissions of a user and of the user's roles, user permissions first.
+
+        Both are loaded in a single query the first time a user's permissions are needed and
+        are reused until the service is invalidated. Models are kept rather than entities,
+        which the session expires, and would reload one by one, whenever a service commits.
 
         Args:
             subject (User): The user to get permissions for.
 
         Returns:
-            list[PermissionEntity]: The permissions for the user's roles."""
-        user_entity = self._session.get(UserEntity, subject.id)
-        if user_entity == None:
-            return []
-        role_ids = [role.id for role in user_entity.roles]
-        if len(role_ids) == 0:
+            list[Permission]: The permissions for the user and the user's roles."""
+        if subject.id is None:
             return []
-        role_query = select(PermissionEntity).where(
-            PermissionEntity.role_id.in_(role_ids)
-        )
-        return [p for p in self._session.execute(role_query).scalars()]
+
+        if subject.id not in self._permissions:
+            query = (
+                select(PermissionEntity)
+                .outerjoin(
+                    user_role_table,
+                    user_role_table.c.role_id == PermissionEntity.role_id,
+                )
+                .where(
+                    or_(
+                        PermissionEntity.user_id == subject.id,
+                        user_role_table.c.user_id == subject.id,
+                    )
+                )
+                .order_by(PermissionEntity.user_id.is_(None), PermissionEntity.id)
+            )
+            self._permissions[subject.id] = [
+                entity.to_model() for entity in self._session.scalars(query)
+            ]
+        return self._permissions[subject.id]
 
     def _has_permission(
-        self, permissions: list[PermissionEntity], action: str, resource: str
+        self, permissions: list[Permission], action: str, resource: str
     ) -> bool:
         """Check if a user has permission to carry out an action on a resource in a list of permissions.
 
         Args:
-            permissions (list[PermissionEntity]): The permissions to check.
+            permissions (list[Permission]): The permissions to check.
             action (str): The action in question.
             resource (str): The resource in question.
 
         Returns:
             bool: True if the user has permission to carry out the action on the resource, False otherwise.
         """
-        for permission in permissions:
-            if self._check_permission(permission, action, resource):
-                return True
-        return False
+        patterns = tuple((p.action, p.resource) for p in permissions)
+        return compile_permissions(patterns).matches(action, resource)
 
     def _check_permission(
-        self, permission: PermissionEntity, action: str, resource: str
+        self, permission: Permission, action: str, resource: str
     ) -> bool:
         """Check if a user has permission to carry out an action on a resource.
 
         Args:
-            permission (PermissionEntity): The permission to check.
+            permission (Permission): The permission to check.
             action (str): The action in question.
             resource (str): The resource in question.
 
         Returns:
             bool: True if the user has permission to carry out the action on the resource, False otherwise.
         """
-        action_re = self._expand_pattern(permission.action)
-        if action_re.fullmatch(action) is not None:
-            resource_re = self._expand_pattern(permission.resource)
-            return resource_re.fullmatch(resource) is not None
-        else:
-            return False
-
-    @lru_cache()
-    def _expand_pattern(self, pattern: str) -> re.Pattern:
-        """Expand a permission pattern into a regular expression.
-
-        This function is memoized to avoid recompiling the same regular expression multiple times.
-
-        Args:
-            pattern (str): The pattern to expand.
-
-        Returns:
-            re.Pattern: The compiled regular expression."""
-        search = pattern.replace("*", ".*")
-        return re.compile(f"^{search}$")
+        return self._has_permission([permission], action, resource)
@@ -0,0 +1,109 @@
+"""
+The Permission Matcher decides whether any of a set of permissions grants an action on a resource.
+
+Permission actions and resources are patterns in which `*` matches anything. Nearly every pattern
+is either a literal, such as `organization/cads`, or a literal prefix followed by a trailing `*`,
+such as `organization.*` or `user/*`. Patterns are therefore indexed by their literal prefix, so
+that matching costs a hash lookup per distinct prefix length rather than a regular expression
+test per permission. Compiled matchers are cached per process, by permission set, so they are
+shared across requests.
+"""
+
+import bisect
+import re
+from functools import lru_cache
+from typing import Generic, Iterable, Iterator, TypeVar
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+WILDCARD = "*"
+
+# Distinct permission sets kept compiled, roughly one per recently active administrator
+MATCHER_CACHE_SIZE = 1024
+
+T = TypeVar("T")
+
+
+class PatternIndex(Generic[T]):
+    """Maps patterns to values, indexed by the literal prefix of each pattern."""
+
+    def __init__(self):
+        # Values of patterns with no wildcard, by pattern
+        self._literals: dict[str, list[T]] = {}
+        # Values of patterns with a wildcard, by the literal prefix before the wildcard, with
+        # the regular expression the rest of a string must match, or None if anything does
+        self._prefixes: dict[str, list[tuple[re.Pattern | None, T]]] = {}
+        # The distinct lengths of the prefixes, in ascending order
+        self._prefix_lengths: list[int] = []
+
+    def add(self, pattern: str, value: T) -> None:
+        """Add a pattern, such that `matches` yields `value` for strings matching it."""
+        prefix, wildcard, suffix = pattern.partition(WILDCARD)
+        if wildcard == "":
+            self._literals.setdefault(pattern, []).append(value)
+            return
+
+        if suffix.strip(WILDCARD) == "":
+            rest = None
+        else:
+            rest = expand_pattern(wildcard + suffix)
+        self._prefixes.setdefault(prefix, []).append((rest, value))
+        if len(prefix) not in self._prefix_lengths:
+            bisect.insort(self._prefix_lengths, len(prefix))
+
+    def matches(self, string: str) -> Iterator[T]:
+        """Yield the values of the patterns `string` matches."""
+        yield from self._literals.get(string, ())
+        for length in self._prefix_lengths:
+            if length > len(string):
+                return
+            for rest, value in self._prefixes.get(string[:length], ()):
+                if rest is None or rest.fullmatch(string, length) is not None:
+                    yield value
+
+
+class PermissionMatcher:
+    """Matches actions and resources against a set of (action, resource) permission patterns."""
+
+    def __init__(self, patterns: Iterable[tuple[str, str]]):
+        """Compile a set of (action, resource) permission patterns."""
+        self._actions: PatternIndex[PatternIndex[None]] = PatternIndex()
+        resources: dict[str, PatternIndex[None]] = {}
+        for action, resource in patterns:
+            if action not in resources:
+                resources[action] = PatternIndex()
+                self._actions.add(action, resources[action])
+            resources[action].add(resource, None)
+
+    def matches(self, action: str, resource: str) -> bool:
+        """Check whether any permission grants `action` on `resource`."""
+        for resources in self._actions.matches(action):
+            for _ in resources.matches(resource):
+                return True
+        return False
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def compile_permissions(patterns: tuple[tuple[str, str], ...]) -> PermissionMatcher:
+    """Get the compiled matcher of a set of (action, resource) permission patterns.
+
+    Args:
+        patterns (tuple[tuple[str, str], ...]): The action and resource pattern of each permission.
+
+    Returns:
+        PermissionMatcher: The matcher, shared by all callers with these patterns."""
+    return PermissionMatcher(patterns)
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def expand_pattern(pattern: str) -> re.Pattern:
+    """Expand a permission pattern into a regular expression matching the same strings.
+
+    Args:
+        pattern (str): The pattern to expand.
+
+    Returns:
+        re.Pattern: The compiled regular expression."""
+    return re.compile(".*".join(re.escape(part) for part in pattern.split(WILDCARD)))
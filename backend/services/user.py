@@ -4,18 +4,48 @@ The User Service provides access to the User model and its associated database o
 """
 
 from fastapi import Depends
-from sqlalchemy import select, or_, func, cast, String
-from sqlalchemy.orm import Session
+from sqlalchemy import select, or_, func, false, union, union_all
+from sqlalchemy.orm import Session, selectinload
 from ..database import db_session
 from ..models import User, UserDetails, Paginated, PaginationParams
 from ..entities import UserEntity
+from ..entities.announcement_entity import AnnouncementEntity
 from .exceptions import ResourceNotFoundException
 from .permission import PermissionService
+from .pagination import order_by_column, paginate
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+# Trigram indexes can only serve patterns of at least three characters
+TRIGRAM_LENGTH = 3
+
+# The number of users returned by a search
+SEARCH_LIMIT = 10
+
+# The number of trigram matches ranked by similarity to find the best matches of a search
+SEARCH_CANDIDATES = 100
+
+# PIDs are stored as PostgreSQL integers
+MAX_PID = 2**31 - 1
+
+# Eagerly loads the relationships `UserEntity.to_model` reads, so that converting a page of
+# users costs one additional query rather than a lazy load per user.
+TO_MODEL_OPTIONS = [
+    selectinload(UserEntity.announcement_favorites).load_only(AnnouncementEntity.id)
+]
+
+# The columns paginated lists of users may be ordered by
+ORDERABLE = {
+    "id": UserEntity.id,
+    "pid": UserEntity.pid,
+    "onyen": UserEntity.onyen,
+    "email": UserEntity.email,
+    "first_name": UserEntity.first_name,
+    "last_name": UserEntity.last_name,
+}
+
 
 class UserService:
     _session: Session
@@ -69,27 +99,174 @@ class UserService:
         return user_entity.to_model()
 
     def search(self, _subject: User, query: str) -> list[User]:
-        """Search for users by their name, onyen, email.
+        """Search for users by their name, onyen, email, or PID.
+
+        The search is designed for typeahead and each kind of query is served by an index:
+
+        * Numeric queries match PIDs beginning with the query.
+        * Queries containing an @ after a username match emails beginning with the query.
+        * Queries shorter than three characters match onyens, first names, and last names
+          beginning with the query. Onyen prefix matches rank first, then by name.
+        * Longer queries match users whose names, onyens, or emails contain each word of
+          the query, via trigram indexes, as well as onyens beginning with the query.
+          Onyen prefix matches rank first, then matches by similarity to the query.
 
         Args:
             subject: The user performing the action.
             query: The search query.
 
         Returns:
-            list[User]: The list of users matching the query.
+            list[User]: The list of users matching the query, best match first.
         """
-        statement = select(UserEntity)
-        criteria = or_(
-            UserEntity.first_name.ilike(f"%{query}%"),
-            UserEntity.last_name.ilike(f"%{query}%"),
-            UserEntity.onyen.ilike(f"%{query}%"),
-            UserEntity.email.ilike(f"%{query}%"),
-            cast(UserEntity.pid, String).ilike(f"%{query}%")
-        )
-        statement = statement.where(criteria).limit(10)
-        entities = self._session.execute(statement).scalars()
+        query = query.strip()
+        if query == "":
+            return []
+
+        # Only ASCII digits are PID digits; str.isdigit also accepts e.g. superscripts
+        if query.isascii() and query.isdigit():
+            statement = self._pid_prefix_statement(query)
+        elif "@" in query[1:]:
+            statement = self._prefix_statement(UserEntity.email, query)
+        elif len(query) < TRIGRAM_LENGTH:
+            statement = self._short_statement(query)
+        else:
+            statement = self._trigram_statement(query)
+
+        entities = self._session.execute(
+            statement.options(*TO_MODEL_OPTIONS).limit(SEARCH_LIMIT)
+        ).scalars()
         return [entity.to_model() for entity in entities]
 
+    def _pid_prefix_statement(self, digits: str):
+        """Selects users whose PID begins with `digits`, ordered by PID.
+
+        Each PID length is its own index range scan, e.g. the prefix 72 is 72, 720-729,
+        7200-7299, and so on. Shorter ranges hold smaller PIDs, so the concatenation of the
+        ranges is in PID order and the scan stops as soon as enough users are found.
+
+        PIDs are integers and have no leading zeros, so digits beginning with 0 match no
+        users."""
+        ranges = []
+        if not digits.startswith("0"):
+            prefix = int(digits)
+            scale = 1
+            while prefix * scale <= MAX_PID:
+                ranges.append(
+                    select(UserEntity.id, UserEntity.pid)
+                    .where(
+                        UserEntity.pid.between(prefix * scale, (prefix + 1) * scale - 1)
+                    )
+                    .order_by(UserEntity.pid)
+                    .limit(SEARCH_LIMIT)
+                )
+                scale *= 10
+        if len(ranges) == 0:
+            return select(UserEntity).where(false())
+
+        matches = union_all(*ranges).subquery("matches")
+        return (
+            select(UserEntity)
+            .join(matches, matches.c.id == UserEntity.id)
+            .order_by(UserEntity.pid)
+        )
+
+    def _prefix_statement(self, column, prefix: str):
+        """Selects users whose `column` begins with `prefix`, ignoring case, in order."""
+        return (
+            select(UserEntity)
+            .where(self._prefix_match(column, prefix))
+            .order_by(self._prefix_key(column))
+        )
+
+    def _short_statement(self, query: str):
+        """Selects users whose onyen, first name, or last name begins with a query too short
+        for trigrams, onyen prefix matches first and then by last and first name.
+
+        Each column's prefix index finds its first matches, and only those are ranked.
+        """
+        candidates = union(
+            *[
+                select(UserEntity.id)
+                .where(self._prefix_match(column, query))
+                .order_by(self._prefix_key(column))
+                .limit(SEARCH_LIMIT)
+                for column in (
+                    UserEntity.onyen,
+                    UserEntity.first_name,
+                    UserEntity.last_name,
+                )
+            ]
+        ).subquery("candidates")
+        return (
+            select(UserEntity)
+            .join(candidates, candidates.c.id == UserEntity.id)
+            .order_by(
+                self._prefix_match(UserEntity.onyen, query).desc(),
+                self._prefix_key(UserEntity.onyen),
+                self._prefix_key(UserEntity.last_name),
+                self._prefix_key(UserEntity.first_name),
+                UserEntity.id,
+            )
+        )
+
+    def _prefix_key(self, column):
+        """The lowercase `column` in the "C" collation, as indexed by its prefix index, so
+        that the index serves both prefix matches and their order, whatever the collation
+        of the database."""
+        return func.lower(column).collate("C")
+
+    def _prefix_match(self, column, prefix: str):
+        """Matches users whose `column` begins with `prefix`, ignoring case."""
+        return self._prefix_key(column).like(f"{self._escape_like(prefix.lower())}%")
+
+    def _trigram_statement(self, query: str):
+        """Selects users matching each word of the query, best match first.
+
+        Only a bounded number of candidates are ranked: the onyens beginning with the query
+        and the first trigram matches found. A short, common query can match a large share
+        of all users, and ranking every one of them would cost far more than finding them;
+        the user narrows the query by typing on instead."""
+        criteria = []
+        for term in query.split():
+            pattern = f"%{self._escape_like(term)}%"
+            # Names do not contain digits, so terms with digits skip the name indexes
+            columns = (
+                [UserEntity.onyen, UserEntity.email]
+                if any(character.isdigit() for character in term)
+                else [
+                    UserEntity.first_name,
+                    UserEntity.last_name,
+                    UserEntity.onyen,
+                    UserEntity.email,
+                ]
+            )
+            criteria.append(or_(*[column.ilike(pattern) for column in columns]))
+
+        onyen_prefix = self._prefix_match(UserEntity.onyen, query)
+        candidates = union(
+            select(UserEntity.id)
+            .where(onyen_prefix)
+            .order_by(self._prefix_key(UserEntity.onyen))
+            .limit(SEARCH_LIMIT),
+            select(UserEntity.id).where(*criteria).limit(SEARCH_CANDIDATES),
+        ).subquery("candidates")
+        similarity = func.greatest(
+            func.word_similarity(
+                query, func.concat_ws(" ", UserEntity.first_name, UserEntity.last_name)
+            ),
+            func.word_similarity(query, UserEntity.onyen),
+            func.word_similarity(query, UserEntity.email),
+        )
+        return (
+            select(UserEntity)
+            .join(candidates, candidates.c.id == UserEntity.id)
+            .order_by(onyen_prefix.desc(), similarity.desc(), UserEntity.id)
+        )
+
+    def _escape_like(self, query: str) -> str:
+        """Escapes the LIKE wildcards of a query so that they match literally."""
+        return query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
     def list(
         self, subject: User, pagination_params: PaginationParams
     ) -> Paginated[User]:
@@ -109,33 +286,28 @@ class UserService:
         """
         self._permission.enforce(subject, "user.list", "user/")
 
-        statement = select(UserEntity)
-        length_statement = select(func.count()).select_from(UserEntity)
+        statement = select(UserEntity).options(*TO_MODEL_OPTIONS)
         if pagination_params.filter != "":
             query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
+            statement = statement.where(
+                or_(
+                    UserEntity.first_name.ilike(f"%{query}%"),
+                    UserEntity.last_name.ilike(f"%{query}%"),
+                    UserEntity.onyen.ilike(f"%{query}%"),
+                )
             )
-            statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
 
-        offset = pagination_params.page * pagination_params.page_size
-        limit = pagination_params.page_size
+        order_by = order_by_column(ORDERABLE, pagination_params.order_by)
+        if order_by is not None:
+            statement = statement.order_by(order_by)
 
-        if pagination_params.order_by != "":
-            statement = statement.order_by(
-                getattr(UserEntity, pagination_params.order_by)
-            )
-
-        statement = statement.offset(offset).limit(limit)
-
-        length = self._session.execute(length_statement).scalar()
-        entities = self._session.execute(statement).scalars()
+        # The total of an unfiltered list of a very large user table may be estimated
+        rows, length = paginate(
+            self._session, statement, pagination_params, estimate=True
+        )
 
         return Paginated(
-            items=[entity.to_model() for entity in entities],
+            items=[entity.to_model() for entity, in rows],
             length=length,
             params=pagination_params,
         )
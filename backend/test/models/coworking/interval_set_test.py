@@ -0,0 +1,124 @@
+"""Unit tests for the IntervalSet availability engine."""
+
+import random
+
+from ....models.coworking import AvailabilityList, TimeRange
+from ....models.coworking.interval_set import (
+    IntervalSet,
+    MICROSECOND,
+    from_epoch,
+    to_epoch,
+)
+from ...services.coworking.time import *
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+def intervals(interval_set: IntervalSet) -> list[tuple[int, int]]:
+    return list(zip(interval_set.starts, interval_set.ends))
+
+
+def test_epoch_round_trip(time: dict[str, datetime]):
+    assert from_epoch(to_epoch(time[NOW])) == time[NOW]
+    assert to_epoch(time[IN_ONE_HOUR]) - to_epoch(time[NOW]) == ONE_HOUR // MICROSECOND
+
+
+def test_union():
+    union = IntervalSet.union([(5, 8), (0, 2), (1, 3), (3, 4), (6, 7), (9, 9)])
+    assert intervals(union) == [(0, 3), (3, 4), (5, 8)]
+
+
+def test_time_ranges_round_trip(time: dict[str, datetime]):
+    time_ranges = [
+        TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+    ]
+    assert IntervalSet.from_time_ranges(time_ranges).to_time_ranges() == time_ranges
+
+
+def test_constrain():
+    interval_set = IntervalSet([0, 10, 20], [5, 15, 25])
+    interval_set.constrain(3, 22)
+    assert intervals(interval_set) == [(3, 5), (10, 15), (20, 22)]
+
+    interval_set.constrain(5, 10)
+    assert intervals(interval_set) == []
+
+
+def test_subtract():
+    interval_set = IntervalSet([0, 10, 20], [5, 15, 25])
+    interval_set.subtract(12, 13)
+    assert intervals(interval_set) == [(0, 5), (10, 12), (13, 15), (20, 25)]
+
+    interval_set.subtract(4, 21)
+    assert intervals(interval_set) == [(0, 4), (21, 25)]
+
+    interval_set.subtract(25, 30)
+    assert intervals(interval_set) == [(0, 4), (21, 25)]
+
+
+def test_subtract_many():
+    interval_set = IntervalSet([0, 10, 20], [5, 15, 25])
+    interval_set.subtract_many([(14, 21), (1, 2), (2, 3), (11, 12), (-5, 0)])
+    assert intervals(interval_set) == [(0, 1), (3, 5), (10, 11), (12, 14), (21, 25)]
+
+
+def test_subtract_many_matches_availability_list(time: dict[str, datetime]):
+    """Subtracting many reservations at once matches subtracting them in turn."""
+    rng = random.Random(423)
+    minute = to_epoch(time[NOW] + ONE_MINUTE) - to_epoch(time[NOW])
+    for _ in range(50):
+        blocks = []
+        for _ in range(rng.randint(0, 20)):
+            start = rng.randint(0, 600)
+            blocks.append((start, start + rng.randint(1, 90)))
+
+        availability_list = AvailabilityList(
+            availability=[
+                TimeRange(start=time[NOW], end=time[NOW] + 240 * ONE_MINUTE),
+                TimeRange(
+                    start=time[NOW] + 300 * ONE_MINUTE,
+                    end=time[NOW] + 540 * ONE_MINUTE,
+                ),
+            ]
+        )
+        interval_set = IntervalSet.from_time_ranges(availability_list.availability)
+        for start, end in blocks:
+            availability_list.subtract(
+                TimeRange(
+                    start=time[NOW] + start * ONE_MINUTE,
+                    end=time[NOW] + end * ONE_MINUTE,
+                )
+            )
+        interval_set.subtract_many(
+            (to_epoch(time[NOW]) + start * minute, to_epoch(time[NOW]) + end * minute)
+            for start, end in blocks
+        )
+        assert interval_set.to_time_ranges() == availability_list.availability
+
+
+def test_filter_shorter_than():
+    interval_set = IntervalSet([0, 10, 20], [5, 12, 30])
+    interval_set.filter_shorter_than(5)
+    assert intervals(interval_set) == [(0, 5), (20, 30)]
+    assert interval_set.total_duration() == 15
+
+
+def test_copy_is_independent():
+    interval_set = IntervalSet([0], [10])
+    copy = interval_set.copy()
+    copy.subtract(0, 5)
+    assert intervals(interval_set) == [(0, 10)]
+    assert intervals(copy) == [(5, 10)]
+
+
+def test_to_time_ranges_shared(time: dict[str, datetime]):
+    shared: dict[tuple[int, int], TimeRange] = {}
+    first = IntervalSet.from_time_ranges(
+        [TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])]
+    )
+    second = first.copy()
+    assert first.to_time_ranges(shared)[0] is second.to_time_ranges(shared)[0]
+    assert len(shared) == 1
@@ -0,0 +1,144 @@
+"""Tests for the AnnouncementCounterBuffer class"""
+
+import pytest
+import time
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from ....services import AnnouncementService, PermissionService
+from ....services.announcement_counter_buffer import AnnouncementCounterBuffer
+from ....services.exceptions import ResourceNotFoundException
+from ..user_data import user
+from .announcement_test_data import announcements
+
+from ..fixtures import announcement_svc_integration
+
+from ..core_data import setup_insert_data_fixture
+
+__authors__ = ["agent"]
+
+
+@pytest.fixture()
+def counter_buffer(test_engine: Engine):
+    """A buffer that only flushes when explicitly asked to."""
+    buffer = AnnouncementCounterBuffer(
+        flush_interval=3600, flush_threshold=1000, engine=test_engine
+    )
+    yield buffer
+    buffer.close()
+
+
+@pytest.fixture()
+def announcement_svc_buffered(
+    session: Session, counter_buffer: AnnouncementCounterBuffer
+):
+    return AnnouncementService(session, PermissionService(session), counter_buffer)
+
+
+def test_buffered_views_are_coalesced(
+    announcement_svc_buffered: AnnouncementService,
+    announcement_svc_integration: AnnouncementService,
+    counter_buffer: AnnouncementCounterBuffer,
+):
+    announcement = announcements[0]
+    for i in range(1, 4):
+        updated = announcement_svc_buffered.update_views(user, announcement.slug)
+        assert updated.view_count == announcement.view_count + i
+    announcement_svc_buffered.update_shares(user, announcement.slug)
+
+    assert counter_buffer.pending(announcement.slug, "view_count") == 3
+    assert counter_buffer.pending(announcement.slug, "share_count") == 1
+    stored = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert stored.view_count == announcement.view_count
+
+    counter_buffer.flush()
+
+    assert counter_buffer.pending(announcement.slug, "view_count") == 0
+    stored = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert stored.view_count == announcement.view_count + 3
+    assert stored.share_count == announcement.share_count + 1
+
+
+def test_buffered_views_multiple_announcements(
+    announcement_svc_buffered: AnnouncementService,
+    announcement_svc_integration: AnnouncementService,
+    counter_buffer: AnnouncementCounterBuffer,
+):
+    announcement_svc_buffered.update_views(user, announcements[0].slug)
+    announcement_svc_buffered.update_views(user, announcements[1].slug)
+    announcement_svc_buffered.update_views(user, announcements[1].slug)
+    counter_buffer.flush()
+
+    first = announcement_svc_integration.get_by_slug(announcements[0].slug)
+    second = announcement_svc_integration.get_by_slug(announcements[1].slug)
+    assert first.view_count == announcements[0].view_count + 1
+    assert second.view_count == announcements[1].view_count + 2
+
+
+def test_buffered_views_not_found(
+    announcement_svc_buffered: AnnouncementService,
+    counter_buffer: AnnouncementCounterBuffer,
+):
+    with pytest.raises(ResourceNotFoundException):
+        announcement_svc_buffered.update_views(user, "notarealslugever!")
+        pytest.fail()
+    assert counter_buffer.pending("notarealslugever!", "view_count") == 0
+
+
+def test_buffered_views_flushed_on_close(
+    announcement_svc_buffered: AnnouncementService,
+    announcement_svc_integration: AnnouncementService,
+    counter_buffer: AnnouncementCounterBuffer,
+):
+    announcement = announcements[0]
+    announcement_svc_buffered.update_views(user, announcement.slug)
+    counter_buffer.close()
+
+    stored = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert stored.view_count == announcement.view_count + 1
+
+
+def test_views_after_close_are_written_through(
+    announcement_svc_buffered: AnnouncementService,
+    announcement_svc_integration: AnnouncementService,
+    counter_buffer: AnnouncementCounterBuffer,
+):
+    """Increments recorded while shutting down are not left in a closed buffer."""
+    announcement = announcements[0]
+    counter_buffer.close()
+    viewed = announcement_svc_buffered.update_views(user, announcement.slug)
+    assert viewed.view_count == announcement.view_count + 1
+    assert counter_buffer.pending(announcement.slug, "view_count") == 0
+
+    stored = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert stored.view_count == announcement.view_count + 1
+
+
+def test_buffered_views_flushed_at_threshold(
+    test_engine: Engine,
+    session: Session,
+    announcement_svc_integration: AnnouncementService,
+):
+    announcement = announcements[0]
+    buffer = AnnouncementCounterBuffer(
+        flush_interval=3600, flush_threshold=3, engine=test_engine
+    )
+    announcement_svc = AnnouncementService(session, PermissionService(session), buffer)
+    for _ in range(3):
+        announcement_svc.update_views(user, announcement.slug)
+
+    # The background flusher is woken up once the threshold is reached
+    deadline = time.monotonic() + 5
+    while buffer.pending(announcement.slug, "view_count") > 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    buffer.close()
+
+    stored = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert stored.view_count == announcement.view_count + 3
+
+
+def test_buffer_rejects_unknown_counter(counter_buffer: AnnouncementCounterBuffer):
+    with pytest.raises(ValueError):
+        counter_buffer.add(announcements[0].slug, "upvote_count")
+        pytest.fail()
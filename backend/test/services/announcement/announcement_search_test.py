@@ -0,0 +1,118 @@
+"""Tests for full-text search of announcements"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from ....entities.announcement_entity import AnnouncementEntity
+from ....models.announcement import Announcement, AnnouncementStatus
+from ....models.pagination import PaginationParams
+from ....services import AnnouncementService
+from .announcement_test_data import announcement_1, announcement_2
+
+from ..fixtures import announcement_svc_integration
+from ..query_counter import count_queries
+
+from ..core_data import setup_insert_data_fixture
+
+__authors__ = ["agent"]
+
+
+def test_search_headline(announcement_svc_integration: AnnouncementService):
+    page = announcement_svc_integration.search(PaginationParams(filter="CSSG"))
+    # The draft with the same text is not searchable
+    assert [result.slug for result in page.items] == [announcement_2.slug]
+    assert page.length == 1
+    assert page.items[0].rank > 0
+    assert page.items[0].headline == announcement_2.headline
+
+
+def test_search_ranks_headline_matches_first(
+    announcement_svc_integration: AnnouncementService,
+):
+    # "apply" is in the headline of the first announcement but only the body of the second
+    page = announcement_svc_integration.search(PaginationParams(filter="applying"))
+    assert [result.slug for result in page.items] == [
+        announcement_1.slug,
+        announcement_2.slug,
+    ]
+    assert page.items[0].rank > page.items[1].rank
+
+
+def test_search_web_syntax(announcement_svc_integration: AnnouncementService):
+    page = announcement_svc_integration.search(
+        PaginationParams(filter='"project teams" -carolina')
+    )
+    assert [result.slug for result in page.items] == [announcement_2.slug]
+
+    page = announcement_svc_integration.search(
+        PaginationParams(filter="website or cssg")
+    )
+    assert page.length == 2
+
+
+def test_search_no_matches(announcement_svc_integration: AnnouncementService):
+    page = announcement_svc_integration.search(PaginationParams(filter="zebra"))
+    assert page.items == []
+    assert page.length == 0
+
+
+def test_search_empty_query(announcement_svc_integration: AnnouncementService):
+    page = announcement_svc_integration.search(PaginationParams(filter="  "))
+    assert page.items == []
+    assert page.length == 0
+
+
+def test_search_paginated(announcement_svc_integration: AnnouncementService):
+    first = announcement_svc_integration.search(
+        PaginationParams(filter="apply", page=0, page_size=1)
+    )
+    second = announcement_svc_integration.search(
+        PaginationParams(filter="apply", page=1, page_size=1)
+    )
+    assert first.length == 2
+    assert second.length == 2
+    assert [result.slug for result in first.items + second.items] == [
+        announcement_1.slug,
+        announcement_2.slug,
+    ]
+
+
+def test_search_snippet_highlights_matches(
+    announcement_svc_integration: AnnouncementService,
+):
+    page = announcement_svc_integration.search(PaginationParams(filter="website"))
+    assert "<mark>website</mark>" in page.items[0].snippet
+
+
+def test_search_snippet_is_escaped(
+    announcement_svc_integration: AnnouncementService, session: Session
+):
+    announcement = Announcement(
+        headline="Markup",
+        syn="",
+        body="Hackathon teams of 2 < 5 & <img src=x onerror=alert(1)",
+        author_id=1,
+        slug="markup",
+        status=AnnouncementStatus.PUBLISHED,
+    )
+    session.add(AnnouncementEntity.from_model(announcement))
+    session.commit()
+
+    page = announcement_svc_integration.search(PaginationParams(filter="hackathon"))
+    snippet = page.items[0].snippet
+    assert "<img" not in snippet
+    assert "&lt;img" in snippet
+    assert "2 &lt; 5 &amp;" in snippet
+    assert "<mark>Hackathon</mark>" in snippet
+
+
+def test_search_query_count(
+    announcement_svc_integration: AnnouncementService, session: Session
+):
+    session.expunge_all()
+    with count_queries(session) as queries:
+        page = announcement_svc_integration.search(PaginationParams(filter="apply"))
+        for result in page.items:
+            assert result.author is not None
+    # One count and one page query, with authors and organizations joined in
+    assert queries.count == 2
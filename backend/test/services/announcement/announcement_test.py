@@ -1,7 +1,10 @@
 """Tests for the AnnouncementService class"""
 
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import create_autospec
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
 
 from backend.services.exceptions import (
     UserPermissionException,
@@ -11,7 +14,10 @@ from backend.services.exceptions import (
 from ....models.announcement import Announcement, AnnouncementStatus
 from ....models.announcement_details import AnnouncementDetails
 from ....models.announcement_comment import Comment
-from ....services import AnnouncementService
+from ....models.pagination import AnnouncementPaginationParams
+from ....services import AnnouncementService, PermissionService
+from ....services.announcement import VIEWER_STATES_LIMIT
+from ....services.announcement_counter_buffer import AnnouncementCounterBuffer
 from ..user_data import root, user
 from .announcement_test_data import (
     announcements,
@@ -20,6 +26,7 @@ from .announcement_test_data import (
 )
 
 from ..fixtures import announcement_svc_integration
+from ..query_counter import count_queries
 
 from ..core_data import setup_insert_data_fixture
 
@@ -46,6 +53,170 @@ def test_get_all_admin(announcement_svc_integration: AnnouncementService):
     assert announcements[5] not in admin_announcements
 
 
+def test_get_paginated_announcements(
+    announcement_svc_integration: AnnouncementService,
+):
+    params = AnnouncementPaginationParams(page_size=1)
+    first_page = announcement_svc_integration.get_paginated_announcements(params)
+    assert len(first_page.items) == 1
+    assert first_page.length == len(published_announcements)
+    assert first_page.params.cursor != ""
+
+    second_page = announcement_svc_integration.get_paginated_announcements(
+        first_page.params
+    )
+    assert len(second_page.items) == 1
+    assert second_page.items[0].id != first_page.items[0].id
+    assert first_page.items[0].published_date > second_page.items[0].published_date
+
+    last_page = announcement_svc_integration.get_paginated_announcements(
+        second_page.params
+    )
+    assert len(last_page.items) == 0
+    assert last_page.params.cursor == ""
+
+
+def test_get_paginated_announcements_ascending(
+    announcement_svc_integration: AnnouncementService,
+):
+    descending = announcement_svc_integration.get_paginated_announcements(
+        AnnouncementPaginationParams()
+    )
+    ascending = announcement_svc_integration.get_paginated_announcements(
+        AnnouncementPaginationParams(ascending=True)
+    )
+    assert [announcement.id for announcement in ascending.items] == list(
+        reversed([announcement.id for announcement in descending.items])
+    )
+
+
+def test_get_paginated_announcements_filtered(
+    announcement_svc_integration: AnnouncementService,
+):
+    params = AnnouncementPaginationParams(organization_id=1)
+    page = announcement_svc_integration.get_paginated_announcements(params)
+    assert page.length == 1
+    assert page.items[0].slug == announcements[0].slug
+
+    params = AnnouncementPaginationParams(author_id=1)
+    page = announcement_svc_integration.get_paginated_announcements(params)
+    assert page.length == 1
+    assert page.items[0].slug == announcements[1].slug
+
+
+def test_get_paginated_announcements_admin(
+    announcement_svc_integration: AnnouncementService,
+):
+    ids = []
+    params = AnnouncementPaginationParams(page_size=2)
+    while True:
+        page = announcement_svc_integration.get_paginated_announcements(params, root)
+        assert page.length == len(admin_announcements)
+        ids.extend(announcement.id for announcement in page.items)
+        if page.params.cursor == "":
+            break
+        params = page.params
+    assert sorted(ids) == sorted(
+        announcement.id for announcement in admin_announcements
+    )
+
+    ascending_ids = []
+    params = AnnouncementPaginationParams(page_size=2, ascending=True)
+    while True:
+        page = announcement_svc_integration.get_paginated_announcements(params, root)
+        ascending_ids.extend(announcement.id for announcement in page.items)
+        if page.params.cursor == "":
+            break
+        params = page.params
+    assert ascending_ids == list(reversed(ids))
+
+
+def test_get_paginated_announcements_admin_status(
+    announcement_svc_integration: AnnouncementService,
+):
+    params = AnnouncementPaginationParams(status=AnnouncementStatus.DRAFT)
+    page = announcement_svc_integration.get_paginated_announcements(params, root)
+    assert sorted(announcement.id for announcement in page.items) == [3, 4]
+
+
+def test_get_paginated_announcements_admin_as_user(
+    announcement_svc_integration: AnnouncementService,
+):
+    with pytest.raises(UserPermissionException):
+        announcement_svc_integration.get_paginated_announcements(
+            AnnouncementPaginationParams(), user
+        )
+        pytest.fail()
+
+
+def test_get_paginated_announcements_invalid_params(
+    announcement_svc_integration: AnnouncementService,
+):
+    with pytest.raises(ResourceNotFoundException):
+        announcement_svc_integration.get_paginated_announcements(
+            AnnouncementPaginationParams(cursor="notarealcursor!")
+        )
+        pytest.fail()
+    with pytest.raises(ResourceNotFoundException):
+        announcement_svc_integration.get_paginated_announcements(
+            AnnouncementPaginationParams(order_by="headline")
+        )
+        pytest.fail()
+    with pytest.raises(ResourceNotFoundException):
+        announcement_svc_integration.get_paginated_announcements(
+            AnnouncementPaginationParams(status="notarealstatus")
+        )
+        pytest.fail()
+
+
+def test_get_all_published_query_count(
+    session: Session, announcement_svc_integration: AnnouncementService
+):
+    session.expunge_all()
+    with count_queries(session) as queries:
+        published = announcement_svc_integration.all_published()
+        assert all(announcement.author is not None for announcement in published)
+    assert queries.count == 1
+
+
+def test_get_all_admin_query_count(
+    session: Session, announcement_svc_integration: AnnouncementService
+):
+    session.expunge_all()
+    with count_queries(session) as queries:
+        announcement_svc_integration.all_admin(root)
+    # One query for the subject's permissions and one for the announcements
+    assert queries.count == 2
+
+
+def test_get_paginated_announcements_query_count(
+    session: Session, announcement_svc_integration: AnnouncementService
+):
+    session.expunge_all()
+    with count_queries(session) as queries:
+        announcement_svc_integration.get_paginated_announcements(
+            AnnouncementPaginationParams()
+        )
+    # One statement for the length of the feed and one for the page itself
+    assert queries.count == 2
+
+
+def test_get_by_slug_query_count(
+    session: Session, announcement_svc_integration: AnnouncementService
+):
+    announcement = announcements[0]
+    for i, author in enumerate([root, user]):
+        comment = Comment(id=i, text="Comment", author_id=author.id)
+        announcement_svc_integration.create_comment(author, announcement.slug, comment)
+
+    session.expunge_all()
+    with count_queries(session) as queries:
+        details = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert len(details.comments) == 2
+    # One statement for the announcement and one for its comments and their authors
+    assert queries.count == 2
+
+
 def test_get_by_slug_published(announcement_svc_integration: AnnouncementService):
     announcement = announcement_svc_integration.get_by_slug(announcements[0].slug)
     assert announcement is not None
@@ -288,6 +459,67 @@ def test_increment_announcement_shares(
         pytest.fail()
 
 
+def test_increment_announcement_counters_concurrently(
+    test_engine: Engine, announcement_svc_integration: AnnouncementService
+):
+    announcement = announcements[0]
+    threads, increments_per_thread = 8, 25
+    increments = threads * increments_per_thread
+
+    def increment(_):
+        with Session(test_engine) as session:
+            announcement_svc = AnnouncementService(
+                session,
+                PermissionService(session),
+                AnnouncementCounterBuffer(sync=True),
+            )
+            for _ in range(increments_per_thread):
+                announcement_svc.update_views(user, announcement.slug)
+                announcement_svc.update_shares(user, announcement.slug)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(increment, range(threads)))
+
+    updated = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert updated.view_count == announcement.view_count + increments
+    assert updated.share_count == announcement.share_count + increments
+
+
+def test_increment_announcement_upvotes_concurrently(
+    test_engine: Engine, announcement_svc_integration: AnnouncementService
+):
+    announcement = announcements[0]
+    threads = 8
+
+    def upvote(_):
+        with Session(test_engine) as session:
+            announcement_svc = AnnouncementService(
+                session,
+                PermissionService(session),
+                AnnouncementCounterBuffer(sync=True),
+            )
+            announcement_svc.add_upvote(user, announcement.slug)
+            announcement_svc.add_upvote(root, announcement.slug)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(upvote, range(threads)))
+
+    updated = announcement_svc_integration.get_by_slug(announcement.slug)
+    assert updated.upvote_count == announcement.upvote_count + 2
+
+
+def test_increment_announcement_views_query_count(
+    session: Session, announcement_svc_integration: AnnouncementService
+):
+    session.expunge_all()
+    with count_queries(session) as queries:
+        updated = announcement_svc_integration.update_views(user, announcements[0].slug)
+    assert updated.author is not None
+    assert updated.organization_slug is not None
+    # A single UPDATE ... RETURNING statement that also loads the author and organization
+    assert queries.count == 1
+
+
 def test_add_announcement_favorite(
     announcement_svc_integration: AnnouncementService,
 ):
@@ -435,6 +667,58 @@ def test_check_announcement_upvotes(
         pytest.fail()
 
 
+def test_get_viewer_states(
+    announcement_svc_integration: AnnouncementService, session: Session
+):
+    announcement_svc_integration.add_upvote(user, announcements[0].slug)
+    announcement_svc_integration.add_favorite(user, announcements[1].slug)
+    slugs = [
+        announcements[1].slug,
+        "notarealslugever!",
+        announcements[0].slug,
+        announcements[2].slug,
+    ]
+
+    session.expunge_all()
+    with count_queries(session) as queries:
+        states = announcement_svc_integration.get_viewer_states(user, slugs)
+    assert queries.count == 1
+
+    assert [state.slug for state in states] == [
+        announcements[1].slug,
+        announcements[0].slug,
+        announcements[2].slug,
+    ]
+    assert (states[0].upvoted, states[0].favorited) == (False, True)
+    assert (states[1].upvoted, states[1].favorited) == (True, False)
+    assert (states[2].upvoted, states[2].favorited) == (False, False)
+
+
+def test_get_viewer_states_other_user(
+    announcement_svc_integration: AnnouncementService,
+):
+    announcement_svc_integration.add_upvote(user, announcements[0].slug)
+    announcement_svc_integration.add_favorite(user, announcements[0].slug)
+    state = announcement_svc_integration.get_viewer_states(
+        root, [announcements[0].slug]
+    )[0]
+    assert state.upvoted == False
+    assert state.favorited == False
+
+
+def test_get_viewer_states_empty(announcement_svc_integration: AnnouncementService):
+    assert announcement_svc_integration.get_viewer_states(user, []) == []
+
+
+def test_get_viewer_states_limit(announcement_svc_integration: AnnouncementService):
+    slugs = [announcements[0].slug] * VIEWER_STATES_LIMIT
+    assert len(announcement_svc_integration.get_viewer_states(user, slugs)) == len(
+        slugs
+    )
+    with pytest.raises(ValueError):
+        announcement_svc_integration.get_viewer_states(user, slugs + ["one-too-many"])
+
+
 def test_update_announcement(
     announcement_svc_integration: AnnouncementService,
 ):
@@ -0,0 +1,176 @@
+"""Tests for the AvailabilityBroadcaster of live availability deltas and the stream serving them."""
+
+import asyncio
+import threading
+from datetime import timedelta
+
+from fastapi import FastAPI
+
+from ....api.authentication import _generate_token, generate_scoped_token
+from ....api.coworking import availability
+from ....models.coworking import AvailabilityDelta, ReservationState
+from ....services.coworking.availability_events import AvailabilityBroadcaster
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+def reservation_delta(reservation_id: int) -> AvailabilityDelta:
+    return AvailabilityDelta(
+        kind="reservation",
+        reservation_id=reservation_id,
+        state=ReservationState.CONFIRMED,
+        seat_ids=[1],
+    )
+
+
+def test_publish_versions_deltas():
+    broadcaster = AvailabilityBroadcaster()
+    assert broadcaster.publish(reservation_delta(1)).version == 1
+    assert broadcaster.publish(reservation_delta(2)).version == 2
+    assert broadcaster.version == 2
+
+
+def test_publish_from_thread_to_subscribers():
+    broadcaster = AvailabilityBroadcaster()
+
+    async def subscribe() -> list[list[AvailabilityDelta]]:
+        async with broadcaster.subscribe() as first, broadcaster.subscribe() as second:
+            assert broadcaster.subscriber_count() == 2
+            publisher = threading.Thread(
+                target=lambda: [
+                    broadcaster.publish(reservation_delta(i)) for i in (1, 2)
+                ]
+            )
+            publisher.start()
+            received = [
+                [await first.get(), await first.get()],
+                [await second.get(), await second.get()],
+            ]
+            publisher.join()
+            return received
+
+    for deltas in asyncio.run(subscribe()):
+        assert [delta.reservation_id for delta in deltas] == [1, 2]
+        assert [delta.version for delta in deltas] == [1, 2]
+    assert broadcaster.subscriber_count() == 0
+
+
+def test_subscriber_falling_behind_is_reset():
+    broadcaster = AvailabilityBroadcaster(log_size=2)
+
+    async def subscribe() -> list[AvailabilityDelta]:
+        async with broadcaster.subscribe() as subscription:
+            for i in range(3):
+                broadcaster.publish(reservation_delta(i))
+            await asyncio.sleep(0)  # Let the deltas be delivered
+            received = [await subscription.get()]
+            broadcaster.publish(reservation_delta(3))
+            received.append(await subscription.get())
+            return received
+
+    reset, latest = asyncio.run(subscribe())
+    assert reset.kind == "reset"
+    assert reset.version == 3
+    assert latest.reservation_id == 3
+
+
+def test_idle_subscriber_kept_alive():
+    broadcaster = AvailabilityBroadcaster(keepalive=0.01)
+
+    async def subscribe() -> AvailabilityDelta | None:
+        async with broadcaster.subscribe() as subscription:
+            return await subscription.get()
+
+    assert asyncio.run(subscribe()) is None
+
+
+def test_cancelled_subscriber_leaves_others_waiting():
+    broadcaster = AvailabilityBroadcaster()
+
+    async def subscribe() -> AvailabilityDelta | None:
+        async with broadcaster.subscribe() as first, broadcaster.subscribe() as second:
+            cancelled = asyncio.create_task(first.get())
+            waiting = asyncio.create_task(second.get())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            broadcaster.publish(reservation_delta(1))
+            return await waiting
+
+    assert asyncio.run(subscribe()).reservation_id == 1
+
+
+def test_publish_without_subscribers():
+    broadcaster = AvailabilityBroadcaster()
+    broadcaster.publish(reservation_delta(1))
+    assert broadcaster.subscriber_count() == 0
+
+
+async def open_stream(query_string: str) -> tuple[int, str]:
+    """Opens the availability stream API and returns its status and first chunk of body."""
+    app = FastAPI()
+    app.include_router(availability.api)
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/coworking/availability/stream",
+        "raw_path": b"/api/coworking/availability/stream",
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    status: int | None = None
+    opened = asyncio.Event()
+    body: list[bytes] = []
+
+    async def receive() -> dict:
+        await asyncio.Event().wait()  # The client never disconnects
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            body.append(message["body"])
+            opened.set()
+
+    serving = asyncio.create_task(app(scope, receive, send))
+    await asyncio.wait_for(opened.wait(), timeout=5)
+    serving.cancel()
+    return status, body[0].decode()
+
+
+def test_stream_opened_with_stream_token():
+    token = generate_scoped_token(
+        100_000_000,
+        availability.STREAM_TOKEN_SCOPE,
+        availability.STREAM_TOKEN_LIFETIME,
+    )
+    status, body = asyncio.run(open_stream(f"token={token}"))
+    assert status == 200
+    assert body == "retry: 5000\n\n"
+
+
+def test_stream_token_issued_for_subject():
+    token = availability.create_stream_token((100_000_000, "test"))
+    assert availability.stream_subject_pid(token) == 100_000_000
+
+
+def test_stream_rejects_other_tokens():
+    expired = generate_scoped_token(
+        100_000_000, availability.STREAM_TOKEN_SCOPE, timedelta(seconds=-1)
+    )
+    other_scope = generate_scoped_token(100_000_000, "other")
+    bearer = _generate_token("test", 100_000_000)
+    for token in (expired, other_scope, bearer):
+        status, _body = asyncio.run(open_stream(f"token={token}"))
+        assert status == 401
+    status, _body = asyncio.run(open_stream(""))
+    assert status == 422
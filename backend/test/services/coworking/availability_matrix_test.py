@@ -0,0 +1,93 @@
+"""Unit tests for the AvailabilityMatrix of seats."""
+
+import random
+
+from ....models.coworking.interval_set import IntervalSet
+from ....services.coworking.availability_matrix import AvailabilityMatrix
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+def intervals(interval_set: IntervalSet) -> list[tuple[int, int]]:
+    return list(zip(interval_set.starts, interval_set.ends))
+
+
+def test_availability_less_reservations():
+    matrix = AvailabilityMatrix(
+        IntervalSet([0], [100]), [(1, 10, 20), (1, 20, 30), (2, 90, 200)]
+    )
+    availability, first_start, first_duration = matrix.availability(1, 0)
+    assert intervals(availability) == [(0, 10), (30, 100)]
+    assert (first_start, first_duration) == (0, 10)
+    assert intervals(matrix.availability(2, 0)[0]) == [(0, 90)]
+
+
+def test_availability_shared_by_unreserved_seats():
+    matrix = AvailabilityMatrix(IntervalSet([0], [100]), [(1, 10, 20)])
+    assert intervals(matrix.availability(2, 0)[0]) == [(0, 100)]
+    assert matrix.availability(2, 0)[0] is matrix.availability(3, 0)[0]
+
+
+def test_availability_threshold():
+    matrix = AvailabilityMatrix(IntervalSet([0], [100]), [(1, 10, 30)])
+    availability, first_start, first_duration = matrix.availability(1, 15)
+    assert intervals(availability) == [(30, 100)]
+    assert (first_start, first_duration) == (30, 70)
+    assert intervals(matrix.availability(1, 0)[0]) == [(0, 10), (30, 100)]
+
+
+def test_availability_while_closed():
+    matrix = AvailabilityMatrix(IntervalSet([0, 20], [10, 30]), [(1, 5, 25)])
+    assert intervals(matrix.availability(1, 0)[0]) == [(0, 5), (25, 30)]
+    assert intervals(matrix.availability(2, 0)[0]) == [(0, 10), (20, 30)]
+
+
+def test_availability_back_to_back_hours():
+    """Back-to-back operating hours are separate intervals, as in an `IntervalSet`."""
+    matrix = AvailabilityMatrix(IntervalSet([0, 40], [40, 100]), [(1, 20, 30)])
+    availability, first_start, first_duration = matrix.availability(2, 0)
+    assert intervals(availability) == [(0, 40), (40, 100)]
+    assert (first_start, first_duration) == (0, 40)
+    assert intervals(matrix.availability(1, 0)[0]) == [(0, 20), (30, 40), (40, 100)]
+    assert intervals(matrix.availability(1, 50)[0]) == [(40, 100)]
+
+
+def test_availability_never_open():
+    matrix = AvailabilityMatrix(IntervalSet(), [(1, 5, 25)])
+    availability, first_start, first_duration = matrix.availability(1, 0)
+    assert len(availability) == 0
+    assert (first_start, first_duration) == (0, 0)
+
+
+def test_availability_matches_interval_sets():
+    """The matrix agrees with subtracting each seat's reservations from its own intervals."""
+    rng = random.Random(423)
+    for _ in range(50):
+        # Operating hours with a break between them, or back-to-back
+        open_intervals = rng.choice(
+            [IntervalSet([0, 300], [240, 540]), IntervalSet([0, 240], [240, 540])]
+        )
+        reservations = []
+        for _ in range(rng.randint(0, 40)):
+            start = rng.randint(-30, 600)
+            reservations.append((rng.randint(0, 5), start, start + rng.randint(1, 90)))
+        threshold = rng.randint(0, 60)
+
+        matrix = AvailabilityMatrix(open_intervals, reservations)
+        for seat_id in range(6):
+            expected = open_intervals.copy()
+            expected.subtract_many(
+                (start, end)
+                for reserved_id, start, end in reservations
+                if reserved_id == seat_id
+            )
+            expected.filter_shorter_than(threshold)
+            availability, first_start, first_duration = matrix.availability(
+                seat_id, threshold
+            )
+            assert intervals(availability) == intervals(expected)
+            if len(expected) > 0:
+                assert first_start == expected.starts[0]
+                assert first_duration == expected.ends[0] - expected.starts[0]
@@ -13,7 +13,10 @@ from ....services.coworking import (
     ReservationService,
     PolicyService,
     StatusService,
+    RoomQuotaService,
 )
+from ....services.coworking.operating_hours_index import OperatingHoursIndex
+from ....services.coworking.status_snapshot import StatusSnapshotCache
 
 __authors__ = [
     "Kris Jordan",
@@ -35,7 +38,7 @@ def permission_svc(session: Session):
 @pytest.fixture()
 def operating_hours_svc(session: Session, permission_svc: PermissionService):
     """OperatingHoursService fixture."""
-    return OperatingHoursService(session, permission_svc)
+    return OperatingHoursService(session, permission_svc, OperatingHoursIndex())
 
 
 @pytest.fixture()
@@ -56,6 +59,12 @@ def policy_svc():
     return PolicyService()
 
 
+@pytest.fixture()
+def room_quota_svc(session: Session, policy_svc: PolicyService):
+    """RoomQuotaService fixture."""
+    return RoomQuotaService(session, policy_svc)
+
+
 @pytest.fixture()
 def reservation_svc(
     session: Session,
@@ -63,10 +72,16 @@ def reservation_svc(
     permission_svc: PermissionService,
     operating_hours_svc: OperatingHoursService,
     seat_svc: SeatService,
+    room_quota_svc: RoomQuotaService,
 ):
     """ReservationService fixture."""
     return ReservationService(
-        session, permission_svc, policy_svc, operating_hours_svc, seat_svc
+        session,
+        permission_svc,
+        policy_svc,
+        operating_hours_svc,
+        seat_svc,
+        room_quota_svc,
     )
 
 
@@ -77,5 +92,9 @@ def status_svc():
     seat_mock = create_autospec(SeatService)
     reservation_mock = create_autospec(ReservationService)
     return StatusService(
-        policies_mock, operating_hours_mock, seat_mock, reservation_mock
+        policies_mock,
+        operating_hours_mock,
+        seat_mock,
+        reservation_mock,
+        StatusSnapshotCache(),
     )
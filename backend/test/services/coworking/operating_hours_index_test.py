@@ -0,0 +1,152 @@
+"""Tests for the OperatingHoursIndex of operating hours in memory."""
+
+from datetime import datetime, timedelta
+
+from ....models.coworking import OperatingHours, TimeRange
+from ....services.coworking.operating_hours_index import OperatingHoursIndex
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+NOW = datetime(2024, 3, 4, 12, 0)
+ONE_HOUR = timedelta(hours=1)
+ONE_DAY = timedelta(days=1)
+
+# Weekday hours of the week of NOW, with a late night that closes after midnight
+HOURS = [
+    OperatingHours(
+        id=day,
+        start=NOW + day * ONE_DAY - timedelta(hours=2),
+        end=NOW + day * ONE_DAY + timedelta(hours=6),
+    )
+    for day in range(5)
+] + [
+    OperatingHours(
+        id=5,
+        start=NOW + 4 * ONE_DAY + timedelta(hours=10),
+        end=NOW + 5 * ONE_DAY - timedelta(hours=9),
+    )
+]
+
+
+class Loader:
+    """Loads the hours overlapping a time range, as the database would, counting loads."""
+
+    def __init__(self, hours: list[OperatingHours]):
+        self.hours = hours
+        self.loads: list[TimeRange] = []
+
+    def __call__(self, time_range: TimeRange) -> list[OperatingHours]:
+        self.loads.append(time_range)
+        return sorted(
+            (
+                each
+                for each in self.hours
+                if each.start <= time_range.end and each.end >= time_range.start
+            ),
+            key=lambda each: each.start,
+        )
+
+
+def ids(hours: list[OperatingHours]) -> list[int | None]:
+    return [each.id for each in hours]
+
+
+def test_schedule_overlapping():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    time_range = TimeRange(start=NOW + ONE_DAY, end=NOW + 2 * ONE_DAY)
+    assert ids(index.schedule(time_range, loader, NOW)) == [1, 2]
+
+
+def test_schedule_includes_touching_hours():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    time_range = TimeRange(start=HOURS[1].end, end=HOURS[2].start)
+    assert ids(index.schedule(time_range, loader, NOW)) == [1, 2]
+
+
+def test_schedule_closed():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    time_range = TimeRange(
+        start=HOURS[0].end + timedelta(hours=1), end=HOURS[1].start - timedelta(hours=1)
+    )
+    assert index.schedule(time_range, loader, NOW) == []
+
+
+def test_schedule_within_overlapping_hours():
+    """Hours containing a time range are found even when later hours end before them."""
+    hours = [
+        OperatingHours(id=1, start=NOW, end=NOW + timedelta(hours=8)),
+        OperatingHours(
+            id=2, start=NOW + timedelta(hours=1), end=NOW + timedelta(hours=2)
+        ),
+    ]
+    index = OperatingHoursIndex()
+    time_range = TimeRange(start=NOW + timedelta(hours=4), end=NOW + timedelta(hours=5))
+    assert ids(index.schedule(time_range, Loader(hours), NOW)) == [1]
+
+
+def test_schedule_within_window_is_not_loaded_again():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    index.schedule(TimeRange(start=NOW, end=NOW + ONE_DAY), loader, NOW)
+    index.schedule(TimeRange(start=NOW + ONE_DAY, end=NOW + 2 * ONE_DAY), loader, NOW)
+    assert len(loader.loads) == 1
+
+
+def test_schedule_outside_window_extends_it():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    index.preload(TimeRange(start=NOW, end=NOW + ONE_DAY), loader, NOW)
+    earlier = TimeRange(start=NOW - 7 * ONE_DAY, end=NOW - 6 * ONE_DAY)
+    assert index.schedule(earlier, loader, NOW) == []
+    assert loader.loads[-1].start == earlier.start
+    assert loader.loads[-1].end == NOW + ONE_DAY
+    assert ids(
+        index.schedule(TimeRange(start=NOW, end=NOW + ONE_HOUR), loader, NOW)
+    ) == [0]
+    assert len(loader.loads) == 2
+
+
+def test_invalidate_loads_again():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS[:1])
+    time_range = TimeRange(start=NOW + ONE_DAY, end=NOW + 2 * ONE_DAY)
+    assert index.schedule(time_range, loader, NOW) == []
+    loader.hours = HOURS
+    index.invalidate()
+    assert ids(index.schedule(time_range, loader, NOW)) == [1, 2]
+
+
+def test_interval_elapsed_loads_again():
+    index = OperatingHoursIndex(interval=timedelta(minutes=5))
+    loader = Loader(HOURS)
+    time_range = TimeRange(start=NOW, end=NOW + ONE_DAY)
+    index.schedule(time_range, loader, NOW)
+    index.schedule(time_range, loader, NOW + timedelta(minutes=4))
+    assert len(loader.loads) == 1
+    index.schedule(time_range, loader, NOW + timedelta(minutes=5))
+    assert len(loader.loads) == 2
+
+
+def test_hours_on_date():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    assert ids(index.hours_on_date(NOW + ONE_DAY, loader, NOW)) == [1]
+
+
+def test_hours_on_date_closing_after_midnight():
+    """Hours that close after midnight are open on both days they span."""
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    assert ids(index.hours_on_date(NOW + 4 * ONE_DAY, loader, NOW)) == [4, 5]
+    assert ids(index.hours_on_date(NOW + 5 * ONE_DAY, loader, NOW)) == [5]
+
+
+def test_hours_on_date_closed():
+    index = OperatingHoursIndex()
+    loader = Loader(HOURS)
+    assert index.hours_on_date(NOW + 6 * ONE_DAY, loader, NOW) == []
@@ -1,6 +1,7 @@
 """Tests for Coworking Operating Hours Service."""
 
 from unittest.mock import create_autospec, call
+from sqlalchemy.orm import Session
 
 from ....services.coworking import OperatingHoursService
 from ....models.coworking import OperatingHours, TimeRange
@@ -116,3 +117,52 @@ def test_delete_permissions(operating_hours_svc: OperatingHoursService):
         "coworking.operating_hours.delete",
         f"coworking/operating_hours/{operating_hours_data.future.id}",
     )
+
+
+def test_hours_on_date(
+    operating_hours_svc: OperatingHoursService, time: dict[str, datetime]
+):
+    """Returns the operating hours open during the day of a date."""
+    result = operating_hours_svc.hours_on_date(time[NOW])
+    assert [hours.id for hours in result] == [operating_hours_data.today.id]
+
+
+def test_hours_on_date_closed(
+    operating_hours_svc: OperatingHoursService, time: dict[str, datetime]
+):
+    """When the XL is not open during the day of a date, returns an empty list."""
+    assert operating_hours_svc.hours_on_date(time[A_WEEK_AGO]) == []
+
+
+def test_schedule_reflects_create(
+    operating_hours_svc: OperatingHoursService, time: dict[str, datetime]
+):
+    """Creating Operating Hours invalidates the index answering the schedule."""
+    time_range = TimeRange(
+        start=time[TOMORROW] + timedelta(days=5),
+        end=time[TOMORROW] + timedelta(days=5, hours=2),
+    )
+    assert operating_hours_svc.schedule(time_range) == []
+    created = operating_hours_svc.create(user_data.root, time_range)
+    assert [hours.id for hours in operating_hours_svc.schedule(time_range)] == [
+        created.id
+    ]
+
+
+def test_schedule_reflects_delete(
+    operating_hours_svc: OperatingHoursService, time: dict[str, datetime]
+):
+    """Deleting Operating Hours invalidates the index answering the schedule."""
+    time_range = TimeRange(start=time[TOMORROW], end=time[TOMORROW] + ONE_DAY)
+    assert len(operating_hours_svc.schedule(time_range)) == 2
+    operating_hours_svc.delete(user_data.root, operating_hours_data.future)
+    result = operating_hours_svc.schedule(time_range)
+    assert [hours.id for hours in result] == [operating_hours_data.tomorrow.id]
+
+
+def test_preload(operating_hours_svc: OperatingHoursService, session: Session):
+    """Preloaded operating hours are queried from memory, without the database."""
+    operating_hours_svc.preload()
+    operating_hours_data.delete_all(session)
+    result = operating_hours_svc.schedule(operating_hours_data.tomorrow)
+    assert operating_hours_data.tomorrow.id in [hours.id for hours in result]
@@ -21,6 +21,7 @@ from ..fixtures import (
     seat_svc,
     policy_svc,
     operating_hours_svc,
+    room_quota_svc,
 )
 from ..time import *
 
@@ -1,15 +1,33 @@
 """ReservationService#draft_reservation method tests"""
 
 import pytest
-from unittest.mock import create_autospec
-
+import threading
+from unittest.mock import create_autospec, patch
+from psycopg2.errors import ExclusionViolation
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .....api.coworking.ambassador import create_walkin_reservation
+from .....entities.coworking import ReservationEntity, SeatEntity
+from .....entities.user_entity import UserEntity
 from .....services import PermissionService
-from .....services.coworking import ReservationService
+from .....services.coworking import (
+    ReservationService,
+    OperatingHoursService,
+    SeatService,
+    PolicyService,
+    RoomQuotaService,
+)
+from .....services.coworking.operating_hours_index import OperatingHoursIndex
 from .....services.coworking.reservation import ReservationException
+from .....services.coworking.availability_events import availability_events
+from .....services.coworking.status_snapshot import status_snapshots
 from .....models.coworking import ReservationState, ReservationRequest
 
-from .....models.user import UserIdentity
+from .....models.user import User, UserIdentity
 from .....models.coworking.seat import SeatIdentity
+from .....models.coworking.seat_details import SeatDetails
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
@@ -19,6 +37,7 @@ from ..fixtures import (
     seat_svc,
     policy_svc,
     operating_hours_svc,
+    room_quota_svc,
 )
 from ..time import *
 
@@ -62,6 +81,24 @@ def test_draft_reservation_open_seats(
     assert reservation.users[0].id == user_data.ambassador.id
 
 
+def test_draft_reservation_publishes_change(reservation_svc: ReservationService):
+    """Drafting a reservation changes seat availability, so status snapshots are stale
+    and subscribers are sent the change."""
+    version = status_snapshots.version
+    with patch.object(availability_events, "publish") as publish:
+        reservation = reservation_svc.draft_reservation(
+            user_data.ambassador, reservation_data.test_request()
+        )
+    assert status_snapshots.version > version
+
+    publish.assert_called_once()
+    delta = publish.call_args.args[0]
+    assert delta.kind == "reservation"
+    assert delta.reservation_id == reservation.id
+    assert delta.state == ReservationState.DRAFT
+    assert delta.seat_ids == [seat.id for seat in reservation.seats]
+
+
 def test_draft_reservation_in_past(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
@@ -414,3 +451,196 @@ def test_draft_reservation_different_room_time_conflict(
         user_data.ambassador, conflict_draft
     )
     assert reservation.id is not None
+
+
+def test_draft_reservation_room_lapsed_conflict(
+    reservation_svc: ReservationService, session: Session
+):
+    """A room held by a draft that has lapsed, but has not yet been swept, may be reserved,
+    and the lapsed draft is cancelled along with it."""
+    lapsed = ReservationEntity(
+        state=ReservationState.DRAFT,
+        start=reservation_data.reservation_6.start,
+        end=reservation_data.reservation_6.end,
+        walkin=False,
+        room_id=room_data.group_a.id,
+        created_at=datetime.now() - timedelta(hours=1),
+    )
+    session.add(lapsed)
+    session.commit()
+
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        ReservationRequest(
+            seats=[],
+            room=room_data.group_a,
+            start=reservation_data.reservation_6.start,
+            end=reservation_data.reservation_6.end,
+            users=[user_data.ambassador],
+        ),
+    )
+    assert reservation.state == ReservationState.DRAFT
+    session.refresh(lapsed)
+    assert lapsed.state == ReservationState.CANCELLED
+
+
+def test_room_reservations_may_not_overlap(session: Session):
+    """The database rejects active reservations of a room that overlap."""
+    session.add(
+        ReservationEntity(
+            state=ReservationState.DRAFT,
+            start=reservation_data.reservation_6.start + timedelta(minutes=30),
+            end=reservation_data.reservation_6.end + timedelta(minutes=30),
+            walkin=False,
+            room_id=room_data.group_b.id,
+        )
+    )
+    with pytest.raises(IntegrityError) as e:
+        session.commit()
+    assert isinstance(e.value.orig, ExclusionViolation)
+
+
+def test_draft_reservation_room_concurrent(
+    session: Session, test_engine: Engine, time: dict[str, datetime]
+):
+    """Concurrent drafts of overlapping times in a room never double book it, even when all
+    of them check for conflicts before any of them is committed."""
+    users = [user_data.root, user_data.ambassador, user_data.user]
+    drafts = 24
+    start = operating_hours_data.tomorrow.start
+    barrier = threading.Barrier(drafts)
+    outcomes: list[str] = []
+
+    def draft(i: int) -> None:
+        with Session(test_engine) as thread_session:
+            permission_svc = PermissionService(thread_session)
+            policy_svc = PolicyService()
+            reservation_svc = ReservationService(
+                thread_session,
+                permission_svc,
+                policy_svc,
+                OperatingHoursService(
+                    thread_session, permission_svc, OperatingHoursIndex()
+                ),
+                SeatService(thread_session),
+                RoomQuotaService(thread_session, policy_svc),
+            )
+            user = users[i % len(users)]
+            request = ReservationRequest(
+                seats=[],
+                room=room_data.group_a,
+                start=start + (i % 4) * THIRTY_MINUTES,
+                end=start + (i % 4) * THIRTY_MINUTES + ONE_HOUR,
+                users=[user],
+            )
+            barrier.wait()
+            try:
+                reservation_svc.draft_reservation(user, request)
+                outcomes.append("drafted")
+            except ReservationException:
+                outcomes.append("rejected")
+
+    threads = [threading.Thread(target=draft, args=(i,)) for i in range(drafts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(outcomes) == drafts
+    assert "drafted" in outcomes
+    overbookings = session.execute(
+        text(
+            """
+            SELECT count(*) FROM coworking__reservation a
+            JOIN coworking__reservation b
+              ON a.room_id = b.room_id AND a.id < b.id
+             AND a.start < b."end" AND a."end" > b.start
+            WHERE a.state IN ('DRAFT', 'CONFIRMED', 'CHECKED_IN')
+              AND b.state IN ('DRAFT', 'CONFIRMED', 'CHECKED_IN')
+            """
+        )
+    ).scalar_one()
+    assert overbookings == 0
+
+
+@pytest.mark.parametrize("by_ambassador", [False, True])
+def test_draft_walkin_reservation_concurrent_seats(
+    session: Session, test_engine: Engine, by_ambassador: bool
+):
+    """Concurrent walk-ins requesting the same seats are each drafted on a distinct seat,
+    whether drafted by the users themselves or by ambassadors at the desk, who draft,
+    confirm, and check in a walk-in all at once."""
+    drafts = 8
+    seats = [
+        SeatDetails(
+            id=100 + i,
+            title=f"Common Area {i:02}",
+            shorthand=f"C{i:02}",
+            reservable=False,
+            has_monitor=False,
+            sit_stand=False,
+            x=10,
+            y=i,
+            room=room_data.the_xl.to_room(),
+        )
+        for i in range(drafts)
+    ]
+    users = [
+        User(
+            id=100 + i,
+            pid=100000000 + i,
+            onyen=f"walkin{i}",
+            email=f"walkin{i}@unc.edu",
+            first_name="Walk",
+            last_name=f"In {i}",
+            pronouns="They / Them",
+            accepted_community_agreement=True,
+        )
+        for i in range(drafts)
+    ]
+    session.add_all(SeatEntity.from_model(seat) for seat in seats)
+    session.add_all(UserEntity.from_model(user) for user in users)
+    session.commit()
+
+    barrier = threading.Barrier(drafts)
+    drafted: dict[int, list[int]] = {}
+
+    def draft(user: User) -> None:
+        with Session(test_engine) as thread_session:
+            permission_svc = PermissionService(thread_session)
+            policy_svc = PolicyService()
+            reservation_svc = ReservationService(
+                thread_session,
+                permission_svc,
+                policy_svc,
+                OperatingHoursService(
+                    thread_session, permission_svc, OperatingHoursIndex()
+                ),
+                SeatService(thread_session),
+                RoomQuotaService(thread_session, policy_svc),
+            )
+            request = reservation_data.test_request(
+                {
+                    "users": [UserIdentity(id=user.id)],
+                    "seats": [SeatIdentity(id=seat.id) for seat in seats],
+                }
+            )
+            barrier.wait()
+            if by_ambassador:
+                reservation = create_walkin_reservation(
+                    request, user_data.ambassador, reservation_svc
+                )
+                assert reservation.state == ReservationState.CHECKED_IN
+            else:
+                reservation = reservation_svc.draft_reservation(user, request)
+            drafted[user.id] = [seat.id for seat in reservation.seats]
+
+    threads = [threading.Thread(target=draft, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(drafted) == drafts
+    claimed = [seat_id for seat_ids in drafted.values() for seat_id in seat_ids]
+    assert sorted(claimed) == [seat.id for seat in seats]
@@ -2,9 +2,11 @@
 
 from backend.models.coworking.availability import RoomState
 from backend.models.coworking.reservation import ReservationState
-from datetime import date
+from datetime import date, time as time_of_day
+from sqlalchemy.orm import Session
 
 from .....services.coworking import ReservationService
+from .....services.coworking.occupancy import OccupancyMap, encode_runs, decode_runs
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
@@ -14,8 +16,10 @@ from ..fixtures import (
     seat_svc,
     policy_svc,
     operating_hours_svc,
+    room_quota_svc,
 )
 from ..time import *
+from ...query_counter import count_queries
 
 # Import the setup_teardown fixture explicitly to load entities in database.
 # The order in which these fixtures run is dependent on their imported alias.
@@ -42,10 +46,15 @@ __license__ = "MIT"
 SATURDAY, SUNDAY = [5, 6]
 
 
-def test_transform_date_map_for_unavailable_simple(reservation_svc: ReservationService):
+def slot(index: int) -> datetime:
+    """The start of a slot of an occupancy map starting at 10 am."""
+    return datetime(2024, 2, 29, 10) + index * THIRTY_MINUTES
+
+
+def test_occupancy_unavailable_simple():
     """
     Validates the transformation of the date map to indicate unavailable time slots.
-    
+
     This test ensures that time slots are appropriately grayed out for all other rooms
     once a user has made a reservation. For example, if Sally Student reserves room SN135
     from 1 pm to 3 pm on February 29, she should be prevented from booking any other room
@@ -53,50 +62,83 @@ def test_transform_date_map_for_unavailable_simple(reservation_svc: ReservationS
     accurately reflects these unavailable slots, enhancing the user experience by
     preventing double bookings.
     """
-    
-    sample_date_map_1 = {
-        'SN135': [0, 0, 0, 0],
-        'SN137': [0, 0, 4, 4],
-        'SN139': [0, 0, 0, 0]
-    }
+    occupancy = OccupancyMap(slot(0), 4, ["SN135", "SN137", "SN139"])
+    occupancy.add_reservation("SN137", slot(2), slot(4), is_subject=True)
 
-    expected_transformed_date_map_1 = {
-        'SN135': [0, 0, 3, 3],
-        'SN137': [0, 0, 4, 4],
-        'SN139': [0, 0, 3, 3]
+    expected_date_map_1 = {
+        "SN135": [0, 0, 3, 3],
+        "SN137": [0, 0, 4, 4],
+        "SN139": [0, 0, 3, 3],
     }
 
-    reservation_svc._transform_date_map_for_unavailable(sample_date_map_1)
-    assert sample_date_map_1 == expected_transformed_date_map_1
+    assert occupancy.states() == expected_date_map_1
 
 
-def test_transform_date_map_for_unavailable_complex(reservation_svc: ReservationService):    
-    sample_date_map_2 = {
-        'SN135': [0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
-        'SN137': [0, 0, 1, 1, 4, 4, 4, 4, 0, 0],
-        'SN139': [0, 4, 4, 1, 1, 0, 0, 0, 0, 0]
+def test_occupancy_unavailable_complex():
+    occupancy = OccupancyMap(slot(0), 10, ["SN135", "SN137", "SN139"])
+    occupancy.add_reservation("SN135", slot(6), slot(10), is_subject=False)
+    occupancy.add_reservation("SN137", slot(2), slot(4), is_subject=False)
+    occupancy.add_reservation("SN137", slot(4), slot(8), is_subject=True)
+    occupancy.add_reservation("SN139", slot(1), slot(3), is_subject=True)
+    occupancy.add_reservation("SN139", slot(3), slot(5), is_subject=False)
+
+    expected_date_map_2 = {
+        "SN135": [0, 3, 3, 0, 3, 3, 1, 1, 1, 1],
+        "SN137": [0, 3, 1, 1, 4, 4, 4, 4, 0, 0],
+        "SN139": [0, 4, 4, 1, 1, 3, 3, 3, 0, 0],
     }
 
-    expected_transformed_date_map_2 = {
-        'SN135': [0, 3, 3, 0, 3, 3, 1, 1, 1, 1],
-        'SN137': [0, 3, 1, 1, 4, 4, 4, 4, 0, 0],
-        'SN139': [0, 4, 4, 1, 1, 3, 3, 3, 0, 0]
+    assert occupancy.states() == expected_date_map_2
+
+
+def test_occupancy_office_hours_take_precedence():
+    occupancy = OccupancyMap(slot(0), 4, ["SN135", "SN137"])
+    occupancy.add_reservation("SN135", slot(0), slot(2), is_subject=True)
+    occupancy.add_reservation("SN137", slot(2), slot(4), is_subject=False)
+    occupancy.add_unavailable("SN135", time_of_day(10, 30), time_of_day(11, 30))
+    occupancy.add_unavailable("SN137", time_of_day(11, 30), time_of_day(18))
+
+    assert occupancy.states() == {
+        "SN135": [4, 3, 3, 0],
+        "SN137": [3, 3, 1, 3],
     }
 
-    reservation_svc._transform_date_map_for_unavailable(sample_date_map_2)
-    assert expected_transformed_date_map_2 == sample_date_map_2
 
+def test_occupancy_clips_to_map():
+    """Reservations overlapping the start or end of the map, or another room, are clipped."""
+    occupancy = OccupancyMap(slot(0), 4, ["SN135"])
+    occupancy.add_reservation("SN135", slot(-2), slot(1), is_subject=False)
+    occupancy.add_reservation("SN135", slot(3), slot(6), is_subject=False)
+    occupancy.add_reservation("SN999", slot(0), slot(4), is_subject=True)
 
-def test_idx_calculation(reservation_svc: ReservationService):
-    time_1 = datetime.now().replace(hour=10, minute=12)
+    assert occupancy.states() == {"SN135": [1, 0, 0, 1]}
+
+
+def test_encode_runs():
+    assert encode_runs([3, 3, 0, 0, 0, 4]) == "32,03,41"
+    assert encode_runs([0] * 16) == "016"
+    assert encode_runs([]) == ""
+
+
+def test_decode_runs():
+    assert decode_runs("32,03,41") == [3, 3, 0, 0, 0, 4]
+    assert decode_runs("016") == [0] * 16
+    assert decode_runs("") == []
+
+
+def test_occupancy_index():
     oh_start = datetime.now().replace(hour=10, minute=0)
-    assert reservation_svc._idx_calculation(time_1, oh_start) == 0
+    occupancy = OccupancyMap(oh_start, 16, [])
+    time_1 = datetime.now().replace(hour=10, minute=12)
+    assert occupancy.index(time_1) == 0
 
     time_2 = datetime.now().replace(hour=12, minute=30)
-    assert reservation_svc._idx_calculation(time_2, oh_start) == 5
+    assert occupancy.index(time_2) == 5
 
     time_3 = datetime.now().replace(hour=13, minute=40)
-    assert reservation_svc._idx_calculation(time_3, oh_start) == 7    
+    assert occupancy.index(time_3) == 7
+
+    assert occupancy.index(time_of_day(9, 30)) == -1
 
 
 def test_round_idx_calculation(reservation_svc: ReservationService):
@@ -112,39 +154,57 @@ def test_round_idx_calculation(reservation_svc: ReservationService):
     assert rounded_time.hour == 10 and rounded_time.minute == 0
     assert rounded_time2.hour == 18 and rounded_time2.minute == 0
     assert rounded_time3.hour == 10 and rounded_time3.minute == 30
-    assert rounded_time4.hour == 18 and rounded_time4.minute == 0 
+    assert rounded_time4.hour == 18 and rounded_time4.minute == 0
+
 
-def test_query_confirmed_reservations_by_date_and_room(
+def test_query_map_reservations_by_date(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
-    """Test getting all reservations for a particular date."""
-    reservations = reservation_svc._query_confirmed_reservations_by_date_and_room(time[NOW], None)
-    assert True
-    #TODO: Add in better assert statements here. 
+    """Room reservations are included for everyone, and XL reservations only for the subject."""
+    reservations = reservation_svc._query_map_reservations_by_date(
+        time[NOW], user_data.user
+    )
+    assert [tuple(row) for row in reservations] == [
+        (
+            None,
+            reservation_data.reservation_1.start,
+            reservation_data.reservation_1.end,
+            True,
+        )
+    ]
+
+    reservations = reservation_svc._query_map_reservations_by_date(
+        time[NOW] + timedelta(days=2), user_data.root
+    )
+    assert [(row.room_id, row.is_subject) for row in reservations] == [("SN137", False)]
+
 
 def test_get_reservable_rooms(reservation_svc: ReservationService):
     # Hardcoded for now, and this might change depending on which rooms are labeled as reservable.
     rooms = reservation_svc._get_reservable_rooms()
-    assert rooms[0].id == 'SN135' and rooms[0].reservable is True
-    assert rooms[1].id == 'SN137' and rooms[1].reservable is True
-    assert rooms[2].id == 'SN139' and rooms[2].reservable is True
-    assert rooms[3].id == 'SN141' and rooms[3].reservable is True
+    assert rooms[0].id == "SN135" and rooms[0].reservable is True
+    assert rooms[1].id == "SN137" and rooms[1].reservable is True
+    assert rooms[2].id == "SN139" and rooms[2].reservable is True
+    assert rooms[3].id == "SN141" and rooms[3].reservable is True
 
 
-def test_query_xl_reservations_by_date_for_user(reservation_svc: ReservationService, time: dict[str, datetime]):
-    reservations = reservation_svc._query_xl_reservations_by_date_for_user(time[NOW], user_data.user)
-    assert len(reservations) == 1
-    assert reservations[0].room is None
-    assert reservations[0].users[0].first_name == 'Sally'
+def test_get_map_reserved_times_by_date_query_count(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    """The map costs the same number of queries however many rooms there are."""
+    with count_queries(session) as queries:
+        reservation_svc.get_map_reserved_times_by_date(time[NOW], user_data.user)
+    # Reservable rooms and their seats, operating hours, and reservations
+    assert queries.count == 4
 
 
 def test_get_map_reserved_times_by_date(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
     """Test for getting a dictionary where keys are room ids and time slots array are values.
-    
+
     If this test fails, consider running the reset_demo script before running this test again.
-    This is hard function to test, and this test does not ensure 100% coverage due to the 
+    This is hard function to test, and this test does not ensure 100% coverage due to the
     multiple edge cases that arise out of it. I recommend setting a breakpoint and looking at
     the reserved_date_map in the debugger.
     """
@@ -154,10 +214,10 @@ def test_get_map_reserved_times_by_date(
     )
 
     expected_date_map = {
-        'SN135' : [3, 3, 3, 3, 3],
-        'SN137' : [4, 4, 4, 4, 3],
-        'SN139' : [3, 3, 3, 3, 3],
-        'SN141' : [3, 3, 3, 3, 3]
+        "SN135": [3, 3, 3, 3, 3],
+        "SN137": [4, 4, 4, 4, 3],
+        "SN139": [3, 3, 3, 3, 3],
+        "SN141": [3, 3, 3, 3, 3],
     }
 
     assert reservation_details.reserved_date_map == expected_date_map
@@ -166,4 +226,34 @@ def test_get_map_reserved_times_by_date(
         test_time, user_data.root
     )
 
-    assert True
\ No newline at end of file
+    assert True
+
+
+def test_get_map_reserved_times_by_dates(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Each day of a multi-day map is the run-length encoded map of that day alone."""
+    grids = reservation_svc.get_map_reserved_times_by_dates(
+        time[NOW], 4, user_data.user
+    )
+    assert len(grids) == 4
+    for day, grid in enumerate(grids):
+        date = time[MIDNIGHT_TODAY] + day * ONE_DAY
+        assert grid.date == date
+        details = reservation_svc.get_map_reserved_times_by_date(date, user_data.user)
+        assert {
+            room_id: decode_runs(runs) for room_id, runs in grid.room_slot_runs.items()
+        } == details.reserved_date_map
+        assert grid.operating_hours_start == details.operating_hours_start
+        assert grid.operating_hours_end == details.operating_hours_end
+        assert grid.number_of_time_slots == details.number_of_time_slots
+
+
+def test_get_map_reserved_times_by_dates_query_count(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    """A week of maps costs the same number of queries as a single day's."""
+    with count_queries(session) as queries:
+        reservation_svc.get_map_reserved_times_by_dates(time[NOW], 7, user_data.user)
+    # Reservable rooms and their seats, operating hours, and reservations
+    assert queries.count == 4
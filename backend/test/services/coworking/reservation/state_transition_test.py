@@ -16,8 +16,10 @@ from .....models.user import UserIdentity
 from .....models.coworking.seat import SeatIdentity
 
 # Some internal methods use SQLAlchemy layer and are tested here
+from sqlalchemy import Engine
 from sqlalchemy.orm import Session
 from .....entities.coworking import ReservationEntity
+from .....services.coworking.reservation_sweeper import ReservationSweeper
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
@@ -27,6 +29,7 @@ from ..fixtures import (
     seat_svc,
     policy_svc,
     operating_hours_svc,
+    room_quota_svc,
 )
 from ..time import *
 
@@ -50,21 +53,21 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
-def test_state_transition_reservation_entities_by_time_noop(
+def test_exclude_lapsed_reservation_entities_noop(
     session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
 ):
     entities: list[ReservationEntity] = [
         session.get(ReservationEntity, reservation.id)
         for reservation in reservation_data.active_reservations
     ]
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
+    collected = reservation_svc._exclude_lapsed_reservation_entities(
         time[NOW], entities
     )
     assert collected is not entities
     assert collected == entities
 
 
-def test_state_transition_reservation_entities_by_time_expired_active(
+def test_exclude_lapsed_reservation_entities_expired_active(
     session: Session, reservation_svc: ReservationService
 ):
     entities: list[ReservationEntity] = [
@@ -72,16 +75,14 @@ def test_state_transition_reservation_entities_by_time_expired_active(
         for reservation in reservation_data.active_reservations
     ]
     cutoff = entities[0].end
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
+    collected = reservation_svc._exclude_lapsed_reservation_entities(cutoff, entities)
 
     assert len(collected) == len(entities) - 1
     reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CHECKED_OUT
+    assert reservation.state == ReservationState.CHECKED_IN
 
 
-def test_state_transition_reservation_entities_by_time_active_draft(
+def test_exclude_lapsed_reservation_entities_active_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     entities: list[ReservationEntity] = [
@@ -89,14 +90,12 @@ def test_state_transition_reservation_entities_by_time_active_draft(
         for reservation in reservation_data.draft_reservations
     ]
     cutoff = entities[0].created_at + policy_svc.reservation_draft_timeout()
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
+    collected = reservation_svc._exclude_lapsed_reservation_entities(cutoff, entities)
     assert len(collected) == len(entities)
     assert collected[0].state == ReservationState.DRAFT
 
 
-def test_state_transition_reservation_entities_by_time_expired_draft(
+def test_exclude_lapsed_reservation_entities_expired_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
@@ -114,18 +113,16 @@ def test_state_transition_reservation_entities_by_time_expired_draft(
         + policy_svc.reservation_draft_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
+    collected = reservation_svc._exclude_lapsed_reservation_entities(cutoff, entities)
     assert len(collected) == len(entities) - 1
 
     reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
+    assert reservation.state == ReservationState.DRAFT
 
     policy_mock.reservation_draft_timeout.assert_called_once()
 
 
-def test_state_transition_reservation_entities_by_time_checkin_timeout(
+def test_exclude_lapsed_reservation_entities_checkin_timeout(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
@@ -143,12 +140,105 @@ def test_state_transition_reservation_entities_by_time_checkin_timeout(
         + policy_svc.reservation_checkin_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
+    collected = reservation_svc._exclude_lapsed_reservation_entities(cutoff, entities)
     assert len(collected) == len(entities) - 1
 
     reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
+    assert reservation.state == ReservationState.CONFIRMED
 
     policy_mock.reservation_checkin_timeout.assert_called_once()
+
+
+@pytest.fixture()
+def reservation_sweeper(test_engine: Engine, policy_svc: PolicyService):
+    """A sweeper that only sweeps when explicitly asked to."""
+    sweeper = ReservationSweeper(
+        sweep_interval=3600, batch_size=500, policy_svc=policy_svc, engine=test_engine
+    )
+    yield sweeper
+    sweeper.close()
+
+
+def states(session: Session) -> dict[int, ReservationState]:
+    session.expire_all()
+    return {
+        reservation.id: reservation.state
+        for reservation in session.query(ReservationEntity).all()
+    }
+
+
+def test_reservation_sweeper_noop(
+    session: Session,
+    reservation_sweeper: ReservationSweeper,
+    time: dict[str, datetime],
+):
+    before = states(session)
+    assert reservation_sweeper.sweep(time[NOW]) == 0
+    assert states(session) == before
+
+
+def test_reservation_sweeper_checks_out_ended(
+    session: Session, reservation_sweeper: ReservationSweeper
+):
+    before = states(session)
+    # The draft reservation has also expired by the end of the checked in reservation
+    cutoff = reservation_data.reservation_1.end
+    assert reservation_sweeper.sweep(cutoff) == 2
+
+    after = states(session)
+    assert after.pop(reservation_data.reservation_1.id) == ReservationState.CHECKED_OUT
+    assert after.pop(reservation_data.reservation_5.id) == ReservationState.CANCELLED
+    del before[reservation_data.reservation_1.id]
+    del before[reservation_data.reservation_5.id]
+    assert after == before
+
+    reservation = session.get(ReservationEntity, reservation_data.reservation_1.id)
+    assert reservation.updated_at == cutoff
+
+
+def test_reservation_sweeper_cancels_expired_draft(
+    session: Session,
+    reservation_sweeper: ReservationSweeper,
+    policy_svc: PolicyService,
+):
+    draft = reservation_data.reservation_5
+    cutoff = draft.created_at + policy_svc.reservation_draft_timeout()
+    assert reservation_sweeper.sweep(cutoff) == 0
+    assert reservation_sweeper.sweep(cutoff + timedelta(seconds=1)) == 1
+    assert states(session)[draft.id] == ReservationState.CANCELLED
+
+
+def test_reservation_sweeper_cancels_checkin_timeout(
+    session: Session,
+    reservation_sweeper: ReservationSweeper,
+    policy_svc: PolicyService,
+):
+    confirmed = reservation_data.reservation_4
+    cutoff = confirmed.start + policy_svc.reservation_checkin_timeout()
+    reservation_sweeper.sweep(cutoff + timedelta(seconds=1))
+    assert states(session)[confirmed.id] == ReservationState.CANCELLED
+
+
+def test_reservation_sweeper_batches(
+    session: Session, test_engine: Engine, policy_svc: PolicyService
+):
+    sweeper = ReservationSweeper(
+        batch_size=1, policy_svc=policy_svc, engine=test_engine
+    )
+    cutoff = reservation_data.reservation_6.end + timedelta(days=1)
+    assert sweeper.sweep(cutoff) == 4
+    assert states(session) == {
+        1: ReservationState.CHECKED_OUT,
+        2: ReservationState.CHECKED_OUT,
+        3: ReservationState.CANCELLED,
+        4: ReservationState.CANCELLED,
+        5: ReservationState.CANCELLED,
+        6: ReservationState.CANCELLED,
+    }
+
+
+def test_reservation_sweeper_start_and_close(reservation_sweeper: ReservationSweeper):
+    reservation_sweeper.start()
+    reservation_sweeper.close()
+    assert reservation_sweeper._thread is not None
+    assert not reservation_sweeper._thread.is_alive()
@@ -0,0 +1,179 @@
+"""Tests for the RoomQuotaService of weekly study room hours."""
+
+from sqlalchemy.orm import Session
+
+from ....entities import UserEntity
+from ....entities.coworking import ReservationEntity
+from ....models.coworking import ReservationState, TimeRange
+from ....services.coworking import RoomQuotaService
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import room_quota_svc, policy_svc
+from .time import *
+
+# Insert fake data entities in database
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from ..room_data import fake_data_fixture as insert_order_1
+
+# Import the fake model data in a namespace for test assertions
+from ..core_data import user_data
+from .. import room_data
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+# A Wednesday, with the week running from Monday, January 7th to Monday, January 14th
+NOW = datetime(2030, 1, 9, 9, 0)
+MONDAY = datetime(2030, 1, 7)
+NEXT_MONDAY = datetime(2030, 1, 14)
+
+
+def reserve(
+    session: Session,
+    start: datetime,
+    end: datetime,
+    state: ReservationState = ReservationState.CONFIRMED,
+    room_id: str | None = room_data.group_a.id,
+    user_id: int | None = user_data.user.id,
+) -> ReservationEntity:
+    """Inserts a reservation of a study room for a user."""
+    reservation = ReservationEntity(
+        start=start,
+        end=end,
+        state=state,
+        walkin=False,
+        room_id=room_id,
+        users=[session.get(UserEntity, user_id)],
+    )
+    session.add(reservation)
+    session.commit()
+    return reservation
+
+
+def test_week_of(room_quota_svc: RoomQuotaService):
+    week = room_quota_svc.week_of(NOW)
+    assert week.start == MONDAY
+    assert week.end == NEXT_MONDAY
+
+
+def test_week_of_week_boundaries(room_quota_svc: RoomQuotaService):
+    """Monday at midnight begins a week, and the moment before belongs to the week before."""
+    assert room_quota_svc.week_of(MONDAY).start == MONDAY
+    assert room_quota_svc.week_of(NEXT_MONDAY).start == NEXT_MONDAY
+    before = NEXT_MONDAY - timedelta(microseconds=1)
+    assert room_quota_svc.week_of(before).start == MONDAY
+
+
+def test_reserved_none(room_quota_svc: RoomQuotaService):
+    week = room_quota_svc.week_of(NOW)
+    assert room_quota_svc.reserved(user_data.user, week, NOW) == timedelta()
+
+
+def test_reserved_sums_room_reservations(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    reserve(session, NOW + ONE_HOUR, NOW + 3 * ONE_HOUR)
+    reserve(session, NOW + ONE_DAY, NOW + ONE_DAY + THIRTY_MINUTES)
+    week = room_quota_svc.week_of(NOW)
+    assert room_quota_svc.reserved(user_data.user, week, NOW) == timedelta(
+        hours=2, minutes=30
+    )
+
+
+def test_reserved_excludes_other_users_and_seats(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    reserve(session, NOW + ONE_HOUR, NOW + 2 * ONE_HOUR, user_id=user_data.root.id)
+    reserve(session, NOW + ONE_HOUR, NOW + 2 * ONE_HOUR, room_id=None)
+    week = room_quota_svc.week_of(NOW)
+    assert room_quota_svc.reserved(user_data.user, week, NOW) == timedelta()
+
+
+def test_reserved_excludes_cancelled_and_lapsed(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    reserve(session, NOW + ONE_HOUR, NOW + 2 * ONE_HOUR, ReservationState.CANCELLED)
+    # Confirmed, but not checked into before the check in timeout
+    reserve(session, NOW - 2 * ONE_HOUR, NOW - ONE_HOUR)
+    week = room_quota_svc.week_of(NOW)
+    assert room_quota_svc.reserved(user_data.user, week, NOW) == timedelta()
+
+
+def test_reserved_includes_checked_out(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    reserve(session, NOW - 2 * ONE_HOUR, NOW - ONE_HOUR, ReservationState.CHECKED_OUT)
+    week = room_quota_svc.week_of(NOW)
+    assert room_quota_svc.reserved(user_data.user, week, NOW) == ONE_HOUR
+
+
+def test_reserved_splits_reservations_spanning_weeks(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    """A reservation from Sunday night into Monday counts toward each week for its hours
+    within it."""
+    reserve(session, NEXT_MONDAY - ONE_HOUR, NEXT_MONDAY + THIRTY_MINUTES)
+    this_week = room_quota_svc.week_of(NOW)
+    next_week = room_quota_svc.week_of(NEXT_MONDAY)
+    assert room_quota_svc.reserved(user_data.user, this_week, NOW) == ONE_HOUR
+    assert room_quota_svc.reserved(user_data.user, next_week, NOW) == THIRTY_MINUTES
+
+
+def test_reserved_excludes_reservation_ending_at_week_start(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    reserve(session, NEXT_MONDAY - ONE_HOUR, NEXT_MONDAY)
+    next_week = room_quota_svc.week_of(NEXT_MONDAY)
+    assert room_quota_svc.reserved(user_data.user, next_week, NOW) == timedelta()
+
+
+def test_remaining(room_quota_svc: RoomQuotaService, session: Session):
+    reserve(session, NOW + ONE_HOUR, NOW + 3 * ONE_HOUR)
+    assert room_quota_svc.remaining(user_data.user, NOW) == timedelta(hours=4)
+
+
+def test_remaining_never_negative(room_quota_svc: RoomQuotaService, session: Session):
+    for day in range(4):
+        reserve(session, NOW + day * ONE_DAY, NOW + day * ONE_DAY + 2 * ONE_HOUR)
+    assert room_quota_svc.remaining(user_data.user, NOW) == timedelta()
+
+
+def test_allows_up_to_limit(room_quota_svc: RoomQuotaService, session: Session):
+    for day in range(2):
+        reserve(session, NOW + day * ONE_DAY, NOW + day * ONE_DAY + 2 * ONE_HOUR)
+    start = NOW + 2 * ONE_DAY
+    within = TimeRange(start=start, end=start + 2 * ONE_HOUR)
+    beyond = TimeRange(start=start, end=start + 2 * ONE_HOUR + THIRTY_MINUTES)
+    assert room_quota_svc.allows(user_data.user, within, NOW)
+    assert not room_quota_svc.allows(user_data.user, beyond, NOW)
+
+
+def test_allows_next_week_when_this_week_is_full(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    for day in range(3):
+        reserve(session, NOW + day * ONE_DAY, NOW + day * ONE_DAY + 2 * ONE_HOUR)
+    assert not room_quota_svc.allows(
+        user_data.user,
+        TimeRange(start=NEXT_MONDAY - ONE_HOUR, end=NEXT_MONDAY - THIRTY_MINUTES),
+        NOW,
+    )
+    assert room_quota_svc.allows(
+        user_data.user,
+        TimeRange(start=NEXT_MONDAY, end=NEXT_MONDAY + 2 * ONE_HOUR),
+        NOW,
+    )
+
+
+def test_allows_spanning_weeks_checks_each_week(
+    room_quota_svc: RoomQuotaService, session: Session
+):
+    """A request spanning midnight into Monday must fit within the limit of both weeks."""
+    for day in range(3):
+        reserve(session, NOW + day * ONE_DAY, NOW + day * ONE_DAY + 2 * ONE_HOUR)
+    assert not room_quota_svc.allows(
+        user_data.user,
+        TimeRange(start=NEXT_MONDAY - THIRTY_MINUTES, end=NEXT_MONDAY + ONE_HOUR),
+        NOW,
+    )
@@ -2,7 +2,9 @@
 
 from .fixtures import status_svc
 from ....services.coworking.status import StatusService
+from ....services.coworking.status_snapshot import StatusSnapshotCache
 from ....models.coworking.availability import SeatAvailability
+from ....models.coworking.time_range import TimeRange
 from datetime import timedelta
 
 from ..core_data import user_data
@@ -18,9 +20,8 @@ from .seat_data import fake_data_fixture as insert_order_3
 from .reservation.reservation_data import fake_data_fixture as insert_order_4
 
 
-def test_status_dispatch(status_svc: StatusService):
-    # Hard-wire mock responses to all dispatched methods
-    # We test these methods elsewhere
+def mock_dispatch(status_svc: StatusService) -> list[SeatAvailability]:
+    """Hard-wire mock responses to all dispatched methods, which are tested elsewhere."""
     status_svc._reservation_svc.get_current_reservations_for_user.return_value = [
         reservation_data.reservation_1
     ]
@@ -44,6 +45,11 @@ def test_status_dispatch(status_svc: StatusService):
         )
     ]
     status_svc._reservation_svc.seat_availability.return_value = seat_availability
+    return seat_availability
+
+
+def test_status_dispatch(status_svc: StatusService):
+    seat_availability = mock_dispatch(status_svc)
 
     # Call the method
     status = status_svc.get_coworking_status(user_data.root)
@@ -59,3 +65,117 @@ def test_status_dispatch(status_svc: StatusService):
     assert status.my_reservations == [reservation_data.reservation_1]
     assert status.seat_availability == seat_availability
     assert status.operating_hours == [operating_hours_data.today]
+
+
+def test_status_snapshot_shared_between_users(status_svc: StatusService):
+    mock_dispatch(status_svc)
+    status_svc.get_coworking_status(user_data.root)
+    status_svc.get_coworking_status(user_data.user)
+
+    assert status_svc._reservation_svc.get_current_reservations_for_user.call_count == 2
+    status_svc._seat_svc.list.assert_called_once()
+    status_svc._reservation_svc.seat_availability.assert_called_once()
+    status_svc._operating_hours_svc.schedule.assert_called_once()
+
+
+def test_status_snapshot_rebuilt_when_invalidated(status_svc: StatusService):
+    mock_dispatch(status_svc)
+    status_svc.get_coworking_status(user_data.root)
+    status_svc._snapshots.invalidate()
+    status_svc.get_coworking_status(user_data.root)
+    assert status_svc._reservation_svc.seat_availability.call_count == 2
+
+
+def test_status_snapshot_rebuilt_when_policies_differ(status_svc: StatusService):
+    mock_dispatch(status_svc)
+    status_svc.get_coworking_status(user_data.root)
+    status_svc._policies_svc.walkin_window.return_value = timedelta(minutes=5)
+    status_svc.get_coworking_status(user_data.root)
+    assert status_svc._reservation_svc.seat_availability.call_count == 2
+
+
+def test_status_snapshot_rebuilt_after_interval(time: dict[str, datetime]):
+    snapshots = StatusSnapshotCache(interval=timedelta(seconds=15))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return [], [], []
+
+    first = snapshots.get("key", build, time[NOW])
+    assert snapshots.get("key", build, time[NOW] + timedelta(seconds=14)) is first
+    assert len(builds) == 1
+
+    rebuilt = snapshots.get("key", build, time[NOW] + timedelta(seconds=15))
+    assert rebuilt is not first
+    assert len(builds) == 2
+
+
+def test_status_etag(status_svc: StatusService):
+    mock_dispatch(status_svc)
+    _, etag = status_svc.get_coworking_status_with_etag(user_data.root)
+    _, unchanged = status_svc.get_coworking_status_with_etag(user_data.root)
+    assert etag == unchanged
+    assert etag.startswith('W/"')
+
+    status_svc._reservation_svc.get_current_reservations_for_user.return_value = []
+    _, changed = status_svc.get_coworking_status_with_etag(user_data.root)
+    assert changed != etag
+
+    status_svc._snapshots.invalidate()
+    status_svc._operating_hours_svc.schedule.return_value = []
+    _, rebuilt = status_svc.get_coworking_status_with_etag(user_data.root)
+    assert rebuilt != changed
+
+
+def seat_availability_at(start: datetime, end: datetime) -> list[SeatAvailability]:
+    """The availability of two seats, as if built when seats were available from `start`."""
+    return [
+        SeatAvailability(
+            id=id,
+            availability=[TimeRange(start=start, end=end)],
+            title=f"S{id}",
+            shorthand=f"S{id}",
+            reservable=False,
+            has_monitor=True,
+            sit_stand=False,
+            x=id,
+            y=0,
+        )
+        for id in (1, 2)
+    ]
+
+
+def test_status_etag_unchanged_by_rebuild(status_svc: StatusService):
+    """Rebuilding unchanged data, seconds later and with seats shuffled, keeps the ETag."""
+    mock_dispatch(status_svc)
+    opens = datetime(2024, 2, 29, 10, 0, 5)
+    closes = datetime(2024, 2, 29, 12)
+    status_svc._reservation_svc.seat_availability.return_value = seat_availability_at(
+        opens, closes
+    )
+    _, etag = status_svc.get_coworking_status_with_etag(user_data.root)
+
+    status_svc._snapshots.invalidate()
+    status_svc._reservation_svc.seat_availability.return_value = list(
+        reversed(seat_availability_at(opens + timedelta(seconds=15), closes))
+    )
+    _, rebuilt = status_svc.get_coworking_status_with_etag(user_data.root)
+    assert status_svc._reservation_svc.seat_availability.call_count == 2
+    assert rebuilt == etag
+
+
+def test_status_etag_changed_by_availability(status_svc: StatusService):
+    mock_dispatch(status_svc)
+    opens = datetime(2024, 2, 29, 10, 0, 5)
+    status_svc._reservation_svc.seat_availability.return_value = seat_availability_at(
+        opens, datetime(2024, 2, 29, 12)
+    )
+    _, etag = status_svc.get_coworking_status_with_etag(user_data.root)
+
+    status_svc._snapshots.invalidate()
+    status_svc._reservation_svc.seat_availability.return_value = seat_availability_at(
+        opens, datetime(2024, 2, 29, 11, 30)
+    )
+    _, changed = status_svc.get_coworking_status_with_etag(user_data.root)
+    assert changed != etag
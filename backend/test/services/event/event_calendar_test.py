@@ -0,0 +1,174 @@
+"""Tests for the EventCalendarService class."""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from ....api.authentication import _generate_token, generate_scoped_token
+from ....api.events.events import (
+    REGISTRATIONS_CALENDAR_TOKEN_SCOPE,
+    get_registered_events_calendar_token,
+    registrations_calendar_subject,
+)
+from ....services import EventService, UserService
+from ....services.event_calendar import (
+    EVENTS_SCOPE,
+    CalendarVersions,
+    EventCalendarService,
+    calendar_versions,
+    organization_scope,
+    user_scope,
+    _fold,
+    _text,
+)
+
+# Injected Service Fixtures
+from ..fixtures import user_svc_integration, event_svc_integration
+
+# Explicitly import Data Fixture to load entities in database
+from ..core_data import setup_insert_data_fixture
+
+# Data Models for Fake Data Inserted in Setup
+from .event_test_data import events, event_one, event_two, event_three
+from ..organization.organization_test_data import cads, cssg
+from ..user_data import ambassador, user
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def calendar_svc(session: Session):
+    """EventCalendarService fixture with its own calendar versions."""
+    return EventCalendarService(session, CalendarVersions())
+
+
+def feed(lines) -> str:
+    return "".join(lines)
+
+
+def uids(calendar: str) -> list[str]:
+    return [line for line in calendar.split("\r\n") if line.startswith("UID:")]
+
+
+def uid(event) -> str:
+    return f"UID:event-{event.id}@csxl.unc.edu"
+
+
+def test_events_feed(calendar_svc: EventCalendarService):
+    calendar = feed(calendar_svc.events_feed())
+    assert calendar.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+    assert calendar.endswith("END:VCALENDAR\r\n")
+    assert uids(calendar) == [uid(event) for event in events]
+    assert calendar.count("BEGIN:VEVENT") == len(events)
+    assert "SUMMARY:CS+SG Mixer\r\n" in calendar
+
+
+def test_events_feed_lines_are_folded(calendar_svc: EventCalendarService):
+    for line in feed(calendar_svc.events_feed()).split("\r\n"):
+        assert len(line.encode()) <= 75
+
+
+def test_events_feed_outside_window(calendar_svc: EventCalendarService):
+    """Events more than a year away are not in feeds."""
+    calendar = feed(calendar_svc.events_feed(datetime.now() - timedelta(days=400)))
+    assert uids(calendar) == []
+
+
+def test_organization_feed(calendar_svc: EventCalendarService):
+    assert uids(feed(calendar_svc.organization_feed(cssg))) == [
+        uid(event) for event in events
+    ]
+    assert uids(feed(calendar_svc.organization_feed(cads))) == []
+
+
+def test_registrations_feed(calendar_svc: EventCalendarService):
+    """Feeds of registrations include events registered for as attendee or organizer."""
+    assert uids(feed(calendar_svc.registrations_feed(ambassador))) == [
+        uid(event_one),
+        uid(event_three),
+    ]
+    assert uids(feed(calendar_svc.registrations_feed(user))) == [uid(event_one)]
+
+
+def test_registrations_calendar_token(user_svc_integration: UserService):
+    """Feeds of registrations are opened with a token for the subscribing user."""
+    token = get_registered_events_calendar_token(user)
+    subject = registrations_calendar_subject(token, user_svc_integration)
+    assert subject.id == user.id
+
+
+def test_registrations_calendar_rejects_other_tokens(
+    user_svc_integration: UserService,
+):
+    for token in [
+        _generate_token(user.onyen, user.pid),
+        generate_scoped_token(user.pid, "other"),
+        generate_scoped_token(123456789, REGISTRATIONS_CALENDAR_TOKEN_SCOPE),
+    ]:
+        with pytest.raises(HTTPException) as excinfo:
+            registrations_calendar_subject(token, user_svc_integration)
+        assert excinfo.value.status_code == 401
+
+
+def test_validators_unchanged(calendar_svc: EventCalendarService):
+    assert calendar_svc.validators([EVENTS_SCOPE]) == calendar_svc.validators(
+        [EVENTS_SCOPE]
+    )
+
+
+def test_validators_changed_by_bump(calendar_svc: EventCalendarService):
+    etag, _ = calendar_svc.validators([EVENTS_SCOPE, user_scope(user.id)])
+    calendar_svc._versions.bump(user_scope(user.id))
+    changed, last_modified = calendar_svc.validators(
+        [EVENTS_SCOPE, user_scope(user.id)]
+    )
+    assert changed != etag
+    assert last_modified.tzinfo is not None
+
+
+def test_validators_of_other_scopes_unchanged(calendar_svc: EventCalendarService):
+    etag = calendar_svc.validators([EVENTS_SCOPE])
+    calendar_svc._versions.bump(organization_scope(cads.id))
+    assert calendar_svc.validators([EVENTS_SCOPE]) == etag
+
+
+def test_validators_changed_by_window(calendar_svc: EventCalendarService):
+    """Feeds change daily as their window moves, even without changes to events."""
+    today = datetime.now()
+    etag, last_modified = calendar_svc.validators([EVENTS_SCOPE], today)
+    tomorrow_etag, tomorrow_last_modified = calendar_svc.validators(
+        [EVENTS_SCOPE], today + timedelta(days=1)
+    )
+    assert tomorrow_etag != etag
+    assert tomorrow_last_modified > last_modified
+
+
+def test_register_bumps_user_scope(
+    event_svc_integration: EventService, calendar_svc: EventCalendarService
+):
+    """Registering changes the feed of the attendee's registrations."""
+    etag, _ = calendar_versions.validators(
+        [EVENTS_SCOPE, user_scope(user.id)], calendar_svc.window()
+    )
+    event_details = event_svc_integration.get_by_id(event_two.id, user)
+    event_svc_integration.register(user, user, event_details)
+    changed, _ = calendar_versions.validators(
+        [EVENTS_SCOPE, user_scope(user.id)], calendar_svc.window()
+    )
+    assert changed != etag
+
+
+def test_text_escaped():
+    assert _text("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+
+def test_fold_multibyte():
+    """Lines are folded without splitting multi-octet characters."""
+    line = "DESCRIPTION:" + "é" * 100
+    folded = _fold(line).split("\r\n")
+    assert all(len(part.encode()) <= 75 for part in folded)
+    assert all(part.startswith(" ") for part in folded[1:])
+    assert "".join(part[1:] for part in folded[1:]) == line[len(folded[0]) :]
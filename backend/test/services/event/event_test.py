@@ -2,7 +2,12 @@
 
 # PyTest
 import pytest
-from unittest.mock import create_autospec
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import create_autospec, patch
+from sqlalchemy import Engine, func, select
+from sqlalchemy.orm import Session
 from backend.models.pagination import PaginationParams
 
 from backend.services.exceptions import (
@@ -18,7 +23,10 @@ from ..coworking.time import *
 
 # Tested Dependencies
 from ....models import Event, EventDetails, EventPaginationParams
-from ....services import EventService
+from ....models.registration_type import RegistrationType
+from ....services import EventService, PermissionService
+from ....services import event as event_service_module
+from ....entities import EventEntity, EventRegistrationEntity, UserEntity
 
 # Injected Service Fixtures
 from ..fixtures import (
@@ -47,6 +55,7 @@ from .event_test_data import (
 from ..user_data import root, ambassador, user
 
 from .event_demo_data import date_maker
+from ..query_counter import count_queries
 
 # Test Functions
 
@@ -131,6 +140,37 @@ def test_list_unauthenticated(event_svc_integration: EventService):
     assert len(fetched_events.items) == 1
 
 
+def test_list_descending(event_svc_integration: EventService):
+    """Test that a paginated list of events can be ordered in descending order."""
+    pagination_params = EventPaginationParams(order_by="time", ascending="false")
+    fetched_events = event_svc_integration.get_paginated_events(pagination_params)
+    times = [event.time for event in fetched_events.items]
+    assert times == sorted(times, reverse=True)
+
+
+def test_list_order_by_not_allowed(event_svc_integration: EventService):
+    """Test that events cannot be ordered by attributes outside of the allowed columns."""
+    pagination_params = EventPaginationParams(order_by="registrations")
+    with pytest.raises(ResourceNotFoundException):
+        event_svc_integration.get_paginated_events(pagination_params)
+
+
+def test_list_registration_details(
+    event_svc_integration: EventService, session: Session
+):
+    """Test that listed events have the same registration details as when fetched alone,
+    at a fixed number of queries."""
+    with count_queries(session) as queries:
+        fetched_events = event_svc_integration.get_paginated_events(
+            EventPaginationParams(), user
+        )
+    # Events with their total and registration aggregates, organizations, and organizers
+    assert queries.count == 3
+    assert len(fetched_events.items) == len(events)
+    for event in fetched_events.items:
+        assert event == event_svc_integration.get_by_id(event.id, user)
+
+
 def test_get_events_in_time_range(event_svc_integration: EventService):
     """Test that a list of events can be produced for a valid time range."""
     range = TimeRange(
@@ -397,6 +437,114 @@ def test_get_registrations_enforces_admin_auth(
     )
 
 
+def test_export_registrations_csv(event_svc_integration: EventService):
+    """Test that the registrations of an event are exported as CSV, ordered by name."""
+    event_details = event_svc_integration.get_by_id(event_one.id, root)  # type: ignore
+    export = "".join(event_svc_integration.export_registrations(root, event_details))
+    rows = list(csv.DictReader(export.splitlines()))
+    assert [(row["id"], row["registration_type"]) for row in rows] == [
+        (str(ambassador.id), "ATTENDEE"),
+        (str(user.id), "ORGANIZER"),
+    ]
+    assert rows[0]["email"] == ambassador.email
+
+
+def test_export_registrations_jsonl_as_organizer(event_svc_integration: EventService):
+    event_details = event_svc_integration.get_by_id(event_one.id, user)  # type: ignore
+    export = "".join(
+        event_svc_integration.export_registrations(user, event_details, "jsonl")
+    )
+    registrations = [json.loads(line) for line in export.splitlines()]
+    assert [registration["id"] for registration in registrations] == [
+        ambassador.id,
+        user.id,
+    ]
+    assert registrations[1]["registration_type"] == "ORGANIZER"
+
+
+def test_export_registrations_non_organizer(event_svc_integration: EventService):
+    """Test that permission is enforced before the export is streamed."""
+    event_details = event_svc_integration.get_by_id(event_one.id, ambassador)  # type: ignore
+    with pytest.raises(UserPermissionException):
+        event_svc_integration.export_registrations(ambassador, event_details)
+
+
+def test_export_registrations_csv_neutralizes_formulas(
+    event_svc_integration: EventService, session: Session
+):
+    """Test that names and pronouns a spreadsheet would evaluate are exported as text."""
+    session.add(
+        UserEntity(
+            id=1000,
+            pid=100000000,
+            onyen="formula",
+            email="formula@unc.edu",
+            first_name='=HYPERLINK("http://example.com")',
+            last_name="-2+3",
+            pronouns="@SUM(1)",
+        )
+    )
+    session.add(
+        EventRegistrationEntity(
+            event_id=event_two.id,
+            user_id=1000,
+            registration_type=RegistrationType.ATTENDEE,
+        )
+    )
+    session.commit()
+
+    event_details = event_svc_integration.get_by_id(event_two.id, root)  # type: ignore
+    export = "".join(event_svc_integration.export_registrations(root, event_details))
+    row = next(csv.DictReader(export.splitlines()))
+    assert row["first_name"] == '\'=HYPERLINK("http://example.com")'
+    assert row["last_name"] == "'-2+3"
+    assert row["pronouns"] == "'@SUM(1)"
+    assert row["email"] == "formula@unc.edu"
+
+    export = "".join(
+        event_svc_integration.export_registrations(root, event_details, "jsonl")
+    )
+    assert json.loads(export)["last_name"] == "-2+3"
+
+
+def test_export_registrations_in_batches(
+    event_svc_integration: EventService, session: Session
+):
+    """Test that registrations are exported a batch at a time."""
+    attendees = [
+        UserEntity(
+            id=1000 + i,
+            pid=100000000 + i,
+            onyen=f"attendee{i}",
+            email=f"attendee{i}@unc.edu",
+            first_name="Attendee",
+            last_name=f"{i:03}",
+            pronouns="They / Them",
+        )
+        for i in range(250)
+    ]
+    session.add_all(attendees)
+    session.add_all(
+        EventRegistrationEntity(
+            event_id=event_two.id,
+            user_id=attendee.id,
+            registration_type=RegistrationType.ATTENDEE,
+        )
+        for attendee in attendees
+    )
+    session.commit()
+    attendee_ids = [attendee.id for attendee in attendees]
+
+    event_details = event_svc_integration.get_by_id(event_two.id, root)  # type: ignore
+    with patch.object(event_service_module, "EXPORT_BATCH_SIZE", 100):
+        chunks = list(
+            event_svc_integration.export_registrations(root, event_details, "jsonl")
+        )
+    assert len(chunks) == 3
+    registrations = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [registration["id"] for registration in registrations] == attendee_ids
+
+
 def test_unregister_for_event_as_registerer(
     event_svc_integration: EventService,
 ):
@@ -530,6 +678,59 @@ def test_register_to_full_event(
         event_svc_integration.register(user, user, event_details)
 
 
+def test_register_to_full_event_twice(event_svc_integration: EventService):
+    """Tests that an attendee's second registration for a full event is idempotent."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    registration = event_svc_integration.register(ambassador, ambassador, event_details)
+    assert registration.id == ambassador.id
+
+
+def test_register_concurrently_to_full_event(
+    event_svc_integration: EventService, session: Session, test_engine: Engine
+):
+    """Tests that concurrent registrations for an event never exceed its limit."""
+    registration_limit = 100
+    attendees = [
+        UserEntity(
+            id=1000 + i,
+            pid=100000000 + i,
+            onyen=f"attendee{i}",
+            email=f"attendee{i}@unc.edu",
+        )
+        for i in range(500)
+    ]
+    event_entity = EventEntity.from_draft_model(
+        to_add.model_copy(update={"registration_limit": registration_limit})
+    )
+    session.add_all(attendees)
+    session.add(event_entity)
+    session.commit()
+    event_details = event_svc_integration.get_by_id(event_entity.id)
+
+    def register(user_id: int) -> bool:
+        with Session(test_engine) as thread_session:
+            event_svc = EventService(thread_session, PermissionService(thread_session))
+            attendee = thread_session.get(UserEntity, user_id).to_model()
+            try:
+                event_svc.register(attendee, attendee, event_details)
+                return True
+            except EventRegistrationException:
+                return False
+
+    with ThreadPoolExecutor(max_workers=50) as executor:
+        registered = list(executor.map(register, [user.id for user in attendees]))
+
+    assert registered.count(True) == registration_limit
+    assert (
+        session.scalar(
+            select(func.count())
+            .select_from(EventRegistrationEntity)
+            .where(EventRegistrationEntity.event_id == event_entity.id)
+        )
+        == registration_limit
+    )
+
+
 def test_get_registered_users_of_event(event_svc_integration: EventService):
     """Tests querying for registered users of events as a paginated list"""
     pagination_params = PaginationParams(
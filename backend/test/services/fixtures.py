@@ -12,6 +12,7 @@ from ...services import (
     RoomService,
     AnnouncementService,
 )
+from ...services.announcement_counter_buffer import AnnouncementCounterBuffer
 
 __authors__ = ["Kris Jordan", "Ajay Gandecha", "Nicholas Sanaie"]
 __copyright__ = "Copyright 2023"
@@ -54,8 +55,12 @@ def organization_svc_integration(session: Session):
 
 @pytest.fixture()
 def announcement_svc_integration(session: Session):
-    """This fixture is used to test the AnnouncementService class with a real PermissionService."""
-    return AnnouncementService(session, PermissionService(session))
+    """This fixture is used to test the AnnouncementService class with a real PermissionService.
+
+    Counter increments are written immediately rather than buffered."""
+    return AnnouncementService(
+        session, PermissionService(session), AnnouncementCounterBuffer(sync=True)
+    )
 
 
 @pytest.fixture()
@@ -0,0 +1,113 @@
+"""Tests for the shared execution of paginated queries."""
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from ...entities import UserEntity
+from ...models.pagination import PaginationParams
+from ...services import UserService
+from ...services import pagination
+from ...services.exceptions import ResourceNotFoundException
+from ...services.pagination import count, order_by_column, paginate
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+from .fixtures import user_svc_integration
+from .query_counter import count_queries
+
+# Data Models for Fake Data Inserted in Setup
+from . import user_data
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+
+def test_paginate_counts_in_one_statement(session: Session):
+    """A page and the total number of results are found by a single statement."""
+    statement = select(UserEntity.id).order_by(UserEntity.id)
+    with count_queries(session) as queries:
+        rows, length = paginate(
+            session, statement, PaginationParams(page=0, page_size=2)
+        )
+    assert queries.count == 1
+    assert rows == [(user_data.root.id,), (user_data.ambassador.id,)]
+    assert length == len(user_data.users)
+
+
+def test_paginate_filtered(session: Session):
+    statement = select(UserEntity.id).where(UserEntity.onyen.ilike("%root%"))
+    rows, length = paginate(session, statement, PaginationParams())
+    assert rows == [(user_data.root.id,)]
+    assert length == 1
+
+
+def test_paginate_beyond(session: Session):
+    """A page past the end has no rows, yet still has the total."""
+    statement = select(UserEntity.id).order_by(UserEntity.id)
+    rows, length = paginate(session, statement, PaginationParams(page=5, page_size=2))
+    assert rows == []
+    assert length == len(user_data.users)
+
+
+def test_paginate_empty(session: Session):
+    statement = select(UserEntity.id).where(UserEntity.onyen == "nobody")
+    with count_queries(session) as queries:
+        rows, length = paginate(session, statement, PaginationParams())
+    assert queries.count == 1
+    assert (rows, length) == ([], 0)
+
+
+def test_paginate_estimate(session: Session):
+    """An unfiltered statement of a large enough table is counted by the planner's estimate."""
+    session.execute(text('ANALYZE "user"'))
+    session.add(
+        UserEntity(id=100, pid=100000000, onyen="unanalyzed", email="new@unc.edu")
+    )
+    session.flush()
+    statement = select(UserEntity.id).order_by(UserEntity.id)
+    with patch.object(pagination, "ESTIMATE_THRESHOLD", 1):
+        _, length = paginate(session, statement, PaginationParams(), estimate=True)
+    # The estimate is as of the analysis, before the user was added
+    assert length == len(user_data.users)
+    assert count(session, statement) == len(user_data.users) + 1
+
+
+def test_paginate_estimate_below_threshold(session: Session):
+    session.execute(text('ANALYZE "user"'))
+    session.add(
+        UserEntity(id=100, pid=100000000, onyen="unanalyzed", email="new@unc.edu")
+    )
+    session.flush()
+    statement = select(UserEntity.id)
+    _, length = paginate(session, statement, PaginationParams(), estimate=True)
+    assert length == len(user_data.users) + 1
+
+
+def test_paginate_estimate_filtered(session: Session):
+    """A filtered statement is always counted exactly."""
+    session.execute(text('ANALYZE "user"'))
+    statement = select(UserEntity.id).where(UserEntity.onyen.ilike("%root%"))
+    with patch.object(pagination, "ESTIMATE_THRESHOLD", 1):
+        _, length = paginate(session, statement, PaginationParams(), estimate=True)
+    assert length == 1
+
+
+def test_order_by_column():
+    orderable = {"id": UserEntity.id}
+    assert order_by_column(orderable, "id") is UserEntity.id
+    assert order_by_column(orderable, "") is None
+
+
+def test_order_by_column_not_allowed():
+    with pytest.raises(ResourceNotFoundException):
+        order_by_column({"id": UserEntity.id}, "__class__")
+
+
+def test_user_list_order_by_not_allowed(user_svc_integration: UserService):
+    with pytest.raises(ResourceNotFoundException):
+        user_svc_integration.list(
+            user_data.root, PaginationParams(order_by="permissions")
+        )
@@ -0,0 +1,89 @@
+"""Tests for the compiled permission matcher."""
+
+import itertools
+
+from ...services.permission_matcher import (
+    PermissionMatcher,
+    compile_permissions,
+    expand_pattern,
+)
+
+__authors__ = ["agent"]
+__copyright__ = "Copyright 2026"
+__license__ = "MIT"
+
+PATTERNS = [
+    "*",
+    "**",
+    "organization",
+    "organization*",
+    "organization/*",
+    "organization/cads",
+    "organization/*/members",
+    "*/members",
+    "user/*/*",
+    "coworking.reservation.*",
+    "",
+]
+
+STRINGS = [
+    "",
+    "organization",
+    "organizations",
+    "organization/",
+    "organization/cads",
+    "organization/cads/members",
+    "organization/cads/events",
+    "user/1",
+    "user/1/roles",
+    "coworking.reservation.read",
+    "coworking.reservation",
+    "coworkingXreservationXread",
+]
+
+
+def test_matches_like_expanded_patterns():
+    """Tests that each pattern matches exactly the strings its regular expression matches"""
+    for pattern, string in itertools.product(PATTERNS, STRINGS):
+        expected = expand_pattern(pattern).fullmatch(string) is not None
+        matcher = PermissionMatcher([(pattern, "*"), ("*", "nothing")])
+        assert matcher.matches(string, "resource") is expected, (pattern, string)
+        matcher = PermissionMatcher([("action", pattern), ("nothing", "*")])
+        assert matcher.matches("action", string) is expected, (pattern, string)
+
+
+def test_matches_action_and_resource_of_same_permission():
+    """Tests that the action and resource must be granted by the same permission"""
+    matcher = PermissionMatcher(
+        [("organization.update", "organization/cads"), ("event.*", "event/*")]
+    )
+    assert matcher.matches("organization.update", "organization/cads")
+    assert matcher.matches("event.create", "event/1")
+    assert matcher.matches("organization.update", "event/1") is False
+    assert matcher.matches("event.create", "organization/cads") is False
+
+
+def test_matches_periods_literally():
+    matcher = PermissionMatcher([("checkin.create", "checkin")])
+    assert matcher.matches("checkin.create", "checkin")
+    assert matcher.matches("checkinXcreate", "checkin") is False
+
+
+def test_matches_many_grants():
+    matcher = PermissionMatcher(
+        [("organization.*", f"organization/{i}") for i in range(500)]
+        + [("user.*", f"user/{i}") for i in range(500)]
+    )
+    assert matcher.matches("organization.update", "organization/499")
+    assert matcher.matches("organization.update", "organization/500") is False
+    assert matcher.matches("user.update", "organization/1") is False
+
+
+def test_no_permissions():
+    assert PermissionMatcher([]).matches("user.list", "user/") is False
+
+
+def test_compile_permissions_shared():
+    """Tests that matchers of the same permission set are compiled once"""
+    patterns = (("organization.*", "organization/cads"),)
+    assert compile_permissions(patterns) is compile_permissions(tuple(patterns))
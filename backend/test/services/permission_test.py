@@ -1,14 +1,16 @@
 """Tests for the PermissionService class."""
 
 import pytest
+from sqlalchemy.orm import Session
 
 # Tested Dependencies
 from ...models import Permission, User
-from ...services import PermissionService
+from ...services import PermissionService, RoleService
 
 # Data Setup and Injected Service Fixtures
 from .core_data import setup_insert_data_fixture
 from .fixtures import permission_svc
+from .query_counter import count_queries
 
 # Data Models for Fake Data Inserted in Setup
 from .role_data import ambassador_role
@@ -124,6 +126,48 @@ def test_check_specific_permission(permission_svc: PermissionService):
     )
 
 
-def test_get_user_roles_permissions(permission_svc: PermissionService):
-    """Test covers an edge case of _get_user_roles_permissions when user does not exist"""
-    assert permission_svc._get_user_roles_permissions(User(id=423)) == []
+def test_get_permissions_user_does_not_exist(permission_svc: PermissionService):
+    """Tests that a user who does not exist has no permissions, nor roles' permissions"""
+    assert permission_svc.get_permissions(User(id=423)) == []
+    assert permission_svc.check(User(id=423), "checkin.create", "checkin") is False
+
+
+def test_check_loads_permissions_once(
+    permission_svc: PermissionService, session: Session
+):
+    """Tests that the user and role permissions of a subject are loaded in one query and reused"""
+    with count_queries(session) as queries:
+        assert permission_svc.check(ambassador, "checkin.create", "checkin")
+        assert permission_svc.check(ambassador, "checkin.delete", "checkin") is False
+        assert permission_svc.check(ambassador, "coworking.reservation.read", "user/1")
+        permission_svc.enforce(ambassador, "checkin.create", "checkin")
+    assert queries.count == 1
+
+
+def test_check_subject_without_id(permission_svc: PermissionService):
+    """Tests that a user who is not yet persisted has no permissions"""
+    assert permission_svc.check(User(id=None), "checkin.create", "checkin") is False
+
+
+def test_get_permissions(permission_svc: PermissionService):
+    """Tests that a user's own permissions are listed before those of the user's roles"""
+    p = Permission(action="checkin.delete", resource="checkin/*")
+    permission_svc.grant(root, ambassador, p)
+    permissions = permission_svc.get_permissions(ambassador)
+    assert [(p.action, p.resource) for p in permissions] == [
+        ("checkin.delete", "checkin/*"),
+        ("checkin.create", "checkin"),
+        ("coworking.reservation.*", "*"),
+    ]
+
+
+def test_check_after_role_membership_changes(
+    permission_svc: PermissionService, session: Session
+):
+    """Tests that adding and removing role members invalidates memoized checks"""
+    role_svc = RoleService(session, permission_svc)
+    assert permission_svc.check(user, "checkin.create", "checkin") is False
+    role_svc.add_member(root, ambassador_role.id, user)
+    assert permission_svc.check(user, "checkin.create", "checkin")
+    role_svc.remove_member(root, ambassador_role.id, user.id)
+    assert permission_svc.check(user, "checkin.create", "checkin") is False
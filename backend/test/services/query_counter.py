@@ -0,0 +1,43 @@
+"""Helper context manager to count the SQL statements a block of code emits.
+
+Services that convert entities to models can silently trigger a lazy load per row. Tests
+use this helper to assert that an operation costs a fixed number of database round trips."""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class QueryCounter:
+    """Records the SQL statements executed while a `count_queries` block is active."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(session: Session) -> Iterator[QueryCounter]:
+    """Count the statements executed on the session's engine within the block.
+
+    Args:
+        session (Session) - A SQLAlchemy Session
+
+    Yields:
+        QueryCounter whose `count` is the number of statements executed so far"""
+    counter = QueryCounter()
+    engine = session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -1,8 +1,10 @@
 """Tests for the UserService class."""
 
 import pytest
+from sqlalchemy.orm import Session
 
 # Tested Dependencies
+from ...entities import UserEntity
 from ...models.user import User, NewUser
 from ...models.pagination import PaginationParams
 from ...services import UserService, PermissionService
@@ -115,12 +117,128 @@ def test_search_by_pid_does_not_exist(user_svc: UserService):
     users = user_svc.search(ambassador, "123")
     assert len(users) == 0
 
+
 def test_search_by_pid_rhonda(user_svc: UserService):
     """Test searching for a partial PID that does exist."""
     users = user_svc.search(ambassador, "999")
     assert len(users) == 1
     assert users[0] == root
 
+
+def test_search_by_pid_prefix(user_svc: UserService):
+    """Test that numeric searches match PIDs beginning with the query."""
+    users = user_svc.search(ambassador, "8888")
+    assert users == [ambassador]
+    assert user_svc.search(ambassador, "888888888") == [ambassador]
+    assert user_svc.search(ambassador, "1") == [user]
+
+
+def test_search_by_pid_not_prefix(user_svc: UserService):
+    """Test that numeric searches do not match digits in the middle of a PID."""
+    users = user_svc.search(ambassador, "11112")
+    assert len(users) == 0
+
+
+def test_search_by_pid_zero(user_svc: UserService):
+    """Test that numeric searches beginning with 0 match no PIDs, and finish."""
+    assert len(user_svc.search(ambassador, "0")) == 0
+    assert len(user_svc.search(ambassador, "000")) == 0
+
+
+def test_search_by_pid_leading_zero(user_svc: UserService):
+    """Test that leading zeros are not dropped from numeric searches."""
+    assert len(user_svc.search(ambassador, "0888")) == 0
+    assert len(user_svc.search(ambassador, "007")) == 0
+
+
+def test_search_non_ascii_digits(user_svc: UserService):
+    """Test that digits other than ASCII digits are not searched as PIDs."""
+    assert len(user_svc.search(ambassador, "²")) == 0
+    assert len(user_svc.search(ambassador, "8²")) == 0
+
+
+def test_search_short_query_by_onyen_prefix(user_svc: UserService):
+    """Test that queries too short for trigrams match onyen prefixes."""
+    users = user_svc.search(ambassador, "Xl")
+    assert len(users) == 1
+    assert users[0].id == ambassador.id
+    assert len(user_svc.search(ambassador, "an")) == 0
+
+
+def test_search_short_query_by_name_prefix(user_svc: UserService):
+    """Test that queries too short for trigrams match first and last name prefixes."""
+    assert user_svc.search(ambassador, "Am") == [ambassador]
+    assert user_svc.search(ambassador, "st") == [user]
+    assert user_svc.search(ambassador, "R") == [root]
+
+
+def test_search_short_query_ranks_onyen_prefix_first(
+    user_svc: UserService, session: Session
+):
+    """Test that onyen prefix matches rank before name prefix matches."""
+    session.add(
+        UserEntity(
+            id=100,
+            pid=100000000,
+            onyen="bb",
+            email="bb@unc.edu",
+            first_name="Ursula",
+            last_name="Usher",
+        )
+    )
+    session.commit()
+    users = user_svc.search(ambassador, "us")
+    assert [found.id for found in users] == [user.id, 100]
+
+
+def test_search_prefix_ignores_case(user_svc: UserService, session: Session):
+    """Test that onyen and email prefix searches match mixed-case values."""
+    session.add(
+        UserEntity(
+            id=100,
+            pid=100000000,
+            onyen="MixedCase",
+            email="Mixed.Case@unc.edu",
+            first_name="Mia",
+            last_name="Case",
+        )
+    )
+    session.commit()
+    assert [found.id for found in user_svc.search(ambassador, "mi")] == [100]
+    assert [found.id for found in user_svc.search(ambassador, "mixed.c@")] == []
+    assert [found.id for found in user_svc.search(ambassador, "MIXED.CASE@U")] == [100]
+
+
+def test_search_ranks_onyen_prefix_first(user_svc: UserService):
+    """Test that users whose onyen begins with the query rank first."""
+    users = user_svc.search(ambassador, "roo")
+    assert users[0].id == root.id
+
+
+def test_search_by_full_name(user_svc: UserService):
+    """Test that each word of a query must match a name, onyen, or email."""
+    users = user_svc.search(ambassador, "amy amb")
+    assert users == [ambassador]
+    assert len(user_svc.search(ambassador, "amy student")) == 0
+
+
+def test_search_by_email_prefix(user_svc: UserService):
+    """Test that queries with a username and @ match emails beginning with the query."""
+    assert user_svc.search(ambassador, "amam@u") == [ambassador]
+    assert len(user_svc.search(ambassador, "mam@u")) == 0
+
+
+def test_search_escapes_wildcards(user_svc: UserService):
+    """Test that LIKE wildcards in a query match literally."""
+    assert len(user_svc.search(ambassador, "%%%")) == 0
+    assert len(user_svc.search(ambassador, "_")) == 0
+
+
+def test_search_empty(user_svc: UserService):
+    """Test that an empty search matches no users."""
+    assert len(user_svc.search(ambassador, "  ")) == 0
+
+
 def test_list(user_svc: UserService):
     """Test that a paginated list of users can be produced."""
     pagination_params = PaginationParams(page=0, page_size=2, order_by="id", filter="")